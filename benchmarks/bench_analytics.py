@@ -0,0 +1,99 @@
+"""Benchmark the columnar analytics report.
+
+Generates a synthetic todos file and times loading it into columns and
+computing the report, compared with the same aggregates over TodoItem
+objects.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_analytics.py [item_count]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+from analytics import (
+    load_columns,
+    completion_by_owner,
+    counts_by_priority,
+    lead_time_percentiles,
+)
+from main import load_todos
+from models import Status
+
+PRIORITIES = ["HIGH", "MID", "LOW"]
+STATUSES = ["PENDING", "COMPLETED"]
+
+
+def generate_records(count, owners=1000, seed=42):
+    """Generate synthetic todo records as stored in todos.json."""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    records = []
+    for i in range(count):
+        created = start + timedelta(seconds=rng.randrange(365 * 86400))
+        updated = created + timedelta(seconds=rng.randrange(30 * 86400))
+        records.append({
+            "id": f"{i:032x}",
+            "title": f"Task {i}",
+            "priority": rng.choice(PRIORITIES),
+            "status": rng.choice(STATUSES),
+            "owner": f"user{rng.randrange(owners)}",
+            "created_at": created.isoformat(),
+            "updated_at": updated.isoformat(),
+            "details_ref": None,
+        })
+    return records
+
+
+def python_report(todos):
+    """Compute the same aggregates with plain Python loops."""
+    totals, completed = Counter(), Counter()
+    priorities = Counter()
+    lead_times = []
+    for todo in todos:
+        totals[todo.owner] += 1
+        priorities[todo.priority] += 1
+        if todo.status == Status.COMPLETED:
+            completed[todo.owner] += 1
+            created = datetime.fromisoformat(todo.created_at)
+            updated = datetime.fromisoformat(todo.updated_at)
+            lead_times.append((updated - created).total_seconds())
+    lead_times.sort()
+    return totals, completed, priorities, lead_times[len(lead_times) // 2] if lead_times else None
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, "todos.json")
+        with open(filename, 'w') as f:
+            json.dump(generate_records(count), f)
+
+        start = time.perf_counter()
+        columns = load_columns(filename)
+        loaded = time.perf_counter()
+        completion_by_owner(columns)
+        counts_by_priority(columns)
+        lead_time_percentiles(columns)
+        reported = time.perf_counter()
+
+        todos = load_todos(filename, with_details=False)
+        objects_loaded = time.perf_counter()
+        python_report(todos)
+        python_reported = time.perf_counter()
+
+    print(f"Items:                 {count:,}")
+    print(f"Columnar load:         {loaded - start:8.3f} s")
+    print(f"Columnar aggregates:   {reported - loaded:8.3f} s")
+    print(f"TodoItem load:         {objects_loaded - reported:8.3f} s")
+    print(f"Python-loop aggregates:{python_reported - objects_loaded:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
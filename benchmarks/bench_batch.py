@@ -0,0 +1,63 @@
+"""Benchmark batch mode against one load/save round trip per command.
+
+Creates and then completes items in a temporary store, once the way the
+handlers do it (a full load and save per command) and once through
+``run_batch`` with a single load and commit.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_batch.py [command_count] [existing_items]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+from batch import run_batch
+from main import load_todos, load_todos_for_index, save_todos
+from models import TodoItem, Priority
+from operations import create_todo
+
+
+def seed(filename, count):
+    """Write a store holding ``count`` items of another user."""
+    save_todos([
+        TodoItem(title=f"Existing {i}", details="", priority=Priority.MID, owner="bob")
+        for i in range(count)
+    ], filename)
+
+
+def per_command(filename, count):
+    """Create items with one load and save per command."""
+    for i in range(count):
+        todos = load_todos(filename, with_details=False)
+        change = create_todo(todos, "alice", f"Task {i}")
+        save_todos(todos, filename, changes=[change])
+
+
+def batched(filename, count):
+    """Create items with run_batch."""
+    lines = (json.dumps({"op": "create", "title": f"Task {i}"}) for i in range(count))
+    return run_batch(lines, "alice", filename, load_todos_for_index, save_todos, out=lambda line: None)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    existing = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "todos.json")
+        seed(filename, existing)
+        started = time.perf_counter()
+        per_command(filename, count)
+        slow = time.perf_counter() - started
+
+        seed(filename, existing)
+        summary = batched(filename, count)
+    print(f"Creates: {count:,} into a store of {existing:,} items")
+    print(f"{'load/save per command':<22} {count / slow:>14,.0f} commands/s")
+    print(f"{'batch, single commit':<22} {summary['commands_per_second']:>14,.0f} commands/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark the near-duplicate sweep.
+
+Generates synthetic items, a tenth of which are lightly edited copies of
+another item of the same owner, and times the MinHash/LSH sweep against
+comparing the shingle sets of every pair of an owner's items.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_duplicates.py [item_count]
+"""
+
+import random
+import sys
+import time
+
+from duplicates import THRESHOLD, find_duplicates, shingles
+
+WORDS = (
+    "buy call email plan book renew pay fix clean review send write order check "
+    "milk report invoice dentist car insurance garden meeting slides budget tax "
+    "passport flight hotel kitchen tap laptop backup friday monday march team"
+).split()
+
+
+def generate_records(count, owners=100, seed=42):
+    """Generate records and texts with some near-duplicates."""
+    rng = random.Random(seed)
+    records, texts = [], []
+    for i in range(count):
+        owner = f"user{rng.randrange(owners)}"
+        if texts and rng.random() < 0.1:
+            source = rng.randrange(len(texts))
+            owner = records[source]["owner"]
+            text = texts[source] + rng.choice(["", "!", " soon", " asap"])
+        else:
+            text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 12)))
+        records.append({"id": f"{i:032x}", "title": text, "owner": owner, "status": "PENDING"})
+        texts.append(text)
+    return records, texts
+
+
+def pairwise(records, texts):
+    """Count pairs of an owner's items with Jaccard similarity over the threshold."""
+    by_owner = {}
+    for record, text in zip(records, texts):
+        by_owner.setdefault(record["owner"], []).append(shingles(text))
+    pairs = 0
+    for sets in by_owner.values():
+        for i, a in enumerate(sets):
+            for b in sets[i + 1:]:
+                if a and b and len(a & b) >= THRESHOLD * len(a | b):
+                    pairs += 1
+    return pairs
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    records, texts = generate_records(count)
+
+    start = time.perf_counter()
+    groups = find_duplicates(records, texts)
+    swept = time.perf_counter()
+    pairs = pairwise(records, texts)
+    compared = time.perf_counter()
+
+    print(f"Items:                 {count:,}")
+    print(f"MinHash/LSH sweep:     {swept - start:8.3f} s ({len(groups):,} groups)")
+    print(f"Pairwise comparison:   {compared - swept:8.3f} s ({pairs:,} pairs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Benchmark validating an import in one process against a process pool.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_import.py [row_count] [workers]
+"""
+
+import json
+import os
+import sys
+import time
+
+from importer import validate_rows
+
+
+def rows(count):
+    """Generate JSONL rows in the shape of another tracker's export."""
+    for i in range(1, count + 1):
+        yield i, json.dumps({
+            "Summary": f"Task {i}",
+            "Description": "Imported from the old tracker",
+            "Priority": ("High", "Medium", "Low")[i % 3],
+            "State": "Done" if i % 4 == 0 else "Open",
+            "Created": "2023-06-01T09:30:00Z",
+            "Updated": "2023/06/02 10:00",
+        })
+
+
+def timed(count, workers):
+    start = time.perf_counter()
+    accepted, _ = validate_rows(rows(count), "alice", workers=workers)
+    assert len(accepted) == count
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    print(f"Rows: {count:,}")
+    for name, n in (("single process", 1), (f"{workers} worker processes", workers)):
+        print(f"{name:<22} {count / timed(count, n):>14,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark buffered list rendering against per-line print().
+
+Renders a full-style list of items to a line-buffered file, as a terminal
+would see it, first with one print() per line as the views used to do and
+then as a single buffered screen (cold and with a warm item cache).
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_render.py [item_count]
+"""
+
+import contextlib
+import os
+import sys
+import time
+
+from models import TodoItem, Priority
+from render import ItemTextCache, render_items, write_screen
+
+
+def per_line(todos):
+    """Render the way the views did before buffering."""
+    for idx, todo in enumerate(todos, 1):
+        print(f"\n[{idx}] ○ {todo.title}")
+        print(f"    Priority: {todo.priority.value}")
+        print(f"    Status: {todo.status.value}")
+        print(f"    Created: {todo.created_at}")
+        print(f"    Updated: {todo.updated_at}")
+
+
+def buffered(todos, cache):
+    """Render the screen into one buffer and write it once."""
+    lines = []
+    for entry in render_items(todos, 0, "full", cache):
+        lines += ["", entry]
+    write_screen(lines)
+
+
+def timed(func, *args):
+    """Run func with stdout sent to a line-buffered null device."""
+    with open(os.devnull, 'w', buffering=1) as sink, contextlib.redirect_stdout(sink):
+        start = time.perf_counter()
+        func(*args)
+        return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    todos = [
+        TodoItem(title=f"Task {i}", details="", priority=Priority.MID, owner="alice")
+        for i in range(count)
+    ]
+    cache = ItemTextCache(maxsize=count)
+
+    results = [
+        ("per-line print()", timed(per_line, todos)),
+        ("buffered, cold cache", timed(buffered, todos, cache)),
+        ("buffered, warm cache", timed(buffered, todos, cache)),
+    ]
+    print(f"Items: {count:,}")
+    for name, seconds in results:
+        print(f"{name:<22} {count / seconds:>14,.0f} items/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark request latency of the socket server against the CLI.
+
+Creates a store with synthetic items, then times listing and completing
+items through a running server over one connection, and the same commands
+as separate command-line invocations.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_server.py [item_count] [requests]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from client import TodoClient
+from main import save_todos, save_users
+from models import TodoItem, Priority
+from server import TodoServer, TodoService
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+
+def timed(calls):
+    """Return the latency in milliseconds of each call."""
+    latencies = []
+    for call in calls:
+        start = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summary(latencies):
+    """Format the median and worst latency."""
+    return f"median {statistics.median(latencies):8.3f} ms   max {max(latencies):8.3f} ms"
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.chdir(tmpdir)
+        save_users([{"username": "alice", "password": "secret"}])
+        todos = [
+            TodoItem(title=f"Task {i}", details="", priority=Priority.MID, owner=f"user{i % 100}")
+            for i in range(count)
+        ]
+        todos += [TodoItem(title=f"Mine {i}", details="", priority=Priority.MID, owner="alice") for i in range(requests)]
+        save_todos(todos)
+        mine = [todo.id for todo in todos if todo.owner == "alice"]
+
+        server = TodoServer("todo.sock", TodoService())
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        with TodoClient("todo.sock") as client:
+            client.call("login", user="alice", password="secret")
+            listed = timed([lambda: client.call("list")] * requests)
+            completed = timed([lambda todo_id=todo_id: client.call("complete", id=todo_id) for todo_id in mine])
+        server.shutdown()
+        server.server_close()
+
+        cli = [sys.executable, os.path.join(SRC, "main.py"), "--user", "alice", "--password", "secret", "list"]
+        invocations = timed([lambda: subprocess.run(cli, stdout=subprocess.DEVNULL, check=True)] * min(requests, 20))
+
+    print(f"Items:                 {count + requests:,}")
+    print(f"Server list:           {summary(listed)}")
+    print(f"Server complete:       {summary(completed)}")
+    print(f"CLI process per list:  {summary(invocations)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Load test for the HTTP/JSON API.
+
+Runs a mix of requests at increasing numbers of concurrent keep-alive
+connections and reports throughput and the p50/p99 latency at each level.
+Without ``--url`` it serves a temporary store filled with synthetic items
+from a thread in this process.
+
+Usage:
+    PYTHONPATH=src python benchmarks/load_test.py [--url http://127.0.0.1:8080]
+        [--user alice --password secret] [--levels 1,4,16,64]
+        [--requests 2000] [--pipeline 1] [--writes 0.2] [--items 10000]
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from http_api import AsyncTodoService, start
+from main import save_todos, save_users
+from models import TodoItem, Priority
+
+
+def serve_in_thread(items):
+    """Serve a temporary store from a background thread.
+
+    Returns:
+        ``(host, port)`` of the server.
+    """
+    os.chdir(tempfile.mkdtemp())
+    save_users([{"username": "alice", "password": "secret"}])
+    save_todos([
+        TodoItem(title=f"Task {i}", details=f"Notes for task {i}", priority=Priority.MID,
+                 owner="alice" if i % 100 == 0 else f"user{i % 100}")
+        for i in range(items)
+    ])
+    ready = threading.Event()
+    address = []
+
+    def run():
+        async def serve():
+            with ThreadPoolExecutor(1) as executor:
+                server = await start(AsyncTodoService(executor), "127.0.0.1", 0)
+                address.append(server.sockets[0].getsockname()[:2])
+                ready.set()
+                async with server:
+                    await server.serve_forever()
+        asyncio.run(serve())
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return address[0]
+
+
+def encode(method, path, token, body=None):
+    data = json.dumps(body).encode("utf-8") if body is not None else b""
+    return (
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nAuthorization: Basic {token}\r\n"
+        f"Content-Length: {len(data)}\r\n\r\n"
+    ).encode("latin-1") + data
+
+
+async def read_response(reader):
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line == b"\r\n":
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def run_level(host, port, token, ids, concurrency, total, pipeline, writes, seed):
+    """Send ``total`` requests over ``concurrency`` connections.
+
+    Returns:
+        ``(latencies in ms, errors, elapsed seconds)``.
+    """
+    rng = random.Random(seed)
+    latencies = []
+    errors = 0
+
+    def next_request():
+        if rng.random() < writes:
+            if rng.random() < 0.5:
+                return encode("POST", "/todos", token, {"title": f"Load {rng.random():.6f}"})
+            return encode("PATCH", f"/todos/{rng.choice(ids)}", token, {"title": f"Edited {rng.random():.6f}"})
+        return encode("GET", f"/todos/{rng.choice(ids)}", token)
+
+    async def worker(count):
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(host, port)
+        while count > 0:
+            batch = min(pipeline, count)
+            count -= batch
+            started = time.perf_counter()
+            writer.write(b"".join(next_request() for _ in range(batch)))
+            for _ in range(batch):
+                status, _ = await read_response(reader)
+                latencies.append((time.perf_counter() - started) * 1000)
+                errors += status >= 400
+        writer.close()
+
+    share, extra = divmod(total, concurrency)
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(share + (i < extra)) for i in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+async def fetch_ids(host, port, token):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(encode("GET", "/todos", token))
+    status, body = await read_response(reader)
+    writer.close()
+    if status != 200:
+        raise SystemExit(f"Listing items failed with status {status}: {body.decode()}")
+    return [item["id"][:8] for item in json.loads(body)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the HTTP/JSON API.")
+    parser.add_argument("--url", help="API to test; default serves a temporary store")
+    parser.add_argument("--user", default="alice")
+    parser.add_argument("--password", default="secret")
+    parser.add_argument("--levels", default="1,4,16,64", help="comma-separated connection counts")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per level")
+    parser.add_argument("--pipeline", type=int, default=1, help="requests sent before reading replies")
+    parser.add_argument("--writes", type=float, default=0.2, help="fraction of requests that change items")
+    parser.add_argument("--items", type=int, default=10_000, help="items in the temporary store")
+    args = parser.parse_args()
+
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        host, port = serve_in_thread(args.items)
+    token = base64.b64encode(f"{args.user}:{args.password}".encode()).decode()
+    ids = asyncio.run(fetch_ids(host, port, token))
+
+    print(f"{'conns':>6} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'errors':>8}")
+    for level, concurrency in enumerate(int(value) for value in args.levels.split(",")):
+        latencies, errors, elapsed = asyncio.run(
+            run_level(host, port, token, ids, concurrency, args.requests, args.pipeline, args.writes, level)
+        )
+        percentiles = statistics.quantiles(latencies, n=100)
+        print(f"{concurrency:>6} {len(latencies) / elapsed:>10.0f} {percentiles[49]:>10.2f} "
+              f"{percentiles[98]:>10.2f} {errors:>8}")
+
+
+if __name__ == "__main__":
+    main()
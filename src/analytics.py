@@ -0,0 +1,185 @@
+"""Columnar analytics for the To-Do List application.
+
+This module loads the todo store into NumPy arrays (categorical codes for
+owner, priority and status plus int64 timestamps) and computes report
+aggregates with vectorized operations instead of looping over TodoItem
+objects.
+
+Usage:
+    python src/analytics.py [todos.json]
+"""
+
+import json
+import os
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+
+from models import Priority, Status
+
+PRIORITIES = list(Priority)
+STATUSES = list(Status)
+COMPLETED_CODE = STATUSES.index(Status.COMPLETED)
+
+
+@dataclass
+class TodoColumns:
+    """Column-oriented view of the todo store.
+
+    Attributes:
+        owners: Owner names; ``owner_codes`` index into this list.
+        owner_codes: int32 owner code per item.
+        priority_codes: int8 index into ``PRIORITIES`` per item.
+        status_codes: int8 index into ``STATUSES`` per item.
+        created_at: int64 creation time in microseconds since the epoch.
+        updated_at: int64 last update time in microseconds since the epoch.
+    """
+
+    owners: list
+    owner_codes: np.ndarray
+    priority_codes: np.ndarray
+    status_codes: np.ndarray
+    created_at: np.ndarray
+    updated_at: np.ndarray
+
+    def __len__(self):
+        return len(self.owner_codes)
+
+
+def _timestamps(values):
+    """Parse ISO-8601 strings into int64 microseconds since the epoch."""
+    return np.array(values, dtype="datetime64[us]").astype(np.int64)
+
+
+def columns_from_records(records):
+    """Build columns from raw todo records as stored in ``todos.json``.
+
+    Args:
+        records: List of todo dictionaries.
+
+    Returns:
+        TodoColumns for the records.
+    """
+    owners, owner_codes = np.unique(
+        np.array([record["owner"] for record in records], dtype=str),
+        return_inverse=True,
+    )
+    priority_lookup = {priority.value: code for code, priority in enumerate(PRIORITIES)}
+    status_lookup = {status.value: code for code, status in enumerate(STATUSES)}
+
+    return TodoColumns(
+        owners=owners.tolist(),
+        owner_codes=owner_codes.astype(np.int32).reshape(-1),
+        priority_codes=np.array([priority_lookup[record["priority"]] for record in records], dtype=np.int8),
+        status_codes=np.array([status_lookup[record["status"]] for record in records], dtype=np.int8),
+        created_at=_timestamps([record["created_at"] for record in records]),
+        updated_at=_timestamps([record["updated_at"] for record in records]),
+    )
+
+
+def load_columns(filename="todos.json"):
+    """Load the todo store into columns.
+
+    Args:
+        filename: Path of the todos JSON file.
+
+    Returns:
+        TodoColumns for every item in the store.
+    """
+    if os.path.exists(filename):
+        with open(filename, 'r') as f:
+            return columns_from_records(json.load(f))
+    return columns_from_records([])
+
+
+def completion_by_owner(columns):
+    """Compute item totals and completion rate per owner.
+
+    Returns:
+        Dictionary mapping owner to ``(total, completed, rate)``.
+    """
+    size = len(columns.owners)
+    totals = np.bincount(columns.owner_codes, minlength=size)
+    completed = np.bincount(
+        columns.owner_codes,
+        weights=columns.status_codes == COMPLETED_CODE,
+        minlength=size,
+    ).astype(np.int64)
+    rates = np.divide(completed, totals, out=np.zeros(size), where=totals > 0)
+    return {
+        owner: (int(totals[code]), int(completed[code]), float(rates[code]))
+        for code, owner in enumerate(columns.owners)
+    }
+
+
+def counts_by_priority(columns):
+    """Count items per priority level.
+
+    Returns:
+        Dictionary mapping Priority to item count.
+    """
+    counts = np.bincount(columns.priority_codes, minlength=len(PRIORITIES))
+    return {priority: int(counts[code]) for code, priority in enumerate(PRIORITIES)}
+
+
+def lead_time_percentiles(columns, percentiles=(50, 90, 99)):
+    """Compute created-to-completed lead time percentiles.
+
+    The schema has no completion timestamp, so ``updated_at`` of a completed
+    item is used as its completion time.
+
+    Args:
+        columns: TodoColumns to analyse.
+        percentiles: Percentiles to compute.
+
+    Returns:
+        Dictionary mapping percentile to lead time in seconds, or an empty
+        dictionary when no item is completed.
+    """
+    done = columns.status_codes == COMPLETED_CODE
+    if not done.any():
+        return {}
+    lead_times = (columns.updated_at[done] - columns.created_at[done]) / 1e6
+    values = np.percentile(lead_times, percentiles)
+    return {p: float(value) for p, value in zip(percentiles, values)}
+
+
+def format_report(columns):
+    """Format the analytics report as text.
+
+    Args:
+        columns: TodoColumns to report on.
+
+    Returns:
+        The report as a multi-line string.
+    """
+    lines = ["=" * 60, f"  To-Do Statistics ({len(columns)} items)", "=" * 60]
+
+    lines.append("\nCompletion rate per user:")
+    for owner, (total, completed, rate) in sorted(completion_by_owner(columns).items()):
+        lines.append(f"  {owner:<20} {completed:>8}/{total:<8} {rate:6.1%}")
+
+    lines.append("\nItems by priority:")
+    for priority, count in counts_by_priority(columns).items():
+        lines.append(f"  {priority.value:<6} {count:>10}")
+
+    lines.append("\nLead time (created -> completed):")
+    percentiles = lead_time_percentiles(columns)
+    if not percentiles:
+        lines.append("  No completed items.")
+    for p, seconds in percentiles.items():
+        lines.append(f"  p{p:<3} {seconds / 3600:10.2f} h")
+
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Print the analytics report for a todos file."""
+    argv = sys.argv[1:] if argv is None else argv
+    filename = argv[0] if argv else "todos.json"
+    print(format_report(load_columns(filename)))
+
+
+if __name__ == "__main__":
+    main()
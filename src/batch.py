@@ -0,0 +1,150 @@
+"""Batch mode: apply a stream of JSONL commands with a single load.
+
+Each input line is one command object::
+
+    {"op": "create", "title": "Buy milk", "details": "", "priority": "HIGH"}
+    {"op": "edit", "id": "1a2b3c4d", "title": "Buy oat milk"}
+    {"op": "complete", "id": "1a2b3c4d"}
+
+The store is loaded once and every command is applied to the same
+in-memory list. Changes are written with one ``save_todos`` call at the
+end, or every ``commit_every`` successful commands, instead of a load/save
+round trip per command.
+"""
+
+import json
+import time
+
+from id_index import IdPrefixIndex
+from models import Priority
+from operations import create_todo, edit_todo, complete_todo, parse_priority, coalesce_changes, text_value
+
+OPERATIONS = ("create", "edit", "complete")
+
+
+class BatchError(Exception):
+    """Raised when a single batch command cannot be applied."""
+
+
+def _text(command, key):
+    """Return a command's text field, or None if absent or null."""
+    return text_value(command.get(key), key)
+
+
+class BatchSession:
+    """One user's in-memory view of the store while a batch runs.
+
+    Args:
+        username: Owner of the items created and changed.
+        todos: Every item in the store, loaded without details.
+    """
+
+    def __init__(self, username, todos):
+        self.username = username
+        self.todos = todos
+        self.pending = []
+        self._by_id = {todo.id: todo for todo in todos}
+        self._ids = IdPrefixIndex()
+        self._ids.rebuild(todos)
+
+    def find(self, prefix):
+        """Return the user's item with a unique id prefix.
+
+        Raises:
+            BatchError: If no item or more than one item matches.
+        """
+        prefix = str(prefix or "").lstrip("#").strip().lower()
+        if not prefix:
+            raise BatchError("An item id is required.")
+        matches = self._ids.find(self.username, prefix)
+        if not matches:
+            raise BatchError(f"No to-do item matches '{prefix}'.")
+        if len(matches) > 1:
+            raise BatchError(f"'{prefix}' matches several items.")
+        return self._by_id[matches[0].id]
+
+    def apply(self, command):
+        """Apply one command object.
+
+        Returns:
+            The affected TodoItem and whether it changed.
+
+        Raises:
+            BatchError: If the command is malformed or cannot be applied.
+        """
+        if not isinstance(command, dict):
+            raise BatchError("A command must be a JSON object.")
+        op = command.get("op")
+        if op not in OPERATIONS:
+            raise BatchError(f"Unknown op '{op}'. Use one of: {', '.join(OPERATIONS)}.")
+        try:
+            priority = command.get("priority")
+            priority = parse_priority(priority) if priority is not None else None
+            if op == "create":
+                change = create_todo(
+                    self.todos, self.username, _text(command, "title") or "",
+                    _text(command, "details") or "", priority or Priority.MID,
+                )
+                self._by_id[change[1].id] = change[1]
+                self._ids.apply(None, change[1])
+            elif op == "edit":
+                change = edit_todo(
+                    self.find(command.get("id")),
+                    title=_text(command, "title"), details=_text(command, "details"), priority=priority,
+                )
+            else:
+                todo = self.find(command.get("id"))
+                change = complete_todo(todo)
+                if change is None:
+                    return todo, False
+        except ValueError as error:
+            raise BatchError(str(error)) from None
+        self.pending.append(change)
+        return change[1], True
+
+
+def run_batch(lines, username, filename, load, save, commit_every=0, out=print):
+    """Apply JSONL commands from ``lines`` and report one result per line.
+
+    Args:
+        lines: Iterable of input lines; blank lines are skipped.
+        username: Owner of the items created and changed.
+        filename: Path of the todos JSON file.
+        load: Callable ``load(filename)`` returning the items without details.
+        save: Callable ``save(todos, filename, changes)`` writing the store.
+        commit_every: Write after this many changes; 0 writes once at the end.
+        out: Callable receiving each output line.
+
+    Returns:
+        Summary dictionary with counts, commits and throughput.
+    """
+    started = time.perf_counter()
+    session = BatchSession(username, load(filename))
+    summary = {"commands": 0, "applied": 0, "unchanged": 0, "failed": 0, "commits": 0}
+
+    def commit():
+        if session.pending:
+            save(session.todos, filename, coalesce_changes(session.pending))
+            session.pending = []
+            summary["commits"] += 1
+
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        summary["commands"] += 1
+        try:
+            todo, changed = session.apply(json.loads(line))
+        except (ValueError, BatchError) as error:
+            summary["failed"] += 1
+            out(json.dumps({"line": number, "ok": False, "error": str(error)}))
+            continue
+        summary["applied" if changed else "unchanged"] += 1
+        out(json.dumps({"line": number, "ok": True, "id": todo.id, "changed": changed}))
+        if commit_every and len(session.pending) >= commit_every:
+            commit()
+    commit()
+
+    elapsed = time.perf_counter() - started
+    summary["seconds"] = round(elapsed, 3)
+    summary["commands_per_second"] = round(summary["commands"] / elapsed, 1) if elapsed else None
+    return summary
@@ -0,0 +1,244 @@
+"""Sequence-numbered log of the changes saved to a todo store.
+
+Every save appends one line per changed item to ``todos.changes`` next to
+the store, holding a sequence number, the store signatures before and after
+the save and the stored record before and after the change::
+
+    {"seq": 41, "since": [1717999990000000000, 52290], "store": [1718000000000000000, 52311],
+     "before": {...}, "after": {...}}
+
+A save that replaces the whole store logs ``"reset": true`` instead.
+
+Sessions that hold items in memory keep a ``ChangeFeed``. ``changed`` tells
+cheaply whether anything was saved since the session last looked, and
+``poll`` returns just those changes, so the session refreshes the changed
+items instead of loading the whole store again. When the log cannot tell
+what changed, because the store was replaced, written by a program that
+does not keep the log, or the log was trimmed past the session's position,
+``poll`` returns None and the session loads everything.
+
+The log is written with the store's exclusive lock held. It is emptied
+when it grows past ``MAX_LOG_BYTES``, and numbering carries on from where
+it was. A torn last line, left by a save that died while logging, is
+dropped by the next save, which logs a reset in its place; a failure to
+write the log never fails the save itself.
+"""
+
+import json
+import os
+
+from details_store import DetailsStore, details_path
+from models import TodoItem
+from sidecars import sidecar_path, store_signature
+
+MAX_LOG_BYTES = 1 << 20
+TAIL_CHUNK = 4096
+
+
+def changes_path(todos_filename):
+    """Return the change log used alongside a todos file."""
+    return sidecar_path(todos_filename, ".changes")
+
+
+def _last_entry(f):
+    """Return ``(seq, end)`` of the last readable entry of an open log.
+
+    ``end`` is the byte offset just past that entry; anything after it is
+    the torn tail of a save that died while logging. ``(0, 0)`` if no entry
+    can be read.
+    """
+    size = f.seek(0, os.SEEK_END)
+    start = size
+    while start > 0:
+        start = max(0, start - TAIL_CHUNK)
+        f.seek(start)
+        lines = f.read(size - start).split(b"\n")
+        end = size - len(lines[-1])
+        # The first piece may be the end of a line that starts further back
+        for line in reversed(lines[:-1] if start == 0 else lines[1:-1]):
+            try:
+                return json.loads(line)["seq"], end
+            except (ValueError, KeyError, TypeError):
+                end -= len(line) + 1
+    return 0, 0
+
+
+def latest_seq(todos_filename):
+    """Return the sequence number of the last logged change, or 0 if none.
+
+    Only the end of the log is read, so this is a cheap way to ask whether
+    anything was saved since a known sequence number.
+    """
+    try:
+        f = open(changes_path(todos_filename), 'rb')
+    except FileNotFoundError:
+        return 0
+    with f:
+        return _last_entry(f)[0]
+
+
+def _stored_record(todo):
+    if todo is None:
+        return None
+    record = todo.to_dict()
+    del record["details"]
+    record["details_ref"] = todo.details_ref
+    record["version"] = todo.version
+    return record
+
+
+def record_changes(todos_filename, changes, previous_signature):
+    """Log the changes of a save that was just written.
+
+    Call with the store's exclusive lock held, after the store and the
+    details of the changed items were written.
+
+    Args:
+        todos_filename: Path of the todos JSON file.
+        changes: List of ``(before, after)`` item pairs as saved, or None
+            when the whole store was replaced.
+        previous_signature: Store signature before the save.
+
+    Returns:
+        The sequence number of the last entry written, or None if the log
+        could not be written; the save stands, and readers find the store
+        changed without a matching entry and load it again.
+    """
+    signature = store_signature(todos_filename, wait=False)
+    try:
+        try:
+            f = open(changes_path(todos_filename), 'r+b')
+        except FileNotFoundError:
+            f = open(changes_path(todos_filename), 'w+b')
+        with f:
+            seq, end = _last_entry(f)
+            if end < f.seek(0, os.SEEK_END):
+                # A save died while logging, so readers cannot follow it
+                changes = None
+            if changes is None:
+                entries = [{"seq": seq + 1, "since": previous_signature, "store": signature, "reset": True}]
+            else:
+                entries = [
+                    {"seq": seq + number, "since": previous_signature, "store": signature,
+                     "before": _stored_record(before), "after": _stored_record(after)}
+                    for number, (before, after) in enumerate(changes, 1)
+                ]
+            if not entries:
+                return seq
+            if end > MAX_LOG_BYTES:
+                end = 0
+            f.seek(end)
+            f.truncate()
+            f.write("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries).encode("utf-8"))
+    except OSError:
+        return None
+    return entries[-1]["seq"]
+
+
+def _unbroken(signature, entries):
+    """Return True if each logged save starts from the store the one before left.
+
+    A save that failed to log its changes leaves a break in this chain.
+    """
+    previous = None
+    for entry in entries:
+        save = (entry["since"], entry["store"])
+        if save == previous:
+            continue
+        if entry["since"] != signature:
+            return False
+        signature, previous = entry["store"], save
+    return True
+
+
+class ChangeFeed:
+    """A reader's position in the change log of a store.
+
+    A new feed starts at the end of the log; create it, or call ``reset``,
+    with the store's lock held while loading the items it will keep current.
+
+    Args:
+        todos_filename: Path of the todos JSON file.
+
+    Attributes:
+        seq: Sequence number of the last change seen.
+        signature: Store signature the reader's items reflect.
+    """
+
+    def __init__(self, todos_filename):
+        self.filename = todos_filename
+        self.reset()
+
+    def reset(self):
+        """Move to the end of the log, after loading the whole store."""
+        self.seq = latest_seq(self.filename)
+        self.signature = store_signature(self.filename, wait=False)
+        try:
+            self._offset = os.path.getsize(changes_path(self.filename))
+        except FileNotFoundError:
+            self._offset = 0
+
+    def changed(self):
+        """Return True if the store was saved since the feed last looked."""
+        return store_signature(self.filename, wait=False) != self.signature
+
+    def _entries(self, offset):
+        """Return the entries after the feed's position and the log size.
+
+        The entries are None if a line cannot be read, e.g. the torn tail
+        of a save that died while logging.
+        """
+        try:
+            f = open(changes_path(self.filename), 'rb')
+        except FileNotFoundError:
+            return [], 0
+        with f:
+            end = f.seek(0, os.SEEK_END)
+            f.seek(offset if offset <= end else 0)
+            data = f.read()
+        entries = []
+        for line in data.splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                return None, end
+            if entry["seq"] > self.seq:
+                entries.append(entry)
+        return entries, end
+
+    def poll(self):
+        """Return the changes saved since the last poll.
+
+        Call with the store's lock held so the log and the store agree.
+
+        Returns:
+            List of ``(before, after)`` TodoItem pairs in the order they were
+            saved, where ``before`` is None for a created item. Items carry
+            their details only if the change replaced them. None if the
+            store must be loaded again; call ``reset`` after loading it.
+        """
+        signature = store_signature(self.filename, wait=False)
+        if signature == self.signature:
+            return []
+        entries, end = self._entries(self._offset)
+        if entries is None and self._offset:
+            # The log may have been emptied and refilled past the offset
+            entries, end = self._entries(0)
+        if (not entries or entries[0]["seq"] != self.seq + 1 or entries[-1]["store"] != signature
+                or any(entry.get("reset") for entry in entries) or not _unbroken(self.signature, entries)):
+            return None
+
+        self.seq, self.signature, self._offset = entries[-1]["seq"], signature, end
+        changes = [
+            (TodoItem.from_dict(entry["before"]) if entry["before"] else None, TodoItem.from_dict(entry["after"]))
+            for entry in entries
+        ]
+        replaced = [
+            after for before, after in changes
+            if after.details is None and (before is None or before.details_ref != after.details_ref)
+        ]
+        if replaced:
+            with DetailsStore(details_path(self.filename)) as store:
+                for after in replaced:
+                    after.details = store.get(after.details_ref)
+        return changes
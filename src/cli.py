@@ -0,0 +1,362 @@
+"""Non-interactive command-line interface for the To-Do List application.
+
+Each invocation performs one operation and exits, printing JSON so the
+output can be consumed by scripts. Items are read by streaming the store,
+and only commands that change an item write it back.
+
+Usage:
+    python src/main.py --user alice --password secret add "Buy milk" --priority high
+    python src/main.py --user alice --password secret list --status pending
+    python src/main.py --user alice --password secret show 1a2b3c4d
+    python src/main.py --user alice --password secret search "invoice march*"
+    python src/main.py --user alice --password secret related 1a2b
+    python src/main.py --user alice --password secret edit 1a2b --title "Buy oat milk"
+    python src/main.py --user alice --password secret complete 1a2b
+    python src/main.py --user alice --password secret batch commands.jsonl
+    python src/main.py --user alice --password secret import backlog.csv --rejects rejects.jsonl
+    python src/main.py --user alice --password secret export --status pending -o pending.csv
+    python src/main.py --user alice --password secret update --where "status = pending and created_at < now-90d" --set "priority = LOW"
+    python src/main.py --user alice --password secret compact
+
+The password may also be given in the ``TODO_PASSWORD`` environment
+variable.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+
+from batch import run_batch
+from exporter import FORMATS as EXPORT_FORMATS, export_lines, export_matcher, write_export
+from importer import CHUNK_ROWS, FORMATS, detect_format, iter_rows, normalize_timestamp, validate_rows
+from indexes import IndexCache
+from main import (
+    append_todos,
+    authenticate,
+    compact_details,
+    load_users,
+    load_todos,
+    load_todo_details,
+    load_todos_for_index,
+    log_login_attempt,
+    related_todos,
+    save_todos,
+    save_todo_changes,
+    search_todos,
+)
+from similarity import similarity_available
+from models import TodoItem, Priority, Status
+from operations import ConflictError, create_todo, edit_todo, complete_todo, parse_priority, todo_json
+from paging import iter_records
+from query import And, Comparison, QueryError, parse_filter, parse_update, plan, run_update
+
+TODOS_FILE = "todos.json"
+
+
+class CommandError(Exception):
+    """Raised when a command cannot be carried out."""
+
+
+def emit(data):
+    """Print one JSON document on its own line."""
+    print(json.dumps(data, ensure_ascii=False))
+
+
+def find_todo(username, id_prefix, filename=TODOS_FILE):
+    """Find one of a user's items by id or id prefix by streaming the store.
+
+    Raises:
+        CommandError: If no item or more than one item matches.
+    """
+    prefix = id_prefix.lstrip("#").lower()
+    if not prefix:
+        raise CommandError("An item id is required.")
+    matches = [
+        record for _, record in iter_records(filename)
+        if record["owner"] == username and record["id"].startswith(prefix)
+    ]
+    if not matches:
+        raise CommandError(f"No to-do item matches '{id_prefix}'.")
+    if len(matches) > 1:
+        raise CommandError(f"'{id_prefix}' matches {len(matches)} items; use more of the id.")
+    return TodoItem.from_dict(matches[0])
+
+
+def run_add(args):
+    """Create an item, appending it without reading the existing items."""
+    try:
+        change = create_todo([], args.user, args.title, args.details, args.priority)
+    except ValueError as error:
+        raise CommandError(str(error)) from None
+    append_todos([change[1]], TODOS_FILE)
+    emit(todo_json(change[1], with_details=True))
+
+
+def run_list(args):
+    """Print the user's items, one JSON object per line."""
+    for _, record in iter_records(TODOS_FILE):
+        if record["owner"] != args.user:
+            continue
+        if args.status and record["status"] != args.status.value:
+            continue
+        if args.priority and record["priority"] != args.priority.value:
+            continue
+        emit(todo_json(TodoItem.from_dict(record)))
+
+
+def run_search(args):
+    """Print the user's items matching a full-text query as JSON lines."""
+    for todo in search_todos(args.user, args.query, TODOS_FILE):
+        emit(todo_json(todo))
+
+
+def run_show(args):
+    """Print a single item including its details."""
+    todo = find_todo(args.user, args.id)
+    load_todo_details(todo, TODOS_FILE)
+    emit(todo_json(todo, with_details=True))
+
+
+def run_related(args):
+    """Print the user's items most similar to an item as JSON lines."""
+    if not similarity_available():
+        raise CommandError("Finding related items requires NumPy.")
+    todo = find_todo(args.user, args.id)
+    for match, score in related_todos(todo, TODOS_FILE):
+        data = todo_json(match)
+        data["score"] = round(score, 4)
+        emit(data)
+
+
+def run_edit(args):
+    """Change the title, details or priority of an item."""
+    if args.title is None and args.details is None and args.priority is None:
+        raise CommandError("Nothing to change; give --title, --details or --priority.")
+    todo = find_todo(args.user, args.id)
+    change = edit_todo(todo, title=args.title, details=args.details, priority=args.priority)
+    save_todo_changes([change], TODOS_FILE)
+    emit(todo_json(todo))
+
+
+def run_complete(args):
+    """Mark an item as completed."""
+    todo = find_todo(args.user, args.id)
+    change = complete_todo(todo)
+    if change is not None:
+        save_todo_changes([change], TODOS_FILE)
+    emit(dict(todo_json(todo), changed=change is not None))
+
+
+def run_batch_command(args):
+    """Apply JSONL commands from a file or stdin with a single load."""
+    if args.commit_every < 0:
+        raise CommandError("--commit-every cannot be negative.")
+    if args.file == "-":
+        summary = run_batch(sys.stdin, args.user, TODOS_FILE, load_todos_for_index, save_todos, args.commit_every)
+    else:
+        try:
+            with open(args.file, 'r', encoding='utf-8') as f:
+                summary = run_batch(f, args.user, TODOS_FILE, load_todos_for_index, save_todos, args.commit_every)
+        except OSError as error:
+            raise CommandError(f"Cannot read {args.file}: {error.strerror}") from None
+    emit({"summary": summary})
+
+
+def run_import(args):
+    """Import items from a CSV or JSONL file with one append to the store."""
+    fmt = args.format or detect_format(args.file)
+
+    def progress(processed, rejected):
+        print(f"\rValidated {processed:,} rows ({rejected:,} rejected)", end="", file=sys.stderr, flush=True)
+
+    try:
+        with open(args.file, 'r', encoding='utf-8', newline='') as f:
+            todos, rejected = validate_rows(
+                iter_rows(f, fmt), args.user, args.workers, args.chunk_rows,
+                None if args.quiet else progress,
+            )
+    except OSError as error:
+        raise CommandError(f"Cannot read {args.file}: {error.strerror}") from None
+    except (csv.Error, UnicodeDecodeError) as error:
+        raise CommandError(f"Cannot parse {args.file}: {error}") from None
+    if not args.quiet:
+        print(file=sys.stderr)
+
+    append_todos(todos, TODOS_FILE)
+    if args.rejects:
+        with open(args.rejects, 'w', encoding='utf-8') as f:
+            for row in rejected:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    else:
+        for row in rejected:
+            print(json.dumps(row, ensure_ascii=False), file=sys.stderr)
+    emit({"imported": len(todos), "rejected": len(rejected)})
+
+
+def run_export(args):
+    """Stream the user's matching items to a JSONL or CSV file or stdout."""
+    fmt = args.format or ("csv" if args.output and args.output.lower().endswith(".csv") else "jsonl")
+    match = export_matcher(args.user, args.status, args.priority, args.since, args.until)
+    lines = export_lines(TODOS_FILE, match, fmt, with_details=not args.no_details)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            count = write_export(lines, f)
+    else:
+        count = write_export(lines, sys.stdout)
+    rows = count - 1 if fmt == "csv" else count
+    print(json.dumps({"exported": rows}), file=sys.stderr)
+
+
+def run_update_query(args):
+    """Apply an update to every one of the user's items matching a filter."""
+    try:
+        node = parse_filter(args.where) if args.where else None
+        assignments = parse_update(args.set)
+    except QueryError as error:
+        raise CommandError(str(error)) from None
+    owner = Comparison("owner", "=", args.user)
+    node = And([owner, node]) if node is not None else owner
+
+    # The indexes are built from the items just loaded and dropped on exit,
+    # so they always agree with the items being updated
+    todos = load_todos(TODOS_FILE, with_details=False)
+    name, candidates = plan(node, IndexCache(), TODOS_FILE, lambda filename: todos)
+    matched, changes = run_update(todos, node, assignments, candidates, dry_run=args.dry_run)
+    if changes:
+        save_todos(todos, TODOS_FILE, changes=changes)
+    emit({"matched": matched, "modified": len(changes), "plan": name, "dry_run": args.dry_run})
+
+
+def run_compact(args):
+    """Drop the details texts no item references any more."""
+    before, after = compact_details(TODOS_FILE)
+    emit({"details_bytes_before": before, "details_bytes_after": after})
+
+
+def timestamp_arg(value):
+    """argparse type converting a date or timestamp to ISO-8601."""
+    try:
+        return normalize_timestamp(value, None)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error)) from None
+
+
+def priority_arg(value):
+    """argparse type converting a priority name."""
+    try:
+        return parse_priority(value)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error)) from None
+
+
+def status_arg(value):
+    """argparse type converting a status name."""
+    try:
+        return Status(value.strip().upper())
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Unknown status '{value}'. Use PENDING or COMPLETED.") from None
+
+
+def build_parser():
+    """Build the argument parser with one subcommand per operation."""
+    parser = argparse.ArgumentParser(prog="todo", description="Manage to-do items without the interactive menus.")
+    parser.add_argument("--user", required=True, help="username to act as")
+    parser.add_argument("--password", default=os.environ.get("TODO_PASSWORD"),
+                        help="password (default: $TODO_PASSWORD)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="create an item")
+    add.add_argument("title")
+    add.add_argument("--details", default="")
+    add.add_argument("--priority", type=priority_arg, default=Priority.MID)
+    add.set_defaults(handler=run_add)
+
+    listing = commands.add_parser("list", help="list items as JSON lines")
+    listing.add_argument("--status", type=status_arg)
+    listing.add_argument("--priority", type=priority_arg)
+    listing.set_defaults(handler=run_list)
+
+    search = commands.add_parser("search", help="find items by words in their title or details")
+    search.add_argument("query", help='words to match, e.g. "report* OR slides"')
+    search.set_defaults(handler=run_search)
+
+    show = commands.add_parser("show", help="show one item with its details")
+    show.add_argument("id", help="item id or unique id prefix")
+    show.set_defaults(handler=run_show)
+
+    related = commands.add_parser("related", help="list the items most similar to an item")
+    related.add_argument("id", help="item id or unique id prefix")
+    related.set_defaults(handler=run_related)
+
+    edit = commands.add_parser("edit", help="change an item")
+    edit.add_argument("id", help="item id or unique id prefix")
+    edit.add_argument("--title")
+    edit.add_argument("--details")
+    edit.add_argument("--priority", type=priority_arg)
+    edit.set_defaults(handler=run_edit)
+
+    complete = commands.add_parser("complete", help="mark an item as completed")
+    complete.add_argument("id", help="item id or unique id prefix")
+    complete.set_defaults(handler=run_complete)
+
+    batch = commands.add_parser("batch", help="apply JSONL create/edit/complete commands")
+    batch.add_argument("file", nargs="?", default="-", help="command file (default: stdin)")
+    batch.add_argument("--commit-every", type=int, default=0, metavar="N",
+                       help="save after every N changes (default: once at the end)")
+    batch.set_defaults(handler=run_batch_command)
+
+    importing = commands.add_parser("import", help="bulk import items from CSV or JSONL")
+    importing.add_argument("file")
+    importing.add_argument("--format", choices=FORMATS, help="input format (default: from the file name)")
+    importing.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    importing.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, metavar="N",
+                           help="rows validated per chunk")
+    importing.add_argument("--rejects", metavar="PATH", help="write rejected rows here (default: stderr)")
+    importing.add_argument("--quiet", action="store_true", help="do not show progress")
+    importing.set_defaults(handler=run_import)
+
+    export = commands.add_parser("export", help="stream items to JSONL or CSV")
+    export.add_argument("--format", choices=EXPORT_FORMATS, help="output format (default: from --output, else jsonl)")
+    export.add_argument("--output", "-o", metavar="PATH", help="output file (default: stdout)")
+    export.add_argument("--status", type=status_arg)
+    export.add_argument("--priority", type=priority_arg)
+    export.add_argument("--since", type=timestamp_arg, help="only items created at or after this time")
+    export.add_argument("--until", type=timestamp_arg, help="only items created before this time")
+    export.add_argument("--no-details", action="store_true", help="leave out the details text")
+    export.set_defaults(handler=run_export)
+
+    update = commands.add_parser("update", help="change every item matching a filter")
+    update.add_argument("--where", help='filter, e.g. "status = pending and created_at < now-90d"')
+    update.add_argument("--set", required=True, help='assignments, e.g. "priority = LOW"')
+    update.add_argument("--dry-run", action="store_true", help="only count the matching items")
+    update.set_defaults(handler=run_update_query)
+
+    compact = commands.add_parser("compact", help="shrink the details file to the texts still in use")
+    compact.set_defaults(handler=run_compact)
+
+    return parser
+
+
+def main(argv=None):
+    """Run one command.
+
+    Returns:
+        Process exit code: 0 on success, 1 on failure.
+    """
+    args = build_parser().parse_args(argv)
+    if args.password is None or not authenticate(load_users(), args.user, args.password):
+        log_login_attempt(args.user, False)
+        print(json.dumps({"error": "Invalid username or password."}), file=sys.stderr)
+        return 1
+    try:
+        args.handler(args)
+    except (CommandError, ConflictError) as error:
+        print(json.dumps({"error": str(error)}), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
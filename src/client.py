@@ -0,0 +1,138 @@
+"""Thin command-line client for the to-do server.
+
+Forwards one command to a running ``server.py`` over its Unix domain socket
+and prints the reply in the same form as the command-line interface: JSON on
+stdout, errors as ``{"error": ...}`` on stderr with exit code 1. It imports
+nothing from the application, so starting it costs only the interpreter.
+
+Usage:
+    python src/client.py --user alice --password secret list --status pending
+    python src/client.py --user alice --password secret add "Buy milk" --priority high
+    python src/client.py --user alice --password secret show 1a2b
+    python src/client.py --user alice --password secret edit 1a2b --title "Buy oat milk"
+    python src/client.py --user alice --password secret complete 1a2b
+
+The password may also be given in the ``TODO_PASSWORD`` environment
+variable, and the socket path in ``TODO_SOCKET``.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+
+SOCKET_PATH = "todo.sock"
+
+
+class TodoClient:
+    """Connection to a to-do server.
+
+    Args:
+        path: Path of the server's socket.
+    """
+
+    def __init__(self, path=SOCKET_PATH):
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.connect(path)
+        self._reader = self._socket.makefile("rb")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Close the connection."""
+        self._reader.close()
+        self._socket.close()
+
+    def send(self, requests):
+        """Send several requests at once and return their replies in order."""
+        self._socket.sendall(b"".join(json.dumps(request).encode("utf-8") + b"\n" for request in requests))
+        replies = []
+        for _ in requests:
+            line = self._reader.readline()
+            if not line:
+                raise ConnectionError("The server closed the connection.")
+            replies.append(json.loads(line))
+        return replies
+
+    def call(self, op, **params):
+        """Send one request and return its reply."""
+        return self.send([dict(params, op=op)])[0]
+
+
+def build_parser():
+    """Build the argument parser with one subcommand per operation."""
+    parser = argparse.ArgumentParser(prog="todo-client", description="Send a command to the to-do server.")
+    parser.add_argument("--user", required=True, help="username to act as")
+    parser.add_argument("--password", default=os.environ.get("TODO_PASSWORD"),
+                        help="password (default: $TODO_PASSWORD)")
+    parser.add_argument("--socket", default=os.environ.get("TODO_SOCKET", SOCKET_PATH),
+                        help=f"server socket (default: $TODO_SOCKET or {SOCKET_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="create an item")
+    add.add_argument("title")
+    add.add_argument("--details", default="")
+    add.add_argument("--priority", default="MID")
+
+    listing = commands.add_parser("list", help="list items as JSON lines")
+    listing.add_argument("--status")
+    listing.add_argument("--priority")
+
+    show = commands.add_parser("show", help="show one item with its details")
+    show.add_argument("id", help="item id or unique id prefix")
+
+    edit = commands.add_parser("edit", help="change an item")
+    edit.add_argument("id", help="item id or unique id prefix")
+    edit.add_argument("--title")
+    edit.add_argument("--details")
+    edit.add_argument("--priority")
+
+    complete = commands.add_parser("complete", help="mark an item as completed")
+    complete.add_argument("id", help="item id or unique id prefix")
+    return parser
+
+
+def request_for(args):
+    """Return the protocol request for parsed arguments."""
+    if args.command == "add":
+        return {"op": "create", "title": args.title, "details": args.details, "priority": args.priority}
+    if args.command == "list":
+        return {"op": "list", "status": args.status, "priority": args.priority}
+    if args.command == "show":
+        return {"op": "show", "id": args.id}
+    if args.command == "edit":
+        return {"op": "edit", "id": args.id, "title": args.title, "details": args.details, "priority": args.priority}
+    return {"op": "complete", "id": args.id}
+
+
+def main(argv=None):
+    """Run one command against the server.
+
+    Returns:
+        Process exit code: 0 on success, 1 on failure.
+    """
+    args = build_parser().parse_args(argv)
+    login = {"op": "login", "user": args.user, "password": args.password or ""}
+    try:
+        with TodoClient(args.socket) as client:
+            replies = client.send([login, request_for(args)])
+    except OSError as error:
+        print(json.dumps({"error": f"Cannot reach the server at {args.socket}: {error}"}), file=sys.stderr)
+        return 1
+    for reply in replies:
+        if "error" in reply:
+            print(json.dumps({"error": reply["error"]}), file=sys.stderr)
+            return 1
+    result = replies[1]["result"]
+    for item in result if isinstance(result, list) else [result]:
+        print(json.dumps(item, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""Materialized per-owner counters for the todo store.
+
+Dashboards only need totals, so counts per owner (total, pending,
+completed and per priority) are kept in ``todos.counters.json`` and updated
+from each create/edit/complete change instead of recounting every item.
+The file is replaced in one step, and one that cannot be read is rebuilt.
+"""
+
+import json
+import os
+
+from locking import store_lock
+from models import Status
+from sidecars import replace_json, sidecar_path, store_signature
+
+
+def counters_path(todos_filename):
+    """Return the counters file used alongside a todos file."""
+    return sidecar_path(todos_filename, ".counters.json")
+
+
+def empty_counts():
+    """Return a zeroed counter record for one owner."""
+    return {"total": 0, "pending": 0, "completed": 0, "HIGH": 0, "MID": 0, "LOW": 0}
+
+
+def _count(owners, todo, delta):
+    counts = owners.setdefault(todo.owner, empty_counts())
+    counts["total"] += delta
+    counts["completed" if todo.status == Status.COMPLETED else "pending"] += delta
+    counts[todo.priority.value] += delta
+
+
+def apply_change(owners, before, after):
+    """Update owner counters for a single item change.
+
+    Args:
+        owners: Dictionary mapping owner to counter record.
+        before: The item before the change, or None if it was created.
+        after: The item after the change, or None if it was removed.
+    """
+    if before is not None:
+        _count(owners, before, -1)
+    if after is not None:
+        _count(owners, after, 1)
+
+
+def build_counters(todos):
+    """Count every item from scratch.
+
+    Args:
+        todos: List of TodoItem objects.
+
+    Returns:
+        Dictionary mapping owner to counter record.
+    """
+    owners = {}
+    for todo in todos:
+        _count(owners, todo, 1)
+    return owners
+
+
+def _read_counters(path):
+    """Return the contents of a counters file, or None if it cannot be read.
+
+    A file cut short by a failed write counts as missing, so it is rebuilt.
+    """
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) and isinstance(data.get("owners"), dict) else None
+    except (OSError, ValueError):
+        return None
+
+
+def load_counters(todos_filename="todos.json"):
+    """Load the persisted counters if they match the current store.
+
+    Args:
+        todos_filename: Path of the todos JSON file.
+
+    Returns:
+        Dictionary mapping owner to counter record, or None if the counters
+        file is missing, unreadable or was written for a different store
+        state.
+    """
+    with store_lock(todos_filename):
+        data = _read_counters(counters_path(todos_filename))
+        if data is None or data.get("store") != store_signature(todos_filename):
+            return None
+        return data["owners"]
+
+
+def update_counters(todos_filename, todos, changes=None, previous_signature=None):
+    """Bring the persisted counters in line with a save of the store.
+
+    Call after the todos file has been written. When ``changes`` is given and
+    the counters were current for ``previous_signature``, only those changes
+    are applied; otherwise the counters are rebuilt from ``todos``.
+
+    Args:
+        todos_filename: Path of the todos JSON file.
+        todos: The full list of items that was saved, or a callable
+            returning it so the items are only loaded if a rebuild is needed.
+        changes: Optional list of ``(before, after)`` item pairs.
+        previous_signature: Store signature before the save.
+
+    Returns:
+        Dictionary mapping owner to counter record, as written.
+    """
+    owners = None
+    path = counters_path(todos_filename)
+    data = _read_counters(path) if changes is not None else None
+    if data is not None and data.get("store") == previous_signature:
+        owners = data["owners"]
+        for before, after in changes:
+            apply_change(owners, before, after)
+    if owners is None:
+        owners = build_counters(todos() if callable(todos) else todos)
+    replace_json(path, {"store": store_signature(todos_filename), "owners": owners}, indent=4)
+    return owners
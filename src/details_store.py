@@ -0,0 +1,143 @@
+"""Content-addressed storage for to-do item details.
+
+The list screens never show an item's details, so the text is kept out of
+``todos.json`` in an append-only blob file next to it. Each distinct text is
+written once and todo records reference it by offset, length and SHA-256
+digest, so identical details are stored a single time. The digests of the
+stored texts are listed in an index file next to the blob file, so a writer
+that has not seen the records referencing a text still reuses it. Replaced
+texts stay in the blob file until ``main.compact_details`` rewrites it.
+"""
+
+import hashlib
+import os
+
+from sidecars import sidecar_path
+
+
+def details_path(todos_filename):
+    """Return the details blob file used alongside a todos file.
+
+    Args:
+        todos_filename: Path of the todos JSON file.
+
+    Returns:
+        Path of the matching details blob file.
+    """
+    return sidecar_path(todos_filename, ".details")
+
+
+def details_index_path(path):
+    """Return the digest index file kept next to a details blob file."""
+    return path + ".index"
+
+
+def details_digest(text):
+    """Return the SHA-256 hex digest used to address a details text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class DetailsStore:
+    """Append-only, deduplicating blob file for details texts.
+
+    Use as a context manager so a batch of reads and writes shares one
+    open file handle.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._known = {}
+        self._indexed = False
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Close the underlying file handle if it is open."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _handle(self):
+        if self._file is None:
+            self._file = open(self.path, "a+b")
+        return self._file
+
+    def remember(self, ref):
+        """Register an existing reference so identical texts reuse it.
+
+        Args:
+            ref: Reference dictionary previously returned by ``put``.
+        """
+        if ref:
+            self._known[ref["sha256"]] = ref
+
+    def _read_index(self):
+        """Remember the texts listed in the index file that the blob holds."""
+        self._indexed = True
+        try:
+            f = open(details_index_path(self.path), "r")
+        except FileNotFoundError:
+            return
+        size = self._handle().seek(0, os.SEEK_END)
+        with f:
+            for line in f:
+                try:
+                    digest, offset, length = line.split()
+                    offset, length = int(offset), int(length)
+                except ValueError:
+                    continue
+                if offset + length <= size:
+                    self._known.setdefault(digest, {"offset": offset, "length": length, "sha256": digest})
+
+    def put(self, text):
+        """Store a details text, reusing an existing blob when possible.
+
+        Args:
+            text: The details text to store.
+
+        Returns:
+            Reference dictionary with ``offset``, ``length`` and ``sha256``.
+        """
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        if digest not in self._known and not self._indexed:
+            self._read_index()
+        ref = self._known.get(digest)
+        if ref is not None:
+            return ref
+
+        f = self._handle()
+        f.seek(0, os.SEEK_END)
+        offset = f.tell()
+        f.write(data)
+        f.flush()
+        with open(details_index_path(self.path), "a") as index:
+            index.write(f"{digest} {offset} {len(data)}\n")
+
+        ref = {"offset": offset, "length": len(data), "sha256": digest}
+        self._known[digest] = ref
+        return ref
+
+    def get(self, ref):
+        """Read the details text a reference points to.
+
+        Args:
+            ref: Reference dictionary returned by ``put``.
+
+        Returns:
+            The stored details text.
+
+        Raises:
+            ValueError: If the blob file is shorter than the reference.
+        """
+        f = self._handle()
+        f.seek(ref["offset"])
+        data = f.read(ref["length"])
+        if len(data) != ref["length"]:
+            raise ValueError(f"Details blob at offset {ref['offset']} is truncated.")
+        return data.decode("utf-8")
@@ -0,0 +1,246 @@
+"""Near-duplicate sweep over the whole todo store.
+
+Every item's title and details are cut into overlapping character shingles
+and summarized by a MinHash signature: for each of ``NUM_PERM`` random hash
+functions, the smallest hash of any shingle. Two signatures agree in a given
+position with probability equal to the Jaccard similarity of the shingle
+sets. Signatures are split into ``BANDS`` bands, and items of the same owner
+whose signatures are identical in some band land in the same bucket; only
+those candidates are compared, so the sweep takes near-linear time instead
+of comparing every pair of items.
+
+Usage:
+    python src/duplicates.py [todos.json] [--threshold 0.8]
+"""
+
+import argparse
+import re
+import sys
+import zlib
+from dataclasses import dataclass
+
+import numpy as np
+
+from details_store import DetailsStore, details_path
+from id_index import SHORT_ID_LENGTH
+from paging import iter_records
+
+NUM_PERM = 64
+BANDS = 16
+SHINGLE_SIZE = 4
+THRESHOLD = 0.8
+SIGNATURE_CHUNK = 1 << 15  # shingles hashed at once, num_perm 64-bit values each
+
+_PRIME = (1 << 31) - 1
+_WORD = re.compile(r"\w+")
+
+
+@dataclass
+class DuplicateGroup:
+    """Items of one owner that are likely duplicates of each other.
+
+    Attributes:
+        owner: Username owning the items.
+        records: Raw todo records of the items, in store order.
+        similarity: Lowest estimated Jaccard similarity between an item and
+            the item it was grouped with.
+    """
+
+    owner: str
+    records: list
+    similarity: float
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Return the hashes of the character shingles of a text.
+
+    Case, punctuation and runs of whitespace are ignored. A text shorter than
+    ``size`` is a single shingle.
+
+    Returns:
+        A set of 32-bit integers; empty for a text without words.
+    """
+    normalized = " ".join(_WORD.findall(text.lower()))
+    if not normalized:
+        return set()
+    if len(normalized) <= size:
+        return {zlib.crc32(normalized.encode("utf-8"))}
+    return {
+        zlib.crc32(normalized[start:start + size].encode("utf-8"))
+        for start in range(len(normalized) - size + 1)
+    }
+
+
+class MinHasher:
+    """Computes MinHash signatures with a fixed family of hash functions.
+
+    Args:
+        num_perm: Number of hash functions, i.e. the signature length.
+        seed: Seed of the random hash function coefficients.
+    """
+
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, _PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, size=num_perm, dtype=np.uint64)
+
+    def signatures(self, shingle_sets):
+        """Return the signatures of several shingle sets.
+
+        The shingles of all sets are hashed ``SIGNATURE_CHUNK`` at a time, so
+        memory stays bounded however long the texts are; a set split across
+        chunks takes the minimum of its parts.
+
+        Args:
+            shingle_sets: Non-empty sets as returned by ``shingles``.
+
+        Returns:
+            A ``(len(shingle_sets), num_perm)`` uint32 array.
+        """
+        lengths = np.fromiter((len(s) for s in shingle_sets), dtype=np.int64, count=len(shingle_sets))
+        values = np.fromiter((h for s in shingle_sets for h in s), dtype=np.uint64, count=int(lengths.sum()))
+        values &= _PRIME
+        rows = np.repeat(np.arange(len(shingle_sets)), lengths)
+        result = np.full((len(shingle_sets), self.num_perm), _PRIME, dtype=np.uint32)
+        for first in range(0, len(values), SIGNATURE_CHUNK):
+            chunk_rows = rows[first:first + SIGNATURE_CHUNK]
+            # Both factors are below 2**31, so the products fit in 64 bits
+            hashed = (values[first:first + SIGNATURE_CHUNK, None] * self._a + self._b) % _PRIME
+            starts = np.flatnonzero(np.concatenate(([True], chunk_rows[1:] != chunk_rows[:-1])))
+            targets = chunk_rows[starts]
+            result[targets] = np.minimum(result[targets], np.minimum.reduceat(hashed, starts, axis=0))
+        return result
+
+
+class _DisjointSet:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, item):
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            self.parent[max(a, b)] = min(a, b)
+
+
+def find_duplicates(records, texts, threshold=THRESHOLD, num_perm=NUM_PERM, bands=BANDS):
+    """Group an owner's items whose texts are estimated to be near-duplicates.
+
+    Each bucket's items are compared with the bucket's first item only, and
+    pairs whose signatures agree in at least ``threshold`` of the positions
+    are joined into a group.
+
+    Args:
+        records: Raw todo records.
+        texts: Title and details text of each record.
+        threshold: Minimum estimated Jaccard similarity.
+        num_perm: Signature length; must be a multiple of ``bands``.
+        bands: Number of LSH bands.
+
+    Returns:
+        List of DuplicateGroup objects, ordered by owner and then by the
+        position of their first item.
+    """
+    if num_perm % bands:
+        raise ValueError("num_perm must be a multiple of bands.")
+    sets = [shingles(text) for text in texts]
+    positions = [position for position, shingle_set in enumerate(sets) if shingle_set]
+    if not positions:
+        return []
+    signatures = MinHasher(num_perm).signatures([sets[position] for position in positions])
+
+    rows = num_perm // bands
+    groups = _DisjointSet(len(positions))
+    scores = {}
+    for band in range(bands):
+        buckets = {}
+        keys = signatures[:, band * rows:(band + 1) * rows]
+        for row, position in enumerate(positions):
+            key = (records[position]["owner"], keys[row].tobytes())
+            first = buckets.setdefault(key, row)
+            if first == row or groups.find(first) == groups.find(row):
+                continue
+            score = float(np.mean(signatures[first] == signatures[row]))
+            if score >= threshold:
+                groups.union(first, row)
+                scores[row] = min(scores.get(row, 1.0), score)
+
+    members = {}
+    for row in range(len(positions)):
+        members.setdefault(groups.find(row), []).append(row)
+    result = [
+        DuplicateGroup(
+            records[positions[group_rows[0]]]["owner"],
+            [records[positions[row]] for row in group_rows],
+            min(scores.get(row, 1.0) for row in group_rows),
+        )
+        for group_rows in members.values() if len(group_rows) > 1
+    ]
+    result.sort(key=lambda group: group.owner)
+    return result
+
+
+def sweep(filename="todos.json", threshold=THRESHOLD):
+    """Find near-duplicate items across every user of a todos file.
+
+    Records are streamed from the store and their details read from the
+    details blob file one at a time.
+
+    Returns:
+        List of DuplicateGroup objects as from ``find_duplicates``.
+    """
+    records = []
+    texts = []
+    with DetailsStore(details_path(filename)) as store:
+        for _, record in iter_records(filename):
+            details = record.get("details")
+            if details is None and record.get("details_ref"):
+                details = store.get(record["details_ref"])
+            records.append(record)
+            texts.append(f"{record['title']} {details or ''}")
+    return find_duplicates(records, texts, threshold)
+
+
+def _plural(count, noun):
+    return f"{count} {noun}" if count == 1 else f"{count} {noun}s"
+
+
+def format_report(groups):
+    """Format duplicate groups as text, grouped by owner.
+
+    Returns:
+        The report as a multi-line string.
+    """
+    lines = ["=" * 60, f"  Near-Duplicate Items ({_plural(len(groups), 'group')})", "=" * 60]
+    if not groups:
+        lines.append("\nNo near-duplicates found.")
+    owner = None
+    for group in groups:
+        if group.owner != owner:
+            owner = group.owner
+            count = sum(1 for other in groups if other.owner == owner)
+            lines.append(f"\n{owner} ({_plural(count, 'group')}):")
+        lines.append(f"  ~{group.similarity:.0%} similar:")
+        for record in group.records:
+            lines.append(f"    #{record['id'][:SHORT_ID_LENGTH]} [{record['status']}] {record['title']}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Print the near-duplicate report for a todos file."""
+    parser = argparse.ArgumentParser(description="Report near-duplicate to-do items of every user.")
+    parser.add_argument("filename", nargs="?", default="todos.json")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help=f"minimum estimated similarity (default: {THRESHOLD})")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    print(format_report(sweep(args.filename, args.threshold)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Streaming export of to-do items to JSONL or CSV.
+
+The export is a pipeline of generators: records are streamed out of the
+store, filtered, given their details text one at a time and serialized
+line by line, so memory use stays constant however large the store is.
+"""
+
+import csv
+import io
+import json
+
+from details_store import DetailsStore, details_path
+from paging import iter_records
+
+EXPORT_FIELDS = ("id", "title", "details", "priority", "status", "owner", "created_at", "updated_at")
+
+FORMATS = ("jsonl", "csv")
+
+
+def export_matcher(owner, status=None, priority=None, since=None, until=None):
+    """Return a predicate over raw store records for an export.
+
+    Args:
+        owner: Username whose items are exported.
+        status: Optional Status the items must have.
+        priority: Optional Priority the items must have.
+        since: Optional ISO-8601 timestamp; only items created at or after it.
+        until: Optional ISO-8601 timestamp; only items created before it.
+    """
+    def match(record):
+        return (
+            record["owner"] == owner
+            and (status is None or record["status"] == status.value)
+            and (priority is None or record["priority"] == priority.value)
+            and (since is None or record["created_at"] >= since)
+            and (until is None or record["created_at"] < until)
+        )
+    return match
+
+
+def select_records(filename, match):
+    """Yield the records of the store that satisfy ``match``."""
+    for _, record in iter_records(filename):
+        if match(record):
+            yield record
+
+
+def project(records, filename, with_details=True):
+    """Yield export rows holding ``EXPORT_FIELDS``.
+
+    Details are read from the blob file one record at a time.
+    """
+    if not with_details:
+        for record in records:
+            yield {name: record[name] for name in EXPORT_FIELDS if name != "details"}
+        return
+    with DetailsStore(details_path(filename)) as store:
+        for record in records:
+            row = {name: record.get(name) for name in EXPORT_FIELDS}
+            if "details" not in record:
+                ref = record.get("details_ref")
+                row["details"] = store.get(ref) if ref else ""
+            yield row
+
+
+def jsonl_lines(rows):
+    """Serialize rows as JSON Lines."""
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+def csv_lines(rows, fields):
+    """Serialize rows as CSV, starting with a header line."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, lineterminator="\n")
+    writer.writeheader()
+    for row in rows:
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(row)
+    yield buffer.getvalue()
+
+
+def export_lines(filename, match, fmt="jsonl", with_details=True):
+    """Yield the serialized lines of an export.
+
+    Args:
+        filename: Path of the todos JSON file.
+        match: Predicate over raw records, e.g. from ``export_matcher``.
+        fmt: ``"jsonl"`` or ``"csv"``.
+        with_details: Whether to include the details text.
+    """
+    rows = project(select_records(filename, match), filename, with_details)
+    if fmt == "csv":
+        fields = [name for name in EXPORT_FIELDS if with_details or name != "details"]
+        return csv_lines(rows, fields)
+    return jsonl_lines(rows)
+
+
+def write_export(lines, out):
+    """Write exported lines to a file object.
+
+    Returns:
+        The number of lines written, including a CSV header.
+    """
+    count = 0
+    for count, line in enumerate(lines, 1):
+        out.write(line)
+    return count
@@ -0,0 +1,380 @@
+"""HTTP/JSON API for the to-do list, served with asyncio.
+
+The API keeps the store in memory like ``server.py`` and answers on the
+event loop. Changes are applied in memory at once, while writing them to
+disk runs on a small thread pool so the loop never blocks on a save. Changes
+arriving while a write is running are merged and written together by the
+next one, so under load many requests share a single rewrite of the store.
+Requests on one keep-alive connection may be pipelined. Each is handled as
+soon as it is read, and the responses are sent back in request order.
+
+Every request carries the user's credentials with HTTP Basic
+authentication. The endpoints are:
+
+    GET   /todos?status=pending&priority=high  list the user's items
+    POST  /todos                               create an item from a JSON body
+    GET   /todos/<id>                          show an item with its details
+    PATCH /todos/<id>                          change title, details or priority
+    POST  /todos/<id>/complete                 mark an item as completed
+
+Item ids may be abbreviated to a unique prefix. Errors are returned as
+``{"error": "message"}`` with a 4xx or 5xx status.
+
+Usage:
+    python src/http_api.py [--host 127.0.0.1] [--port 8080]
+"""
+
+import argparse
+import asyncio
+import base64
+import binascii
+import json
+import re
+import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from http import HTTPStatus
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from operations import coalesce_changes
+from server import OPERATIONS, NotFoundError, RequestError, TodoService, check_params
+
+HOST = "127.0.0.1"
+PORT = 8080
+WRITE_WORKERS = 1
+PIPELINE_DEPTH = 32
+MAX_BODY = 1 << 20
+
+ROUTES = [
+    ("GET", re.compile(r"/todos/?$"), "list"),
+    ("POST", re.compile(r"/todos/?$"), "create"),
+    ("GET", re.compile(r"/todos/(?P<id>[^/]+)$"), "show"),
+    ("PATCH", re.compile(r"/todos/(?P<id>[^/]+)$"), "edit"),
+    ("POST", re.compile(r"/todos/(?P<id>[^/]+)/complete$"), "complete"),
+]
+
+
+class HttpError(Exception):
+    """Raised to answer a request with an error status."""
+
+    def __init__(self, status, message, headers=()):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers
+
+
+@dataclass
+class Request:
+    """A parsed HTTP request."""
+
+    method: str
+    target: str
+    headers: dict
+    body: bytes
+    keep_alive: bool
+
+
+class AsyncTodoService(TodoService):
+    """TodoService whose writes run on a thread pool.
+
+    Operations change the in-memory items immediately; ``flush`` waits until
+    the changes made so far are on disk. Only one write runs at a time, and
+    it writes a copy of the items, so the event loop may keep changing them
+    meanwhile.
+
+    Args:
+        executor: Executor running the writes.
+        todos_filename: Path of the todos JSON file.
+        users_filename: Path of the users JSON file.
+    """
+
+    def __init__(self, executor, todos_filename="todos.json", users_filename="users.json"):
+        super().__init__(todos_filename, users_filename)
+        self._executor = executor
+        self._unwritten = []
+        self._queue = []
+        self._writer = None
+
+    def _commit(self, changes):
+        self._apply(changes)
+        self._unwritten.extend(changes)
+
+    def _store(self):
+        # The file is expected to change under a running write; it is only
+        # checked for outside changes while no write is pending
+        if self._todos is not None and (self._unwritten or self._queue or self._writer is not None):
+            return self._todos
+        return super()._store()
+
+    async def flush(self):
+        """Wait until every change made so far has been written.
+
+        Raises:
+            OSError, ValueError: If the write failed; the items are then
+                loaded again from the store on the next request.
+        """
+        if not self._unwritten:
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._queue.append((self._unwritten, future))
+        self._unwritten = []
+        if self._writer is None:
+            self._writer = asyncio.ensure_future(self._drain())
+        await future
+
+    async def _drain(self):
+        loop = asyncio.get_running_loop()
+        try:
+            while self._queue:
+                batch, self._queue = self._queue, []
+                changes = [
+                    (before, replace(after) if after is not None else None)
+                    for before, after in coalesce_changes([change for changes, _ in batch for change in changes])
+                ]
+                todos = [replace(todo) for todo in self._todos]
+                try:
+                    await loop.run_in_executor(self._executor, self._write, changes, todos)
+                except (OSError, ValueError) as error:
+                    # Later changes were made on top of the unsaved ones, so
+                    # they are dropped too and the store is loaded again
+                    batch += self._queue
+                    self._queue = []
+                    self._todos = None
+                    for _, future in batch:
+                        future.set_exception(error)
+                else:
+                    # The written copies got new versions and details
+                    # references; later changes of the held items build on them
+                    for _, saved in changes:
+                        held = self._by_id.get(saved.id) if saved is not None else None
+                        if held is not None:
+                            held.version, held.details_ref = saved.version, saved.details_ref
+                    for _, future in batch:
+                        future.set_result(None)
+        finally:
+            self._writer = None
+
+
+def _credentials(headers):
+    scheme, _, encoded = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "basic":
+        return None
+    try:
+        username, separator, password = base64.b64decode(encoded.strip()).decode("utf-8").partition(":")
+    except (binascii.Error, UnicodeDecodeError):
+        return None
+    return (username, password) if separator else None
+
+
+def _json_body(request):
+    if not request.body:
+        return {}
+    try:
+        body = json.loads(request.body)
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "The request body is not valid JSON.") from None
+    if not isinstance(body, dict):
+        raise HttpError(HTTPStatus.BAD_REQUEST, "The request body must be a JSON object.")
+    return body
+
+
+async def read_request(reader):
+    """Read one request from a stream.
+
+    Returns:
+        The Request, or None if the connection was closed.
+
+    Raises:
+        HttpError: If the request is malformed.
+    """
+    line = await reader.readline()
+    while line in (b"\r\n", b"\n"):
+        line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Malformed request line.") from None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if "transfer-encoding" in headers:
+        raise HttpError(HTTPStatus.LENGTH_REQUIRED, "Send the body with a Content-Length.")
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length.") from None
+    if length > MAX_BODY:
+        raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "The request body is too large.")
+    body = await reader.readexactly(length) if length > 0 else b""
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+    return Request(method.upper(), target, headers, body, keep_alive)
+
+
+def response_bytes(status, data, keep_alive=True, headers=()):
+    """Encode a JSON response."""
+    body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    lines = [
+        f"HTTP/1.1 {status.value} {status.phrase}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(body)}",
+        "Connection: keep-alive" if keep_alive else "Connection: close",
+    ]
+    lines.extend(f"{name}: {value}" for name, value in headers)
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+class TodoApi:
+    """Answers HTTP connections from an AsyncTodoService.
+
+    Args:
+        service: AsyncTodoService holding the items.
+    """
+
+    def __init__(self, service):
+        self.service = service
+
+    def route(self, request):
+        """Find the operation and parameters for a request.
+
+        Raises:
+            HttpError: If no endpoint matches.
+        """
+        url = urlsplit(request.target)
+        allowed = []
+        for method, pattern, op in ROUTES:
+            match = pattern.match(url.path)
+            if match is None:
+                continue
+            if method != request.method:
+                allowed.append(method)
+                continue
+            params = {name: unquote(value) for name, value in match.groupdict().items()}
+            if op == "list":
+                params.update(parse_qsl(url.query))
+            elif op in ("create", "edit"):
+                params.update({name: value for name, value in _json_body(request).items() if name != "id"})
+            return op, params
+        if allowed:
+            raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, f"Use {' or '.join(allowed)} here.",
+                            [("Allow", ", ".join(allowed))])
+        raise HttpError(HTTPStatus.NOT_FOUND, f"No endpoint at {url.path}.")
+
+    async def respond(self, request):
+        """Carry out a request and return the encoded response.
+
+        Everything up to writing the changes runs without yielding to the
+        event loop, so pipelined requests change the items in request order.
+        """
+        status = HTTPStatus.OK
+        try:
+            op, params = self.route(request)
+            credentials = _credentials(request.headers)
+            if credentials is None or not self.service.login(*credentials, log_success=False):
+                raise HttpError(HTTPStatus.UNAUTHORIZED, "Invalid username or password.",
+                                [("WWW-Authenticate", 'Basic realm="todo"')])
+            try:
+                check_params(op, params)
+                result = OPERATIONS[op](self.service, credentials[0], **params)
+            except NotFoundError as error:
+                raise HttpError(HTTPStatus.NOT_FOUND, str(error)) from None
+            except (RequestError, ValueError) as error:
+                raise HttpError(HTTPStatus.BAD_REQUEST, str(error)) from None
+            try:
+                await self.service.flush()
+            except (OSError, ValueError) as error:
+                raise HttpError(HTTPStatus.INTERNAL_SERVER_ERROR, f"Could not save: {error}") from None
+            if op == "create":
+                status = HTTPStatus.CREATED
+            return response_bytes(status, result, request.keep_alive)
+        except HttpError as error:
+            return response_bytes(error.status, {"error": str(error)}, request.keep_alive, error.headers)
+        except Exception:
+            # A bug in an operation must not drop the connection without a reply
+            traceback.print_exc()
+            return response_bytes(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error."},
+                                  request.keep_alive)
+
+    async def handle_connection(self, reader, writer):
+        """Serve the requests of one connection until it is closed."""
+        replies = asyncio.Queue(PIPELINE_DEPTH)
+        sender = asyncio.ensure_future(self._send_replies(replies, writer))
+        try:
+            while not sender.done():
+                try:
+                    request = await read_request(reader)
+                except HttpError as error:
+                    await replies.put(asyncio.ensure_future(_ready(
+                        response_bytes(error.status, {"error": str(error)}, keep_alive=False)
+                    )))
+                    break
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if request is None:
+                    break
+                await replies.put(asyncio.ensure_future(self.respond(request)))
+                if not request.keep_alive:
+                    break
+        finally:
+            await replies.put(None)
+            await sender
+            writer.close()
+
+    @staticmethod
+    async def _send_replies(replies, writer):
+        connected = True
+        while True:
+            reply = await replies.get()
+            if reply is None:
+                return
+            data = await reply
+            if connected:
+                try:
+                    writer.write(data)
+                    await writer.drain()
+                except ConnectionError:
+                    connected = False
+
+
+async def _ready(value):
+    return value
+
+
+async def start(service, host=HOST, port=PORT):
+    """Start serving the API.
+
+    Returns:
+        The asyncio Server.
+    """
+    return await asyncio.start_server(TodoApi(service).handle_connection, host, port)
+
+
+def main(argv=None):
+    """Serve the API until interrupted."""
+    parser = argparse.ArgumentParser(description="Serve the to-do list as an HTTP/JSON API.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    async def serve(executor):
+        server = await start(AsyncTodoService(executor), args.host, args.port)
+        print(f"Serving on http://{args.host}:{args.port}", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+    with ThreadPoolExecutor(WRITE_WORKERS) as executor:
+        try:
+            asyncio.run(serve(executor))
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Index for addressing items by a short prefix of their id.
+
+Each owner's item ids are kept in a sorted list, so the items starting
+with a typed prefix are found with a binary search instead of listing and
+scanning the user's items.
+"""
+
+from bisect import bisect_left, insort
+from dataclasses import replace
+
+from indexes import TodoIndex
+
+SHORT_ID_LENGTH = 8
+
+
+def short_id(todo):
+    """Return the short form of an item id as shown to users."""
+    return todo.id[:SHORT_ID_LENGTH]
+
+
+class IdPrefixIndex(TodoIndex):
+    """Per-owner sorted ids supporting prefix lookups."""
+
+    def __init__(self):
+        self._ids = {}
+        self._items = {}
+
+    def rebuild(self, todos):
+        self._ids = {}
+        self._items = {}
+        for todo in todos:
+            self._ids.setdefault(todo.owner, []).append(todo.id)
+            self._items[todo.id] = todo
+        for ids in self._ids.values():
+            ids.sort()
+
+    def apply(self, before, after):
+        if before is not None and before.id in self._items:
+            ids = self._ids[self._items.pop(before.id).owner]
+            del ids[bisect_left(ids, before.id)]
+        if after is not None:
+            insort(self._ids.setdefault(after.owner, []), after.id)
+            self._items[after.id] = after
+
+    def ids(self, owner):
+        """Return the ids of all of an owner's items, in id order."""
+        return list(self._ids.get(owner, []))
+
+    def find(self, owner, prefix, limit=2):
+        """Return the owner's items whose id starts with a prefix.
+
+        Args:
+            owner: Username whose items to search.
+            prefix: Leading characters of the id.
+            limit: Maximum number of matches to return; the default of two
+                is enough to tell a unique match from an ambiguous one.
+
+        Returns:
+            List of copies of the matching TodoItem objects, in id order.
+        """
+        ids = self._ids.get(owner, [])
+        matches = []
+        position = bisect_left(ids, prefix)
+        while position < len(ids) and len(matches) < limit and ids[position].startswith(prefix):
+            matches.append(replace(self._items[ids[position]]))
+            position += 1
+        return matches
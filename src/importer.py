@@ -0,0 +1,244 @@
+"""Bulk import of to-do items from CSV or JSONL files.
+
+Rows are read as a stream and handed out in chunks to a pool of worker
+processes, which decode and validate them into item records. The accepted
+records are appended to the store in one write; rows that fail validation
+are reported with their row number and the reason.
+
+Column names are matched case-insensitively and a few common aliases from
+other trackers are understood, e.g. ``name`` or ``summary`` for the title
+and ``description`` or ``notes`` for the details.
+"""
+
+import csv
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import chain, islice
+
+from models import TodoItem, Priority, Status
+
+CHUNK_ROWS = 2000
+
+FORMATS = ("csv", "jsonl")
+
+FIELD_ALIASES = {
+    "title": ("title", "name", "summary", "subject", "task"),
+    "details": ("details", "description", "notes", "body"),
+    "priority": ("priority", "importance"),
+    "status": ("status", "state", "completed", "done"),
+    "created_at": ("created_at", "created", "created_on", "creation_date"),
+    "updated_at": ("updated_at", "updated", "modified", "updated_on", "last_modified"),
+}
+
+PRIORITY_ALIASES = {
+    "high": Priority.HIGH, "h": Priority.HIGH, "urgent": Priority.HIGH, "critical": Priority.HIGH,
+    "p1": Priority.HIGH, "1": Priority.HIGH,
+    "mid": Priority.MID, "medium": Priority.MID, "normal": Priority.MID, "m": Priority.MID,
+    "p2": Priority.MID, "2": Priority.MID,
+    "low": Priority.LOW, "l": Priority.LOW, "minor": Priority.LOW, "p3": Priority.LOW, "3": Priority.LOW,
+}
+
+STATUS_ALIASES = {
+    "pending": Status.PENDING, "open": Status.PENDING, "todo": Status.PENDING, "to do": Status.PENDING,
+    "new": Status.PENDING, "in progress": Status.PENDING, "false": Status.PENDING, "0": Status.PENDING,
+    "completed": Status.COMPLETED, "complete": Status.COMPLETED, "done": Status.COMPLETED,
+    "closed": Status.COMPLETED, "resolved": Status.COMPLETED, "true": Status.COMPLETED,
+    "1": Status.COMPLETED, "x": Status.COMPLETED,
+}
+
+TIMESTAMP_FORMATS = ("%Y/%m/%d %H:%M:%S", "%Y/%m/%d %H:%M", "%Y/%m/%d", "%d %b %Y", "%d %B %Y")
+
+
+def detect_format(path):
+    """Guess the input format from a file name."""
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def iter_rows(f, fmt):
+    """Yield ``(row_number, raw_row)`` pairs from an open input file.
+
+    CSV rows are yielded as dictionaries; JSONL rows are yielded as
+    undecoded lines so decoding happens in the worker processes.
+    """
+    if fmt == "csv":
+        yield from enumerate(csv.DictReader(f), 1)
+    else:
+        for number, line in enumerate(f, 1):
+            if line.strip():
+                yield number, line
+
+
+def iter_chunks(rows, size=CHUNK_ROWS):
+    """Group rows into lists of at most ``size`` rows."""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _from_epoch(seconds):
+    """Convert Unix epoch seconds, raising ValueError for any out of range."""
+    try:
+        return datetime.fromtimestamp(seconds).isoformat()
+    except (OverflowError, OSError, ValueError):
+        raise ValueError(f"Timestamp {seconds} is out of range.") from None
+
+
+def normalize_timestamp(value, default):
+    """Convert a timestamp from another tracker into the store's format.
+
+    ISO-8601 strings (with or without a ``Z`` or offset), a few common date
+    layouts and Unix epoch seconds are accepted. Times with a time zone are
+    converted to local time, as the store keeps naive local timestamps.
+
+    Raises:
+        ValueError: If the value is not a recognised timestamp.
+    """
+    if value is None or str(value).strip() == "":
+        return default
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return _from_epoch(value)
+    text = str(value).strip()
+    try:
+        seconds = float(text)
+    except ValueError:
+        pass
+    else:
+        return _from_epoch(seconds)
+    try:
+        parsed = datetime.fromisoformat(text[:-1] + "+00:00" if text.endswith("Z") else text)
+    except ValueError:
+        for layout in TIMESTAMP_FORMATS:
+            try:
+                parsed = datetime.strptime(text, layout)
+                break
+            except ValueError:
+                continue
+        else:
+            raise ValueError(f"Unrecognised timestamp '{text}'.") from None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed.isoformat()
+
+
+def _field(row, name):
+    for alias in FIELD_ALIASES[name]:
+        if alias in row and row[alias] is not None:
+            return row[alias]
+    return None
+
+
+def _mapped(value, aliases, default, kind):
+    if value is None or str(value).strip() == "":
+        return default
+    try:
+        return aliases[str(value).strip().lower()]
+    except KeyError:
+        raise ValueError(f"Unknown {kind} '{value}'.") from None
+
+
+def validate_row(raw, owner, now):
+    """Turn one input row into a TodoItem for ``owner``.
+
+    Args:
+        raw: Dictionary of column values, or a JSON object as text.
+        owner: Username the item is imported for.
+        now: Timestamp used when a row has no creation time.
+
+    Raises:
+        ValueError: If the row cannot be imported.
+    """
+    row = json.loads(raw) if isinstance(raw, str) else raw
+    if not isinstance(row, dict):
+        raise ValueError("Row is not an object.")
+    row = {str(key).strip().lower(): value for key, value in row.items() if key is not None}
+
+    title = str(_field(row, "title") or "").strip()
+    if not title:
+        raise ValueError("Title cannot be empty.")
+    created_at = normalize_timestamp(_field(row, "created_at"), now)
+    return TodoItem(
+        title=title,
+        details=str(_field(row, "details") or "").strip(),
+        priority=_mapped(_field(row, "priority"), PRIORITY_ALIASES, Priority.MID, "priority"),
+        status=_mapped(_field(row, "status"), STATUS_ALIASES, Status.PENDING, "status"),
+        owner=owner,
+        created_at=created_at,
+        updated_at=normalize_timestamp(_field(row, "updated_at"), created_at),
+    )
+
+
+def validate_chunk(chunk, owner, now):
+    """Validate a chunk of rows; runs in a worker process.
+
+    Returns:
+        A list of accepted TodoItem objects and a list of rejected rows as
+        ``{"row", "error", "data"}`` dictionaries.
+    """
+    accepted, rejected = [], []
+    for number, raw in chunk:
+        try:
+            accepted.append(validate_row(raw, owner, now))
+        except ValueError as error:
+            rejected.append({"row": number, "error": str(error), "data": raw})
+    return accepted, rejected
+
+
+def validate_rows(rows, owner, workers=None, chunk_rows=CHUNK_ROWS, progress=None):
+    """Validate a stream of rows in chunks, in parallel when worthwhile.
+
+    At most two chunks per worker are in flight, so memory use does not
+    grow with the size of the input beyond the accepted items themselves.
+
+    Args:
+        rows: Iterable of ``(row_number, raw_row)`` pairs.
+        owner: Username the items are imported for.
+        workers: Number of worker processes; with 1, or when the input
+            fits in one chunk, rows are validated in this process.
+        chunk_rows: Rows per chunk.
+        progress: Optional callable receiving the number of rows processed
+            and rejected so far after each chunk.
+
+    Returns:
+        A list of accepted TodoItem objects, in input order, and a list of
+        rejected rows.
+    """
+    now = datetime.now().isoformat()
+    workers = workers or os.cpu_count() or 1
+    accepted, rejected = [], []
+    processed = 0
+
+    def collect(result, size):
+        nonlocal processed
+        accepted.extend(result[0])
+        rejected.extend(result[1])
+        processed += size
+        if progress is not None:
+            progress(processed, len(rejected))
+
+    chunks = iter_chunks(rows, chunk_rows)
+    head = list(islice(chunks, 2))
+    chunks = chain(head, chunks)
+    if workers == 1 or len(head) < 2:
+        for chunk in chunks:
+            collect(validate_chunk(chunk, owner, now), len(chunk))
+        return accepted, rejected
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append((pool.submit(validate_chunk, chunk, owner, now), len(chunk)))
+            if len(in_flight) >= workers * 2:
+                future, size = in_flight.popleft()
+                collect(future.result(), size)
+        while in_flight:
+            future, size = in_flight.popleft()
+            collect(future.result(), size)
+    return accepted, rejected
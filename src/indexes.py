@@ -0,0 +1,110 @@
+"""In-memory secondary indexes over the todo store.
+
+Indexes are built from the store the first time they are needed and then
+kept current from the ``(before, after)`` changes passed to ``save_todos``.
+Each index follows the store's change log, so changes saved by other
+sessions are applied to it as well; it is only rebuilt when the log cannot
+tell what changed, e.g. after the file was replaced by another program.
+"""
+
+import os
+from abc import ABC, abstractmethod
+
+from changelog import ChangeFeed
+from locking import store_lock
+from sidecars import store_signature
+
+
+class TodoIndex(ABC):
+    """Base class for an index maintained from item changes."""
+
+    @abstractmethod
+    def rebuild(self, todos):
+        """Build the index from scratch.
+
+        Args:
+            todos: List of every TodoItem in the store.
+        """
+
+    @abstractmethod
+    def apply(self, before, after):
+        """Update the index for a single item change.
+
+        Args:
+            before: The item before the change, or None if it was created.
+            after: The item after the change, or None if it was removed.
+        """
+
+
+class IndexCache:
+    """Holds built indexes per store file and keeps them in step with saves."""
+
+    def __init__(self):
+        self._entries = {}
+
+    def get(self, index_class, filename, loader):
+        """Return a current index for a store, building it if needed.
+
+        A missing store is never cached; the index is built from whatever
+        ``loader`` returns each time.
+
+        Args:
+            index_class: TodoIndex subclass to build.
+            filename: Path of the todos JSON file.
+            loader: Callable loading the items of ``filename``.
+
+        Returns:
+            The index instance.
+        """
+        key = (os.path.abspath(filename), index_class)
+        signature = store_signature(filename)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0].signature == signature:
+            return entry[1]
+
+        with store_lock(filename):
+            if entry is not None:
+                changes = entry[0].poll()
+                if changes is not None:
+                    for before, after in changes:
+                        entry[1].apply(before, after)
+                    return entry[1]
+            index = index_class()
+            index.rebuild(loader(filename))
+            feed = ChangeFeed(filename)
+        if feed.signature is not None:
+            self._entries[key] = [feed, index]
+        else:
+            self._entries.pop(key, None)
+        return index
+
+    def commit(self, filename, changes, previous_signature):
+        """Carry the indexes of a store across a save.
+
+        Indexes that were current before the save have ``changes`` applied;
+        the others catch up from the change log when next used. All of them
+        are dropped when no changes are given. Call with the store's
+        exclusive lock held, after the save was logged.
+
+        Args:
+            filename: Path of the todos JSON file that was written.
+            changes: List of ``(before, after)`` item pairs, or None.
+            previous_signature: Store signature before the save.
+        """
+        path = os.path.abspath(filename)
+        for key, entry in list(self._entries.items()):
+            if key[0] != path:
+                continue
+            if changes is None:
+                del self._entries[key]
+            elif entry[0].signature == previous_signature:
+                for before, after in changes:
+                    entry[1].apply(before, after)
+                entry[0].reset()
+
+    def clear(self):
+        """Drop every cached index."""
+        self._entries.clear()
+
+
+INDEXES = IndexCache()
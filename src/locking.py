@@ -0,0 +1,100 @@
+"""Advisory locks shared by every process using a todo store.
+
+Programs reading ``todos.json`` hold a shared lock on a ``todos.lock`` file
+next to it, and programs writing the store hold an exclusive one, taken with
+``fcntl.flock``. Any number of sessions may read at once, a save waits only
+for the reads in progress, and no one ever reads a half-written store. The
+lock is held just for the read or the write itself, never while a user is
+looking at a screen, so sessions that change different items do not queue
+behind each other; ``save_todos`` checks record versions to catch changes
+made since the items were loaded.
+
+The locks are re-entrant within a thread, so code holding the exclusive lock
+may call functions that read the store. Where ``fcntl`` is unavailable the
+locks do nothing.
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - fcntl is missing on Windows
+    fcntl = None
+
+from sidecars import sidecar_path
+
+_held = threading.local()
+
+
+def lock_path(todos_filename):
+    """Return the lock file used alongside a todos file."""
+    return sidecar_path(todos_filename, ".lock")
+
+
+def _held_locks():
+    locks = getattr(_held, "locks", None)
+    if locks is None:
+        locks = _held.locks = {}
+    return locks
+
+
+def holds_lock(todos_filename):
+    """Return True if the current thread holds the lock of a store."""
+    return os.path.abspath(todos_filename) in _held_locks()
+
+
+@contextmanager
+def store_lock(todos_filename, exclusive=False):
+    """Hold the lock of a store for the duration of a ``with`` block.
+
+    A thread already holding the lock keeps it; asking for the exclusive
+    lock while holding the shared one upgrades it until the block ends.
+
+    Args:
+        todos_filename: Path of the todos JSON file.
+        exclusive: Take the lock for writing instead of reading.
+
+    Raises:
+        OSError: If the lock file cannot be created for a write. Reads
+            go ahead without the lock, e.g. in a read-only directory.
+    """
+    if fcntl is None:
+        yield
+        return
+    locks = _held_locks()
+    key = os.path.abspath(todos_filename)
+    entry = locks.get(key)
+
+    if entry is None:
+        try:
+            fd = os.open(lock_path(key), os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError:
+            if exclusive:
+                raise
+            yield
+            return
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        except BaseException:
+            os.close(fd)
+            raise
+        entry = locks[key] = {"fd": fd, "depth": 0, "exclusive": exclusive}
+
+    upgrade = exclusive and not entry["exclusive"]
+    if upgrade:
+        fcntl.flock(entry["fd"], fcntl.LOCK_EX)
+        entry["exclusive"] = True
+    entry["depth"] += 1
+    try:
+        yield
+    finally:
+        entry["depth"] -= 1
+        if not entry["depth"]:
+            del locks[key]
+            fcntl.flock(entry["fd"], fcntl.LOCK_UN)
+            os.close(entry["fd"])
+        elif upgrade:
+            fcntl.flock(entry["fd"], fcntl.LOCK_SH)
+            entry["exclusive"] = False
@@ -5,8 +5,33 @@ This module implements the CLI interface with a REPL-style interaction.
 
 import json
 import os
+import signal
+import sys
 from datetime import datetime
 from models import TodoItem, Priority, Status
+from operations import PRIORITY_CHOICES, ConflictError, coalesce_changes, edit_todo, complete_todo, rebase_change
+from details_store import DetailsStore, details_index_path, details_path
+from counters import build_counters, empty_counts, load_counters, update_counters
+from sidecars import settle, store_signature
+from locking import store_lock
+from changelog import record_changes
+from search import SearchIndex, load_search_index, update_search_index, write_search_index
+from indexes import INDEXES
+from next_up import NextUpIndex
+from id_index import IdPrefixIndex, short_id
+from trie import COMPLETION_LIMIT, TitleTrie, title_key
+from similarity import DUPLICATE_THRESHOLD, RELATED_THRESHOLD, SimilarityIndex, similarity_available
+from paging import PAGE_SIZE, ManagedCursor
+from selection import is_multi_selection, parse_selection
+from query import QueryError, parse_filter
+from view_query import SORT_KEYS, QueryCursor, parse_sort
+from render import render_items, write_screen
+from tui import VirtualList, run_todo_tui, tui_available
+from todo_manager import TodoManager
+
+NEXT_UP_COUNT = 5
+BULK_CONFIRMATION_TITLES = 10
+AUTOSAVE_DELAY = 1.0
 
 def display_pre_login_menu():
     """Display the pre-login menu options."""
@@ -29,17 +54,50 @@ def get_user_choice():
     return choice
 
 
+def format_todo_summary(counts):
+    """Format a user's item counters as a one-line summary."""
+    return (
+        f"  {counts['total']} items: {counts['pending']} pending, {counts['completed']} completed"
+        f" (HIGH {counts['HIGH']} / MID {counts['MID']} / LOW {counts['LOW']})"
+    )
+
+
+def format_save_status(manager):
+    """Describe how far the autosave has got, or return None if it is off.
+
+    A failed write is described once and then forgotten.
+    """
+    if not manager.write_behind:
+        return None
+    error = manager.take_error()
+    if isinstance(error, ConflictError):
+        return f"  ✗ Not saved: {error}"
+    if error is not None:
+        return f"  ✗ Saving failed, some changes were lost: {error}"
+    unsaved = manager.unsaved()
+    if unsaved:
+        return f"  Saving changes to {unsaved} item{'s' if unsaved != 1 else ''}..."
+    return "  All changes saved"
+
+
 def display_post_login_menu(username):
     """Display the post-login menu options."""
     print("\n" + "=" * 40)
     print(f"  Welcome, {username}!")
+    print(format_todo_summary(load_todo_summary(username)))
+    status = format_save_status(todo_manager())
+    if status is not None:
+        print(status)
     print("=" * 40)
     print("\n[1] Create To-Do Item")
     print("[2] View All To-Do Items")
     print("[3] View To-Do Item Details")
     print("[4] Edit To-Do Item")
     print("[5] Mark To-Do as Completed")
-    print("[6] Logout")
+    print("[6] View Next Up")
+    print("[7] Full-Screen View")
+    print("[8] Search To-Do Items")
+    print("[9] Logout")
     print()
 
 
@@ -49,7 +107,7 @@ def get_post_login_choice():
     Returns:
         The user's choice as a string.
     """
-    choice = input("Please select an option (1-6): ").strip()
+    choice = input("Please select an option (1-9): ").strip()
     return choice
 
 # ================= Load & Save users from/to JSON =============== 
@@ -66,19 +124,314 @@ def save_users(users, filename="users.json"):
         json.dump(users, f, indent=4)
 
 # ================= Load & Save todos from/to JSON =============== 
-def load_todos(filename="todos.json"):
-    """Load todos from JSON file."""
-    if os.path.exists(filename):
+def load_todos(filename="todos.json", with_details=True):
+    """Load todos from JSON file.
+
+    Args:
+        filename: Path of the todos JSON file.
+        with_details: When False, items whose details live in the details
+            blob file are returned with ``details`` set to None; use
+            ``load_todo_details`` to fetch the text for a single item.
+    """
+    settle(filename)
+    if not os.path.exists(filename):
+        return []
+    with store_lock(filename):
         with open(filename, 'r') as f:
             todos_data = json.load(f)
-            return [TodoItem.from_dict(todo) for todo in todos_data]
-    return []
+    todos = [TodoItem.from_dict(todo) for todo in todos_data]
+    if with_details:
+        load_details(todos, filename)
+    return todos
 
-def save_todos(todos, filename="todos.json"):
-    """Save todos to JSON file."""
-    todos_data = [todo.to_dict() for todo in todos]
-    with open(filename, 'w') as f:
-        json.dump(todos_data, f, indent=4)
+def load_details(todos, filename="todos.json"):
+    """Load the details text of the items that do not have it yet.
+
+    Args:
+        todos: TodoItem objects whose details are needed, e.g. one page.
+        filename: Path of the todos JSON file the items were loaded from.
+    """
+    missing = [todo for todo in todos if todo.details is None]
+    if missing:
+        with DetailsStore(details_path(filename)) as store:
+            for todo in missing:
+                todo.details = store.get(todo.details_ref)
+
+def load_todo_details(todo, filename="todos.json"):
+    """Load the details text of a single todo item if it is not loaded yet.
+
+    Args:
+        todo: The TodoItem whose details are needed.
+        filename: Path of the todos JSON file the item was loaded from.
+
+    Returns:
+        The details text.
+    """
+    load_details([todo], filename)
+    return todo.details
+
+def save_todos(todos, filename="todos.json", changes=None):
+    """Save todos to JSON file.
+
+    Details texts are written to the details blob file and referenced from
+    each record; items whose details were never loaded keep their reference.
+
+    Every save is logged to the store's change log, so other sessions can
+    refresh just the changed items; see ``changelog``.
+
+    When ``changes`` are given, only the changed records are written over
+    the records currently in the file, so changes saved by other sessions
+    since ``todos`` was loaded are kept. Each changed record's stored version
+    must still be the one it was loaded at; a record saved by someone else
+    in the meantime has the change carried over to its new version with
+    ``rebase_change`` instead. Every saved change increments the version.
+
+    Args:
+        todos: The full list of items to save; without ``changes`` it
+            replaces the whole store.
+        filename: Path of the todos JSON file.
+        changes: Optional list of ``(before, after)`` item pairs describing
+            what changed since the list was loaded, used to update derived
+            data incrementally instead of rebuilding it.
+
+    Raises:
+        ConflictError: If another session changed the same field of an
+            item; every other change is still saved.
+    """
+    settle(filename)
+    with store_lock(filename, exclusive=True):
+        conflicts = []
+        merging = changes is not None and os.path.exists(filename)
+        if merging:
+            todos_data, changes, conflicts = _merge_changes(filename, changes)
+        else:
+            with DetailsStore(details_path(filename)) as store:
+                for todo in todos:
+                    store.remember(todo.details_ref)
+                todos_data = _todo_records(todos, store)
+        previous_signature = store_signature(filename)
+        with open(filename, 'w') as f:
+            json.dump(todos_data, f, indent=4)
+        record_changes(filename, changes if merging else None, previous_signature)
+        update_counters(
+            filename, (lambda: load_todos(filename, with_details=False)) if merging else todos,
+            changes, previous_signature,
+        )
+        update_search_index(filename, changes, previous_signature)
+        INDEXES.commit(filename, changes, previous_signature)
+    if conflicts:
+        raise ConflictError(
+            " ".join(str(error) for error in conflicts), [todo for error in conflicts for todo in error.todos]
+        )
+
+def _merge_changes(filename, changes):
+    """Apply changes to the records currently stored in a todos file.
+
+    Returns:
+        ``(records, applied, conflicts)``: every record to write, the
+        changes as made to the stored items, and the ConflictErrors of the
+        changes that were left out.
+    """
+    with open(filename, 'r') as f:
+        todos_data = json.load(f)
+    positions = {todo_data["id"]: position for position, todo_data in enumerate(todos_data)}
+    applied, conflicts, written = [], [], []
+    for before, after in coalesce_changes(changes):
+        position = positions.get(after.id)
+        if position is None:
+            if before is not None:
+                conflicts.append(ConflictError(f"'{after.title}' was removed in another session meanwhile."))
+                continue
+            position = positions[after.id] = len(todos_data)
+            todos_data.append(None)
+            current = None
+        else:
+            current = TodoItem.from_dict(todos_data[position])
+            if before is not None and current.version != before.version:
+                try:
+                    rebase_change(before, after, current)
+                except ConflictError as error:
+                    conflicts.append(error)
+                    continue
+            elif after.details is None:
+                # The text is unchanged but may have moved in a compaction
+                after.details_ref = current.details_ref
+            after.version = current.version + 1
+        applied.append((current, after))
+        written.append(position)
+
+    with DetailsStore(details_path(filename)) as store:
+        for todo_data in todos_data:
+            if todo_data is not None:
+                store.remember(todo_data.get("details_ref"))
+        records = _todo_records([after for _, after in applied], store)
+    for position, record in zip(written, records):
+        todos_data[position] = record
+    return todos_data, applied, conflicts
+
+def _todo_records(todos, store):
+    """Write the details of items to a DetailsStore and return their records."""
+    todos_data = []
+    for todo in todos:
+        todo_data = todo.to_dict()
+        details = todo_data.pop("details")
+        if details:
+            todo.details_ref = store.put(details)
+        elif details is not None:
+            todo.details_ref = None
+        todo_data["details_ref"] = todo.details_ref
+        todo_data["version"] = todo.version
+        todos_data.append(todo_data)
+    return todos_data
+
+def append_todos(new_todos, filename="todos.json"):
+    """Append new items to the store without rewriting the existing records.
+
+    The records are written over the closing bracket of the JSON array in
+    the same layout ``save_todos`` uses, so the cost depends only on the
+    number of new items.
+
+    Args:
+        new_todos: TodoItem objects to add.
+        filename: Path of the todos JSON file.
+
+    Raises:
+        ValueError: If the file does not end with a JSON array.
+    """
+    settle(filename)
+    with store_lock(filename, exclusive=True):
+        if not os.path.exists(filename):
+            save_todos(new_todos, filename, changes=[(None, todo) for todo in new_todos])
+            return
+        if not new_todos:
+            return
+        with DetailsStore(details_path(filename)) as store:
+            if any(todo.details for todo in new_todos) and not os.path.exists(details_index_path(store.path)):
+                # Blob files written before the index existed list their texts only in the records
+                with open(filename, 'r') as f:
+                    for todo_data in json.load(f):
+                        store.remember(todo_data.get("details_ref"))
+            todos_data = _todo_records(new_todos, store)
+        entries = ",\n".join(
+            "    " + json.dumps(todo_data, indent=4).replace("\n", "\n    ") for todo_data in todos_data
+        ).encode("utf-8")
+
+        previous_signature = store_signature(filename)
+        with open(filename, 'r+b') as f:
+            end = f.seek(0, os.SEEK_END)
+            f.seek(max(0, end - 64))
+            tail = f.read()
+            tail_start = end - len(tail)
+            body = tail.rstrip()
+            if not body.endswith(b"]"):
+                raise ValueError(f"{filename} does not end with a JSON array.")
+            body = body[:-1].rstrip()
+            separator = b"\n" if body.endswith(b"[") else b",\n"
+            f.seek(tail_start + len(body))
+            f.truncate()
+            f.write(separator + entries + b"\n]")
+
+        changes = [(None, todo) for todo in new_todos]
+        record_changes(filename, changes, previous_signature)
+        update_counters(filename, lambda: load_todos(filename, with_details=False), changes, previous_signature)
+        update_search_index(filename, changes, previous_signature)
+        INDEXES.commit(filename, changes, previous_signature)
+
+def compact_details(filename="todos.json"):
+    """Rewrite the details blob file with only the texts still referenced.
+
+    The blob file is append-only, so texts that were replaced or belong to
+    removed items stay in it until it is compacted. Every record is saved
+    again with a reference into the new file.
+
+    Args:
+        filename: Path of the todos JSON file.
+
+    Returns:
+        ``(before, after)`` sizes of the blob file in bytes.
+    """
+    settle(filename)
+    with store_lock(filename, exclusive=True):
+        path = details_path(filename)
+        if not os.path.exists(filename):
+            return 0, 0
+        before = os.path.getsize(path) if os.path.exists(path) else 0
+        todos = load_todos(filename)
+        compacted = path + ".tmp"
+        for leftover in (compacted, details_index_path(compacted)):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+        with DetailsStore(compacted) as store:
+            for todo in todos:
+                todo.details_ref = store.put(todo.details) if todo.details else None
+        # Without an index nothing reuses the old offsets while the files are swapped
+        if os.path.exists(details_index_path(path)):
+            os.remove(details_index_path(path))
+        if os.path.exists(compacted):
+            os.replace(compacted, path)
+            os.replace(details_index_path(compacted), details_index_path(path))
+        elif os.path.exists(path):
+            os.remove(path)
+        save_todos(todos, filename)
+        return before, os.path.getsize(path) if os.path.exists(path) else 0
+
+def load_todos_for_index(filename="todos.json"):
+    """Load todos without details for building an in-memory index."""
+    return load_todos(filename, with_details=False)
+
+_MANAGERS = {}
+
+def pending_manager(filename="todos.json"):
+    """Return the TodoManager of a store if it has unsaved changes, else None."""
+    manager = _MANAGERS.get(os.path.abspath(filename))
+    return manager if manager is not None and manager.pending() else None
+
+def todo_manager(filename="todos.json"):
+    """Return the TodoManager holding a store, creating it on first use.
+
+    The interactive screens change items through it: changes are applied to
+    the items held in memory and written by its writing thread, instead of
+    loading the whole store again for every change.
+
+    Args:
+        filename: Path of the todos JSON file.
+    """
+    path = os.path.abspath(filename)
+    manager = _MANAGERS.get(path)
+    if manager is None:
+        # The functions are looked up on every call so they can be replaced
+        manager = _MANAGERS[path] = TodoManager(
+            path,
+            lambda filename: load_todos_for_index(filename),
+            lambda todos, filename, changes: save_todos(todos, filename, changes),
+            lambda todos, filename: append_todos(todos, filename),
+        )
+    return manager
+
+def load_todo_summary(username, filename="todos.json"):
+    """Load the item counters of a user without loading the items.
+
+    The counters are only rebuilt from the store when they are missing or
+    stale because the store was changed by something other than save_todos.
+
+    Args:
+        username: The username of the current user.
+        filename: Path of the todos JSON file.
+
+    Returns:
+        Counter record with total, pending, completed and per-priority counts.
+    """
+    manager = pending_manager(filename)
+    if manager is not None:
+        # Counting the held items avoids waiting for the autosave
+        return build_counters(manager.todos(username)).get(username, empty_counts())
+    owners = load_counters(filename)
+    if owners is None:
+        settle(filename)
+        # Holding the lock keeps a save from landing between the load and the write
+        with store_lock(filename):
+            owners = update_counters(filename, load_todos(filename, with_details=False))
+    return owners.get(username, empty_counts())
 
 # ================= Load & Save login history from/to JSON =============== 
 def load_login_history(filename="login_history.json"):
@@ -110,6 +463,17 @@ def log_login_attempt(username, success):
     save_login_history(history)
 
 # =================== User Login here =================== 
+def authenticate(users, username, password):
+    """Check a username and password against the registered users.
+
+    Returns:
+        True if the credentials match a user.
+    """
+    return any(
+        user.get("username") == username and str(user.get("password")) == password
+        for user in users
+    )
+
 def handle_login(users):
     """Handle the login process.
     
@@ -119,12 +483,10 @@ def handle_login(users):
     print("\n--- Login ---")
     username = input("Username: ").strip()
     password = input("Password: ").strip()
-    # TODO: Implement login logic
-    for user in users:
-        if user.get("username") == username and str(user.get("password")) == password:
-            print(f"Login successful! Welcome back, {username}!")
-            log_login_attempt(username, True)
-            return username
+    if authenticate(users, username, password):
+        print(f"Login successful! Welcome back, {username}!")
+        log_login_attempt(username, True)
+        return username
     print("Invalid username or password.")
     log_login_attempt(username, False)
     return None
@@ -169,68 +531,273 @@ def handle_create_todo(username):
     print("[3] LOW")
     priority_choice = input("Select priority (1-3): ").strip()
     
-    priority_map = {"1": Priority.HIGH, "2": Priority.MID, "3": Priority.LOW}
-    priority = priority_map.get(priority_choice, Priority.MID)
+    priority = PRIORITY_CHOICES.get(priority_choice, Priority.MID)
     
-    # Create the todo item
-    todo = TodoItem(
-        title=title,
-        details=details,
-        priority=priority,
-        owner=username
-    )
+    duplicates = similar_todos(username, f"{title} {details}", threshold=DUPLICATE_THRESHOLD)
+    if duplicates:
+        print("\nThis looks like items you already have:")
+        for match, score in duplicates:
+            print(f"  #{short_id(match)} {match.title} [{match.status.value}] ({score:.0%} similar)")
+        if input("Create anyway? (y/n): ").strip().lower() != "y":
+            print("To-do item not created.")
+            return
     
-    # Load existing todos, add the new one, and save
-    todos = load_todos()
-    todos.append(todo)
-    save_todos(todos)
+    todo = todo_manager().create(username, title, details, priority)
     
     print(f"\n✓ To-Do item '{title}' created successfully!")
-    print(f"  ID: {todo.id}")
+    print(f"  ID: {todo.id} (short: #{short_id(todo)})")
     print(f"  Priority: {priority.value}")
     print(f"  Status: {todo.status.value}")
 
+# =================== Paged Listing helpers ===================
+def owner_matcher(username, status=None):
+    """Return a predicate selecting a user's raw todo records.
+
+    Args:
+        username: The username whose items to select.
+        status: Optional Status the items must have.
+    """
+    if status is None:
+        return lambda record: record["owner"] == username
+    return lambda record: record["owner"] == username and record["status"] == status.value
+
+def page_navigation_lines(cursor):
+    """Return the page navigation options available for a cursor.
+
+    Returns:
+        A list with one line of options, or an empty list on a single page.
+    """
+    options = []
+    if cursor.has_prev():
+        options.append("[p] Previous page")
+    if cursor.has_next():
+        options.append("[n] Next page")
+    return ["  ".join(options)] if options else []
+
+def handle_page_navigation(cursor, choice):
+    """Move a cursor if the choice is a page navigation command.
+
+    Returns:
+        True if the choice was handled as navigation.
+    """
+    if choice.lower() == "n" and cursor.has_next():
+        cursor.next()
+        return True
+    if choice.lower() == "p" and cursor.has_prev():
+        cursor.prev()
+        return True
+    return False
+
+def manager_cursor(username, status=None):
+    """Return a cursor over the user's items kept by the TodoManager.
+
+    Pages are read from the store, or from the items the manager holds
+    while it has unsaved changes.
+
+    Args:
+        username: The username whose items to page through.
+        status: Optional Status the items must have.
+    """
+    counter = "total" if status is None else status.value.lower()
+    return ManagedCursor(
+        todo_manager(), username, owner_matcher(username, status),
+        lambda todo: status is None or todo.status == status,
+        lambda: load_todo_summary(username)[counter],
+    )
+
+def lookup_index(index_class, filename="todos.json"):
+    """Return an index to look items up in without waiting for the autosave.
+
+    While the TodoManager has unsaved changes the index is built from the
+    items it holds; otherwise the cached index of the store is used.
+
+    Args:
+        index_class: TodoIndex subclass to use.
+        filename: Path of the todos JSON file.
+    """
+    manager = pending_manager(filename)
+    if manager is None:
+        return INDEXES.get(index_class, filename, load_todos_for_index)
+    index = index_class()
+    index.rebuild(manager.todos())
+    return index
+
+def page_count(total, page_size=PAGE_SIZE):
+    """Return the number of pages needed for a number of items."""
+    return max(1, -(-total // page_size))
+
+def find_todo_by_short_id(username, choice, status=None, filename="todos.json"):
+    """Find one of the user's items by a ``#``-prefixed id prefix.
+
+    The prefix is resolved through the in-memory id index, so no other item
+    is loaded or printed. A message is printed when no single item matches.
+
+    Args:
+        username: The username of the current user.
+        choice: The user's input, e.g. ``"#1a2b3c"``.
+        status: Optional Status the item must have.
+        filename: Path of the todos JSON file.
+
+    Returns:
+        The matching TodoItem, or None.
+    """
+    prefix = choice.lstrip("#").strip().lower()
+    if not prefix:
+        print("Invalid input.")
+        return None
+    matches = lookup_index(IdPrefixIndex, filename).find(username, prefix)
+    if not matches:
+        print(f"No to-do item matches #{prefix}.")
+        return None
+    if len(matches) > 1:
+        print(f"#{prefix} matches several items; type more of the id.")
+        return None
+    todo = matches[0]
+    if status is not None and todo.status != status:
+        print(f"'{todo.title}' is not {status.value.lower()}.")
+        return None
+    return todo
+
+def find_todo_by_title(username, choice, status=None, filename="todos.json"):
+    """Find one of the user's items by a ``/``-prefixed start of its title.
+
+    Matches come from the in-memory title trie. When several items match,
+    the first few are listed with their ids so the user can refine the
+    input or pick one by ``#id``.
+
+    Args:
+        username: The username of the current user.
+        choice: The user's input, e.g. ``"/buy mi"``.
+        status: Optional Status the item must have.
+        filename: Path of the todos JSON file.
+
+    Returns:
+        The matching TodoItem, or None.
+    """
+    prefix = choice[1:].strip()
+    if not prefix:
+        print("Type the start of a title after '/'.")
+        return None
+    accept = None if status is None else (lambda todo: todo.status == status)
+    matches = lookup_index(TitleTrie, filename).complete(
+        username, prefix, COMPLETION_LIMIT + 1, accept
+    )
+    exact = [todo for todo in matches if title_key(todo.title) == title_key(prefix)]
+    if len(matches) == 1 or len(exact) == 1:
+        return matches[0] if len(matches) == 1 else exact[0]
+    if not matches:
+        print(f"No to-do item title starts with '{prefix}'.")
+        return None
+    lines = [f"\n'{prefix}' matches several items; type more of the title or pick one by #id:"]
+    lines += [f"  #{short_id(todo)}  {todo.title}" for todo in matches[:COMPLETION_LIMIT]]
+    if len(matches) > COMPLETION_LIMIT:
+        lines.append("  ...")
+    write_screen(lines)
+    return None
+
+def save_todo_changes(changes, filename="todos.json"):
+    """Write changed items back to the store.
+
+    Args:
+        changes: List of ``(before, after)`` pairs; each ``after`` item
+            replaces the stored item with the same id.
+        filename: Path of the todos JSON file.
+
+    Raises:
+        ConflictError: If another session changed the same field meanwhile.
+    """
+    # save_todos writes the changes over the records it finds in the file
+    save_todos([after for _, after in changes], filename, changes=changes)
+
 # =================== View All Todos here ===================
 def handle_view_all_todos(username):
     """Handle viewing all to-do items for the current user.
     
+    Items are shown one page at a time; only the visible page and its
+    details are read, or taken from the items the TodoManager holds while
+    it has unsaved changes. The list can be filtered with a query
+    expression and sorted by a field, in which case a QueryCursor picks an
+    index or a single-pass partial sort.
+
     Args:
         username: The username of the current user.
     """
+    cursor = manager_cursor(username)
+    filter_text, sort_text = "", ""
     while True:
-        todos = load_todos()
-        user_todos = [todo for todo in todos if todo.owner == username]
+        page = cursor.page()
         
-        if not user_todos:
+        if not page.items:
+            if filter_text:
+                print("\nNo items match the filter; showing all items.")
+                filter_text = ""
+                cursor = view_cursor(username, None, sort_text)
+                continue
             print("\n✗ You have no to-do items yet.")
             input("\nPress Enter to return to menu...")
             return
         
-        print("\n" + "=" * 80)
-        print(f"  Your To-Do Items ({len(user_todos)} total)")
-        print("=" * 80)
-        
-        for idx, todo in enumerate(user_todos, 1):
-            status_symbol = "✓" if todo.status.value == "COMPLETED" else "○"
-            print(f"\n[{idx}] {status_symbol} {todo.title}")
-            print(f"    Priority: {todo.priority.value}")
-            print(f"    Status: {todo.status.value}")
-            if todo.details:
-                print(f"    Details: {todo.details}")
-            print(f"    Created: {todo.created_at}")
-            print(f"    Updated: {todo.updated_at}")
-        
-        print("\n" + "=" * 80)
-        print("[0] Return to Menu")
-        print("=" * 80)
+        total = cursor.total
+        lines = [
+            "",
+            "=" * 80,
+            f"  Your To-Do Items ({total} total) - Page {page.number + 1} of {page_count(total)}",
+        ]
+        if filter_text or sort_text:
+            lines.append(f"  Filter: {filter_text or 'none'}   Sort: {sort_text or 'list order'}")
+        lines.append("=" * 80)
+        load_details(page.items)
+        for entry in render_items(page.items, page.start, "full"):
+            lines += ["", entry]
+        lines += ["", "=" * 80]
+        lines += page_navigation_lines(cursor)
+        lines += ["[f] Filter  [s] Sort", "[0] Return to Menu", "=" * 80]
+        write_screen(lines)
         
         choice = input("\nSelect an option (0 to return): ").strip()
         
         if choice == "0":
             return
+        elif handle_page_navigation(cursor, choice):
+            continue
+        elif choice.lower() == "f":
+            text = input(
+                "Filter, e.g. priority = HIGH and status = pending or title ~ report (empty to clear): "
+            ).strip()
+            try:
+                node = parse_filter(text) if text else None
+            except QueryError as error:
+                print(f"\nInvalid filter: {error}")
+                continue
+            filter_text = text
+            cursor = view_cursor(username, node, sort_text)
+        elif choice.lower() == "s":
+            text = input(
+                f"Sort by {', '.join(SORT_KEYS)} (prefix with - for descending, empty for list order): "
+            ).strip()
+            try:
+                parse_sort(text)
+            except ValueError as error:
+                print(f"\n{error}")
+                continue
+            sort_text = text
+            cursor = view_cursor(username, parse_filter(filter_text) if filter_text else None, sort_text)
         else:
             print("\nInvalid option. Please select 0 to return to menu.")
 
+def view_cursor(username, node, sort_text):
+    """Return the cursor for a view with an optional filter and sort.
+
+    Args:
+        username: The username of the current user.
+        node: Parsed filter, or None.
+        sort_text: Sort choice as accepted by ``parse_sort``.
+    """
+    sort, descending = parse_sort(sort_text)
+    if node is None and sort is None:
+        return manager_cursor(username)
+    return QueryCursor("todos.json", username, node, sort, descending, INDEXES, load_todos_for_index)
+
 # =================== View Todo Details here ===================
 def handle_view_todo_details(username):
     """Handle viewing detailed information about a specific todo item.
@@ -238,35 +805,43 @@ def handle_view_todo_details(username):
     Args:
         username: The username of the current user.
     """
+    cursor = manager_cursor(username)
     while True:
-        todos = load_todos()
+        page = cursor.page()
         
-        # Get user's todos
-        user_todos = [todo for todo in todos if todo.owner == username]
-        
-        if not user_todos:
+        if not page.items:
             print("\n✗ You have no to-do items to view.")
             input("\nPress Enter to return to menu...")
             return
         
-        print("\n--- View To-Do Item Details ---")
-        print("\nYour to-do items:")
-        for idx, todo in enumerate(user_todos, 1):
-            status_symbol = "✓" if todo.status.value == "COMPLETED" else "○"
-            print(f"[{idx}] {status_symbol} {todo.title}")
+        write_screen(
+            ["", "--- View To-Do Item Details ---", "", "Your to-do items:"]
+            + render_items(page.items, page.start, "symbol")
+            + page_navigation_lines(cursor)
+        )
         
-        try:
-            choice = int(input("\nSelect item number to view (0 to return to menu): ").strip())
-            if choice == 0:
-                return
-            if choice < 1 or choice > len(user_todos):
-                print("Invalid selection.")
-                continue
-        except ValueError:
-            print("Invalid input.")
+        choice = input("\nSelect item number or #id to view (0 to return to menu): ").strip()
+        if handle_page_navigation(cursor, choice):
             continue
+        if choice.startswith("#"):
+            todo = find_todo_by_short_id(username, choice)
+            if todo is None:
+                continue
+        else:
+            try:
+                choice = int(choice)
+                if choice == 0:
+                    return
+                todo = cursor.item_at(choice)
+                if todo is None:
+                    print("Invalid selection.")
+                    continue
+            except ValueError:
+                print("Invalid input.")
+                continue
         
-        todo = user_todos[choice - 1]
+        load_todo_details(todo)
+        related = related_todos(todo)
         
         while True:
             print("\n" + "=" * 60)
@@ -279,6 +854,10 @@ def handle_view_todo_details(username):
             print(f"Owner:        {todo.owner}")
             print(f"Created:      {todo.created_at}")
             print(f"Updated:      {todo.updated_at}")
+            if related:
+                print("\nRelated items:")
+                for match, score in related:
+                    print(f"  #{short_id(match)} {match.title} [{match.status.value}] ({score:.0%} similar)")
             print("=" * 60)
             print("[0] Return to Item List")
             print("=" * 60)
@@ -297,32 +876,44 @@ def handle_edit_todo(username):
     Args:
         username: The username of the current user.
     """
-    todos = load_todos()
+    cursor = manager_cursor(username)
     
-    # Get user's todos
-    user_todos = [todo for todo in todos if todo.owner == username]
-    
-    if not user_todos:
+    if not cursor.page().items:
         print("\n✗ You have no to-do items to edit.")
         return
     
-    print("\n--- Edit To-Do Item ---")
-    print("\nYour to-do items:")
-    for idx, todo in enumerate(user_todos, 1):
-        print(f"[{idx}] {todo.title} (Priority: {todo.priority.value}, Status: {todo.status.value})")
+    while True:
+        page = cursor.page()
+        write_screen(
+            ["", "--- Edit To-Do Item ---", "", "Your to-do items:"]
+            + render_items(page.items, page.start, "status")
+            + page_navigation_lines(cursor)
+        )
+        
+        choice = input("\nSelect item number, #id or /title to edit (0 to cancel): ").strip()
+        if not handle_page_navigation(cursor, choice):
+            break
     
-    try:
-        choice = int(input("\nSelect item number to edit (0 to cancel): ").strip())
-        if choice == 0:
+    if choice.startswith("#"):
+        todo_to_edit = find_todo_by_short_id(username, choice)
+        if todo_to_edit is None:
             return
-        if choice < 1 or choice > len(user_todos):
-            print("Invalid selection.")
+    elif choice.startswith("/"):
+        todo_to_edit = find_todo_by_title(username, choice)
+        if todo_to_edit is None:
+            return
+    else:
+        try:
+            choice = int(choice)
+            if choice == 0:
+                return
+            todo_to_edit = cursor.item_at(choice)
+            if todo_to_edit is None:
+                print("Invalid selection.")
+                return
+        except ValueError:
+            print("Invalid input.")
             return
-    except ValueError:
-        print("Invalid input.")
-        return
-    
-    todo_to_edit = user_todos[choice - 1]
     
     print(f"\nEditing: '{todo_to_edit.title}'")
     print("\nWhat would you like to edit?")
@@ -334,39 +925,25 @@ def handle_edit_todo(username):
     edit_choice = input("Select option (1-4): ").strip()
     
     if edit_choice == "1":
-        new_title = input("New title: ").strip()
-        if new_title:
-            todo_to_edit.title = new_title
+        change = edit_todo(todo_to_edit, title=input("New title: ").strip())
     elif edit_choice == "2":
-        new_details = input("New details: ").strip()
-        if new_details:
-            todo_to_edit.details = new_details
+        current_details = load_todo_details(todo_to_edit)
+        print(f"Current details: {current_details if current_details else 'N/A'}")
+        change = edit_todo(todo_to_edit, details=input("New details: ").strip())
     elif edit_choice == "3":
         print("\nPriority levels:")
         print("[1] HIGH")
         print("[2] MID")
         print("[3] LOW")
         priority_choice = input("Select priority (1-3): ").strip()
-        priority_map = {"1": Priority.HIGH, "2": Priority.MID, "3": Priority.LOW}
-        if priority_choice in priority_map:
-            todo_to_edit.priority = priority_map[priority_choice]
+        change = edit_todo(todo_to_edit, priority=PRIORITY_CHOICES.get(priority_choice))
     elif edit_choice == "4":
         return
     else:
         print("Invalid option.")
         return
     
-    # Update the timestamp
-    from datetime import datetime
-    todo_to_edit.updated_at = datetime.now().isoformat()
-    
-    # Find and update the original todo in the list
-    for i, todo in enumerate(todos):
-        if todo.id == todo_to_edit.id:
-            todos[i] = todo_to_edit
-            break
-    
-    save_todos(todos)
+    todo_manager().commit([change])
     print(f"\n✓ To-Do item updated successfully!")
 
 # =================== Mark Todo as Completed here ===================
@@ -376,46 +953,56 @@ def handle_mark_todo_completed(username):
     Args:
         username: The username of the current user.
     """
+    # Only the user's todos that are not yet completed
+    cursor = manager_cursor(username, Status.PENDING)
     while True:
-        todos = load_todos()
+        page = cursor.page()
         
-        # Get user's todos that are not yet completed
-        user_todos = [todo for todo in todos if todo.owner == username and todo.status == Status.PENDING]
-        
-        if not user_todos:
+        if not page.items:
             print("\n✗ You have no pending to-do items to mark as completed.")
             input("\nPress Enter to return to menu...")
             return
         
-        print("\n--- Mark To-Do as Completed ---")
-        print("\nYour pending to-do items:")
-        for idx, todo in enumerate(user_todos, 1):
-            print(f"[{idx}] {todo.title} (Priority: {todo.priority.value})")
+        write_screen(
+            ["", "--- Mark To-Do as Completed ---", "", "Your pending to-do items:"]
+            + render_items(page.items, page.start, "priority")
+            + page_navigation_lines(cursor)
+        )
         
-        try:
-            choice = int(input("\nSelect item number to mark as completed (0 to return to menu): ").strip())
-            if choice == 0:
-                return
-            if choice < 1 or choice > len(user_todos):
-                print("Invalid selection.")
+        choice = input(
+            "\nSelect item number, #id, /title or several items (e.g. 1-5,8 or all HIGH)"
+            " to mark as completed (0 to return to menu): "
+        ).strip()
+        if handle_page_navigation(cursor, choice):
+            continue
+        if choice.startswith("/"):
+            todo_to_complete = find_todo_by_title(username, choice, Status.PENDING)
+            if todo_to_complete is None:
                 continue
-        except ValueError:
-            print("Invalid input.")
+        elif choice.startswith("#"):
+            todo_to_complete = find_todo_by_short_id(username, choice, Status.PENDING)
+            if todo_to_complete is None:
+                continue
+        elif is_multi_selection(choice):
+            if handle_bulk_completion(cursor, choice):
+                return
             continue
-        
-        todo_to_complete = user_todos[choice - 1]
+        else:
+            try:
+                choice = int(choice)
+                if choice == 0:
+                    return
+                todo_to_complete = cursor.item_at(choice)
+                if todo_to_complete is None:
+                    print("Invalid selection.")
+                    continue
+            except ValueError:
+                print("Invalid input.")
+                continue
         
         # Update the status and timestamp
-        todo_to_complete.status = Status.COMPLETED
-        todo_to_complete.updated_at = datetime.now().isoformat()
-        
-        # Find and update the original todo in the list
-        for i, todo in enumerate(todos):
-            if todo.id == todo_to_complete.id:
-                todos[i] = todo_to_complete
-                break
-        
-        save_todos(todos)
+        todo_manager().commit([complete_todo(todo_to_complete)])
+        cursor.refresh()
         
         print("\n" + "=" * 60)
         print("  Completion Confirmation")
@@ -434,6 +1021,202 @@ def handle_mark_todo_completed(username):
         else:
             print("\nInvalid option. Please select 0 to return to menu.")
 
+def handle_bulk_completion(cursor, choice):
+    """Complete every pending item picked by a multi-item selection.
+
+    All selected items are found in one pass over the store and completed
+    with a single write.
+
+    Args:
+        cursor: Cursor over the user's pending items.
+        choice: Selection typed by the user, e.g. ``"1-50,73"`` or ``"all HIGH"``.
+
+    Returns:
+        True if the user chose to return to the menu afterwards.
+    """
+    try:
+        selection = parse_selection(choice)
+    except ValueError as error:
+        print(f"Invalid selection: {error}")
+        return False
+    todos = cursor.select(selection)
+    if not todos:
+        print("No pending items match that selection.")
+        return False
+
+    if len(todos) > 1:
+        confirm = input(f"\nMark {len(todos)} items as completed? (y/n): ").strip().lower()
+        if confirm != "y":
+            print("Nothing was changed.")
+            return False
+
+    todo_manager().commit([complete_todo(todo) for todo in todos])
+    cursor.refresh()
+
+    lines = ["", "=" * 60, "  Completion Confirmation", "=" * 60, ""]
+    lines += [f"✓ {len(todos)} to-do item(s) marked as completed:"]
+    lines += [f"  - {todo.title}" for todo in todos[:BULK_CONFIRMATION_TITLES]]
+    if len(todos) > BULK_CONFIRMATION_TITLES:
+        lines.append(f"  ... and {len(todos) - BULK_CONFIRMATION_TITLES} more")
+    lines += ["=" * 60, "[0] Return to Menu", "=" * 60]
+    write_screen(lines)
+    return input("\nSelect an option (0 to return, Enter to continue): ").strip() == "0"
+
+# =================== View Next Up here ===================
+def handle_view_next_up(username, count=NEXT_UP_COUNT):
+    """Handle viewing the most urgent pending to-do items.
+
+    Items are ordered by priority, then by creation time, and come from the
+    in-memory next-up index rather than sorting the user's whole list.
+
+    Args:
+        username: The username of the current user.
+        count: Number of items to show.
+    """
+    while True:
+        index = INDEXES.get(NextUpIndex, "todos.json", load_todos_for_index)
+        next_todos = index.top(username, count)
+
+        if not next_todos:
+            print("\n✗ You have no pending to-do items.")
+            input("\nPress Enter to return to menu...")
+            return
+
+        lines = [
+            "",
+            "=" * 80,
+            f"  Next Up (top {len(next_todos)} of {index.pending_count(username)} pending)",
+            "=" * 80,
+        ]
+        for entry in render_items(next_todos, 0, "urgency"):
+            lines += ["", entry]
+        lines += ["", "=" * 80, "[0] Return to Menu", "=" * 80]
+        write_screen(lines)
+
+        choice = input("\nSelect an option (0 to return): ").strip()
+
+        if choice == "0":
+            return
+        else:
+            print("\nInvalid option. Please select 0 to return to menu.")
+
+# =================== Full-Screen View here ===================
+def complete_todo_item(todo):
+    """Mark a single to-do item as completed and save it.
+
+    Args:
+        todo: The TodoItem to complete.
+
+    Returns:
+        A short message describing the outcome.
+    """
+    change = complete_todo(todo)
+    if change is None:
+        return f"'{todo.title}' is already completed."
+    todo_manager().commit([change])
+    return f"✓ '{todo.title}' marked as completed."
+
+def handle_full_screen_view(username):
+    """Handle the full-screen, scrollable to-do list.
+
+    Args:
+        username: The username of the current user.
+    """
+    if not tui_available():
+        print("\n✗ The full-screen view needs an interactive terminal.")
+        return
+    total = load_todo_summary(username)["total"]
+    rows = VirtualList("todos.json", owner_matcher(username), total,
+                       count=lambda: load_todo_summary(username)["total"])
+    run_todo_tui(username, rows, complete_todo_item)
+
+# =================== Search Todos here ===================
+def search_todos(username, query, filename="todos.json"):
+    """Find a user's items whose title or details match a search query.
+
+    The persisted search index is built on first use and kept current by
+    ``save_todos`` afterwards.
+
+    Args:
+        username: The username of the current user.
+        query: Search words; see ``search.SearchIndex.search``.
+        filename: Path of the todos JSON file.
+
+    Returns:
+        Matching TodoItem objects without details, most recently updated first.
+    """
+    if store_signature(filename) is None:
+        return []
+    index = load_search_index(filename)
+    if index is None:
+        settle(filename)
+        # Holding the lock keeps a save from landing between the load and the write
+        with store_lock(filename):
+            index = SearchIndex()
+            index.rebuild(load_todos(filename))
+            write_search_index(filename, index)
+    ids = index.search(username, query)
+    by_id = INDEXES.get(IdPrefixIndex, filename, load_todos_for_index)
+    todos = [match for todo_id in ids for match in by_id.find(username, todo_id, limit=1)]
+    return sorted(todos, key=lambda todo: todo.updated_at, reverse=True)
+
+def similar_todos(username, text, threshold=RELATED_THRESHOLD, filename="todos.json"):
+    """Find a user's items whose words are similar to a text.
+
+    Returns an empty list when NumPy is not installed.
+
+    Args:
+        username: The username of the current user.
+        text: Title and details to compare with.
+        threshold: Minimum cosine similarity of the TF-IDF vectors.
+        filename: Path of the todos JSON file.
+
+    Returns:
+        List of ``(todo, score)`` pairs, most similar first.
+    """
+    if not similarity_available() or store_signature(filename) is None:
+        return []
+    return INDEXES.get(SimilarityIndex, filename, load_todos).similar(username, text, threshold=threshold)
+
+def related_todos(todo, filename="todos.json"):
+    """Find the items of the same user most similar to an item.
+
+    Returns:
+        List of ``(todo, score)`` pairs, most similar first; empty when
+        NumPy is not installed.
+    """
+    if not similarity_available() or store_signature(filename) is None:
+        return []
+    return INDEXES.get(SimilarityIndex, filename, load_todos).related(todo.id)
+
+def handle_search_todos(username):
+    """Handle searching the current user's items by keyword.
+
+    Args:
+        username: The username of the current user.
+    """
+    print("\n--- Search To-Do Items ---")
+    print("Words must all match; use OR for alternatives and * for prefixes, e.g. report* OR slides")
+    query = input("Search: ").strip()
+    if not query:
+        print("Search cannot be empty.")
+        return
+    results = search_todos(username, query)
+    if not results:
+        print(f"\nNo items match '{query}'.")
+        input("\nPress Enter to return to menu...")
+        return
+
+    lines = ["", "=" * 80, f"  {len(results)} item(s) match '{query}'", "=" * 80]
+    load_details(results[:PAGE_SIZE])
+    for entry in render_items(results[:PAGE_SIZE], 0, "full"):
+        lines += ["", entry]
+    if len(results) > PAGE_SIZE:
+        lines += ["", f"  ... {len(results) - PAGE_SIZE} more; refine the search to narrow it down."]
+    lines += ["", "=" * 80]
+    write_screen(lines)
+    input("\nPress Enter to return to menu...")
+
 # =================== Post-Login Menu Handler ===================
 def handle_post_login_menu(username):
     """Handle the post-login menu loop.
@@ -456,36 +1239,83 @@ def handle_post_login_menu(username):
         elif choice == "5":
             handle_mark_todo_completed(username)
         elif choice == "6":
+            handle_view_next_up(username)
+        elif choice == "7":
+            handle_full_screen_view(username)
+        elif choice == "8":
+            handle_search_todos(username)
+        elif choice == "9":
+            save_pending_changes()
             print(f"\nLogging out... Goodbye, {username}!")
             break
         else:
-            print("\nInvalid option. Please select 1-6.")
+            print("\nInvalid option. Please select 1-9.")
+
+def save_pending_changes():
+    """Wait until the autosave has written every change, reporting failures.
+
+    Returns:
+        True if every change was saved.
+    """
+    manager = todo_manager()
+    if manager.pending():
+        print("\nSaving your changes...")
+    try:
+        manager.flush()
+    except (OSError, ValueError) as error:
+        print(f"\n✗ Some changes could not be saved: {error}")
+        return False
+    return True
+
+def autosave_delay():
+    """Return the autosave delay in seconds, from ``TODO_AUTOSAVE_DELAY`` if set."""
+    try:
+        return max(0.0, float(os.environ.get("TODO_AUTOSAVE_DELAY", AUTOSAVE_DELAY)))
+    except ValueError:
+        return AUTOSAVE_DELAY
+
+def _terminate(signum, frame):
+    # Unwinding through main() saves the pending changes before exiting
+    raise SystemExit(128 + signum)
 
 def main():
     """Main application loop.
 
     Implements a REPL (Read-Eval-Print Loop) for the CLI application.
+    Changes are saved in the background a moment after they are made, so
+    screens return without waiting for the disk; logging out, exiting and
+    SIGTERM all wait until everything is written.
     """
     
     print("Starting To-Do List Application...")
+    manager = todo_manager()
+    manager.write_behind = True
+    manager.debounce = autosave_delay()
+    signal.signal(signal.SIGTERM, _terminate)
 
-    while True:
-        display_pre_login_menu()
-        choice = get_user_choice()
+    try:
+        while True:
+            display_pre_login_menu()
+            choice = get_user_choice()
 
-        if choice == "1":
-            users = load_users()
-            username = handle_login(users)
-            if username:
-                handle_post_login_menu(username)
-        elif choice == "2":
-            handle_signup()
-        elif choice == "3":
-            print("\nThank you for using To-Do List Manager. Goodbye!")
-            break
-        else:
-            print("\nInvalid option. Please select 1, 2, or 3.")
+            if choice == "1":
+                users = load_users()
+                username = handle_login(users)
+                if username:
+                    handle_post_login_menu(username)
+            elif choice == "2":
+                handle_signup()
+            elif choice == "3":
+                print("\nThank you for using To-Do List Manager. Goodbye!")
+                break
+            else:
+                print("\nInvalid option. Please select 1, 2, or 3.")
+    finally:
+        save_pending_changes()
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        from cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
     main()
@@ -39,6 +39,11 @@ class TodoItem:
         owner: Username of the todo item owner
         created_at: ISO-8601 timestamp of creation
         updated_at: ISO-8601 timestamp of last update
+        details_ref: Location of the details text in the details blob file.
+            When the item was loaded without its details, ``details`` is
+            None and this reference is used to fetch it on demand.
+        version: Number of times the item was saved with a change; a save
+            checks it to detect changes made by another session.
     """
 
     title: str
@@ -49,6 +54,8 @@ class TodoItem:
     id: str = field(default_factory=lambda: str(uuid4()))
     created_at: str = field(default_factory=lambda: datetime.now().isoformat())
     updated_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    details_ref: Optional[dict] = field(default=None, repr=False, compare=False)
+    version: int = field(default=0, repr=False, compare=False)
 
     def to_dict(self) -> dict:
         """Convert the TodoItem to a dictionary for JSON serialization.
@@ -71,6 +78,10 @@ class TodoItem:
     def from_dict(cls, data: dict) -> "TodoItem":
         """Create a TodoItem from a dictionary.
 
+        Records written by the storage layer carry a ``details_ref`` instead
+        of inline ``details``; such items are created with ``details`` set to
+        None until the text is loaded.
+
         Args:
             data: Dictionary containing todo item data.
 
@@ -80,10 +91,12 @@ class TodoItem:
         return cls(
             id=data["id"],
             title=data["title"],
-            details=data["details"],
+            details=data.get("details", None if data.get("details_ref") else ""),
             priority=Priority(data["priority"]),
             status=Status(data["status"]),
             owner=data["owner"],
             created_at=data["created_at"],
             updated_at=data["updated_at"],
+            details_ref=data.get("details_ref"),
+            version=data.get("version", 0),
         )
@@ -0,0 +1,94 @@
+"""Index of the most urgent pending items per owner.
+
+Pending items are kept in a sorted list per owner, ordered by priority and
+then creation time, so the top N items are a slice instead of a sort of the
+user's whole list.
+"""
+
+from bisect import bisect_left, insort
+
+from indexes import TodoIndex
+from models import Priority, Status
+
+PRIORITY_RANK = {Priority.HIGH: 0, Priority.MID: 1, Priority.LOW: 2}
+
+
+def urgency_key(todo):
+    """Return the sort key ordering items by priority, then age."""
+    return (PRIORITY_RANK[todo.priority], todo.created_at, todo.id)
+
+
+class NextUpIndex(TodoIndex):
+    """Per-owner pending items ordered by urgency."""
+
+    def __init__(self):
+        self._keys = {}
+        self._key_of = {}
+        self._items = {}
+
+    def rebuild(self, todos):
+        self._keys = {}
+        self._key_of = {}
+        self._items = {}
+        for todo in todos:
+            if todo.status == Status.PENDING:
+                key = urgency_key(todo)
+                self._keys.setdefault(todo.owner, []).append(key)
+                self._key_of[todo.id] = (todo.owner, key)
+                self._items[todo.id] = todo
+        for keys in self._keys.values():
+            keys.sort()
+
+    def apply(self, before, after):
+        if before is not None:
+            self._discard(before.id)
+        if after is not None and after.status == Status.PENDING:
+            key = urgency_key(after)
+            insort(self._keys.setdefault(after.owner, []), key)
+            self._key_of[after.id] = (after.owner, key)
+            self._items[after.id] = after
+
+    def _discard(self, todo_id):
+        if todo_id not in self._key_of:
+            return
+        owner, key = self._key_of.pop(todo_id)
+        del self._items[todo_id]
+        keys = self._keys[owner]
+        del keys[bisect_left(keys, key)]
+
+    def top(self, owner, count):
+        """Return the most urgent pending items of an owner.
+
+        Args:
+            owner: Username whose items to return.
+            count: Maximum number of items.
+
+        Returns:
+            List of TodoItem objects, most urgent first.
+        """
+        return [self._items[key[2]] for key in self._keys.get(owner, [])[:count]]
+
+    def pending(self, owner, priority=None):
+        """Return an owner's pending items, most urgent first.
+
+        Args:
+            owner: Username whose items to return.
+            priority: Optional Priority; its items are a contiguous run of
+                the sorted list and are found by binary search.
+
+        Returns:
+            List of TodoItem objects.
+        """
+        keys = self._keys.get(owner, [])
+        if priority is not None:
+            rank = PRIORITY_RANK[priority]
+            keys = keys[bisect_left(keys, (rank,)):bisect_left(keys, (rank + 1,))]
+        return [self._items[key[2]] for key in keys]
+
+    def pending_ids(self, owner, priority=None):
+        """Return the ids of ``pending(owner, priority)``."""
+        return [todo.id for todo in self.pending(owner, priority)]
+
+    def pending_count(self, owner):
+        """Return the number of pending items of an owner."""
+        return len(self._keys.get(owner, []))
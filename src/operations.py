@@ -0,0 +1,205 @@
+"""Business rules for changing to-do items.
+
+These functions apply a single operation to in-memory TodoItem objects and
+return the ``(before, after)`` change that ``save_todos`` uses to keep
+derived data current. They never touch the disk, so the interactive
+handlers, the command-line interface and batch jobs share the same rules
+and decide for themselves when to save.
+"""
+
+from dataclasses import replace
+from datetime import datetime
+
+from details_store import details_digest
+from models import TodoItem, Priority, Status
+
+PRIORITY_CHOICES = {"1": Priority.HIGH, "2": Priority.MID, "3": Priority.LOW}
+MERGED_FIELDS = ("title", "priority", "status")
+
+
+class ConflictError(ValueError):
+    """Raised when a change clashes with one saved by another session.
+
+    Args:
+        message: Description naming the items and fields.
+        todos: The conflicting items as they are stored now; items removed
+            meanwhile are left out.
+    """
+
+    def __init__(self, message, todos=()):
+        super().__init__(message)
+        self.todos = list(todos)
+
+
+def parse_priority(value):
+    """Convert a priority name such as ``"high"`` into a Priority.
+
+    Raises:
+        ValueError: If the name is not a priority level.
+    """
+    try:
+        return Priority(str(value).strip().upper())
+    except ValueError:
+        raise ValueError(f"Unknown priority '{value}'. Use HIGH, MID or LOW.") from None
+
+
+def text_value(value, name):
+    """Return a text field of a request, or None if it is missing or null.
+
+    Args:
+        value: The value as decoded from JSON.
+        name: Name of the field, used in the error message.
+
+    Raises:
+        ValueError: If the value is not a string.
+    """
+    if value is None or isinstance(value, str):
+        return value
+    raise ValueError(f"'{name}' must be a string.")
+
+
+def todo_json(todo, with_details=False):
+    """Return the JSON-ready dictionary for an item.
+
+    Args:
+        todo: The TodoItem to convert.
+        with_details: Whether to include the details text.
+    """
+    data = todo.to_dict()
+    if not with_details:
+        del data["details"]
+    return data
+
+
+def create_todo(todos, username, title, details="", priority=Priority.MID):
+    """Create a new item and append it to a list.
+
+    Args:
+        todos: List the new item is appended to.
+        username: Owner of the new item.
+        title: Short description; must not be empty.
+        details: Detailed description.
+        priority: Priority level.
+
+    Returns:
+        The ``(None, todo)`` change.
+
+    Raises:
+        ValueError: If the title is empty.
+    """
+    title = title.strip()
+    if not title:
+        raise ValueError("Title cannot be empty.")
+    todo = TodoItem(title=title, details=details.strip(), priority=priority, owner=username)
+    todos.append(todo)
+    return (None, todo)
+
+
+def edit_todo(todo, title=None, details=None, priority=None):
+    """Update the given fields of an item.
+
+    Empty titles and details are ignored, as in the edit screen.
+
+    Args:
+        todo: The TodoItem to change in place.
+        title: New title, or None to keep it.
+        details: New details, or None to keep them.
+        priority: New Priority, or None to keep it.
+
+    Returns:
+        The ``(before, todo)`` change.
+    """
+    before = replace(todo)
+    if title and title.strip():
+        todo.title = title.strip()
+    if details and details.strip():
+        todo.details = details.strip()
+    if priority is not None:
+        todo.priority = priority
+    todo.updated_at = datetime.now().isoformat()
+    return (before, todo)
+
+
+def complete_todo(todo):
+    """Mark an item as completed.
+
+    Args:
+        todo: The TodoItem to change in place.
+
+    Returns:
+        The ``(before, todo)`` change, or None if it was already completed.
+    """
+    if todo.status == Status.COMPLETED:
+        return None
+    before = replace(todo)
+    todo.status = Status.COMPLETED
+    todo.updated_at = datetime.now().isoformat()
+    return (before, todo)
+
+
+def coalesce_changes(changes):
+    """Merge several changes to the same item into one.
+
+    When an item changes more than once before a save, derived data must
+    see a single change from its state at load time to its final state.
+
+    Args:
+        changes: List of ``(before, after)`` pairs in the order they happened.
+
+    Returns:
+        List with one ``(first before, last after)`` pair per item id.
+    """
+    merged = {}
+    for before, after in changes:
+        key = (after if after is not None else before).id
+        first = merged.get(key)
+        merged[key] = (first[0] if first is not None else before, after)
+    return list(merged.values())
+
+
+def _details_key(todo):
+    """Return what identifies an item's stored details text."""
+    return todo.details_ref["sha256"] if todo.details_ref else todo.details
+
+
+def rebase_change(before, after, current):
+    """Carry a change over to a newer version of the item.
+
+    Used when another session saved the item after ``before`` was loaded.
+    The fields the change touched are set on the current version, and the
+    fields the other session changed are kept. ``after`` is updated in place
+    to hold the result.
+
+    Args:
+        before: The item as it was loaded.
+        after: The item after the change.
+        current: The item as it is stored now.
+
+    Returns:
+        The ``(current, after)`` change.
+
+    Raises:
+        ConflictError: If both sessions changed the same field differently.
+    """
+    ours = [name for name in MERGED_FIELDS if getattr(after, name) != getattr(before, name)]
+    conflicts = [
+        name for name in ours
+        if getattr(current, name) not in (getattr(before, name), getattr(after, name))
+    ]
+    ours_details = after.details is not None and after.details != before.details
+    if ours_details and _details_key(current) not in (_details_key(before), after.details,
+                                                       details_digest(after.details)):
+        conflicts.append("details")
+    if conflicts:
+        raise ConflictError(
+            f"'{before.title}' was changed in another session meanwhile ({', '.join(conflicts)}).",
+            [current],
+        )
+
+    for name in MERGED_FIELDS:
+        if name not in ours:
+            setattr(after, name, getattr(current, name))
+    if not ours_details:
+        after.details, after.details_ref = current.details, current.details_ref
+    after.updated_at = max(after.updated_at, current.updated_at)
+    return (current, after)
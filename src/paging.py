@@ -0,0 +1,450 @@
+"""Cursor-based, page-at-a-time reads of the todo store.
+
+``todos.json`` is read as a stream of records instead of being parsed as a
+whole, so showing one page only decodes the records up to the end of that
+page and only turns the matching ones on the page into TodoItem objects.
+A cursor remembers the byte offset where each visited page starts, so
+moving to the next page continues from there instead of rescanning.
+"""
+
+import codecs
+import json
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from locking import store_lock
+from models import TodoItem
+from sidecars import settle, store_signature
+
+PAGE_SIZE = 20
+CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def iter_records(filename, offset=None):
+    """Stream the records of a todos file.
+
+    The store's shared lock is held until the records are exhausted or the
+    generator is closed.
+
+    Args:
+        filename: Path of the todos JSON file.
+        offset: Byte offset of a record to start from, as yielded by a
+            previous call; None starts at the beginning of the file.
+
+    Yields:
+        ``(offset, record)`` pairs, where ``offset`` is the byte position at
+        which the record starts.
+    """
+    settle(filename)
+    with store_lock(filename):
+        try:
+            f = open(filename, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            if offset:
+                f.seek(offset)
+            position = f.tell()
+            utf8 = codecs.getincrementaldecoder("utf-8")()
+            buffer = ""
+            index = 0
+            eof = False
+
+            while True:
+                start = _WHITESPACE.match(buffer, index).end()
+                position += start - index
+                index = start
+
+                if index < len(buffer) and buffer[index] in "[,":
+                    index += 1
+                    position += 1
+                    continue
+                if index < len(buffer) and buffer[index] == "]":
+                    return
+                if index < len(buffer):
+                    try:
+                        record, end = _decoder.raw_decode(buffer, index)
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise
+                    else:
+                        yield position, record
+                        position += len(buffer[index:end].encode("utf-8"))
+                        index = end
+                        continue
+
+                if eof:
+                    return
+                chunk = f.read(CHUNK_SIZE)
+                eof = not chunk
+                buffer = buffer[index:] + utf8.decode(chunk, final=eof)
+                index = 0
+
+
+@dataclass
+class Page:
+    """One page of matching items.
+
+    Attributes:
+        items: TodoItem objects on the page, loaded without details.
+        number: Zero-based page number.
+        start: Zero-based position of the first item among all matches.
+        next_offset: Byte offset of the first match after this page, or its
+            position for an ItemCursor; None if this is the last page.
+    """
+
+    items: list
+    number: int
+    start: int
+    next_offset: Optional[int]
+
+
+def skip_matches(filename, match, count, offset=None):
+    """Return the byte offset of the match ``count`` positions ahead.
+
+    Args:
+        filename: Path of the todos JSON file.
+        match: Predicate over raw record dictionaries.
+        count: Number of matches to skip.
+        offset: Byte offset to start from.
+
+    Returns:
+        Byte offset of the next match after the skipped ones, or None if
+        there are not enough matches.
+    """
+    for record_offset, record in iter_records(filename, offset):
+        if match(record):
+            if count == 0:
+                return record_offset
+            count -= 1
+    return None
+
+
+class TodoCursor:
+    """Page-by-page navigation over the items matching a predicate.
+
+    If the store is rewritten while the cursor is open, the remembered byte
+    offsets no longer apply; the cursor then finds its page again by
+    position.
+    """
+
+    def __init__(self, filename, match, page_size=PAGE_SIZE):
+        self.filename = filename
+        self.match = match
+        self.page_size = page_size
+        self._offsets = [0]
+        self._number = 0
+        self._page = None
+        self._signature = store_signature(filename)
+
+    def page(self):
+        """Return the current page, reading it from the store if needed."""
+        signature = store_signature(self.filename)
+        if signature != self._signature:
+            self._signature = signature
+            self._offsets = [0]
+            self._page = None
+        if self._page is None:
+            self._page = self._read(self._number)
+            while not self._page.items and self._number > 0:
+                self._number -= 1
+                self._page = self._read(self._number)
+        return self._page
+
+    def _offset_of(self, number):
+        while len(self._offsets) <= number:
+            previous = self._offsets[-1]
+            if previous is None:
+                return None
+            self._offsets.append(skip_matches(self.filename, self.match, self.page_size, previous))
+        return self._offsets[number]
+
+    def page_at(self, number):
+        """Read a page by number without moving the cursor.
+
+        Args:
+            number: Zero-based page number.
+
+        Returns:
+            The Page, empty if the number is past the last page.
+        """
+        return self._read(number)
+
+    def _read(self, number):
+        offset = self._offset_of(number)
+        if offset is None:
+            return Page([], number, number * self.page_size, None)
+
+        items = []
+        next_offset = None
+        for record_offset, record in iter_records(self.filename, offset):
+            if not self.match(record):
+                continue
+            if len(items) == self.page_size:
+                next_offset = record_offset
+                break
+            items.append(TodoItem.from_dict(record))
+
+        if next_offset is not None and len(self._offsets) == number + 1:
+            self._offsets.append(next_offset)
+        return Page(items, number, number * self.page_size, next_offset)
+
+    def has_next(self):
+        """Return True if there is a page after the current one."""
+        return self.page().next_offset is not None
+
+    def has_prev(self):
+        """Return True if there is a page before the current one."""
+        return self.page().number > 0
+
+    def next(self):
+        """Move to the next page if there is one."""
+        if self.has_next():
+            self._number += 1
+            self._page = None
+
+    def prev(self):
+        """Move to the previous page if there is one."""
+        if self.has_prev():
+            self._number -= 1
+            self._page = None
+
+    def refresh(self):
+        """Forget the current page so it is read again on next access."""
+        self._page = None
+
+    def item_at(self, position):
+        """Return the item at a one-based position among all matches.
+
+        Items on the current page are returned directly; others are found by
+        streaming the store.
+
+        Args:
+            position: One-based position as shown in the list.
+
+        Returns:
+            The TodoItem, or None if there is no item at that position.
+        """
+        if position < 1:
+            return None
+        page = self.page()
+        if page.start < position <= page.start + len(page.items):
+            return page.items[position - page.start - 1]
+        offset = skip_matches(self.filename, self.match, position - 1)
+        if offset is None:
+            return None
+        _, record = next(iter_records(self.filename, offset))
+        return TodoItem.from_dict(record)
+
+    def select(self, selection):
+        """Return the matching items picked by a selection in one pass.
+
+        Args:
+            selection: Object supporting ``position in selection`` for
+                one-based positions and ``selection.accepts(record)`` for raw
+                records, with a ``last`` attribute giving the highest position
+                it can contain (None for no limit), such as a
+                ``selection.Selection``.
+
+        Returns:
+            The selected TodoItem objects, loaded without details, in list order.
+        """
+        items = []
+        position = 0
+        for _, record in iter_records(self.filename):
+            if not self.match(record):
+                continue
+            position += 1
+            if position in selection and selection.accepts(record):
+                items.append(TodoItem.from_dict(record))
+            if selection.last is not None and position >= selection.last:
+                break
+        return items
+
+
+class ItemCursor:
+    """Page-by-page navigation over items already held in memory.
+
+    Offers the TodoCursor interface for screens that page through the items
+    of a TodoManager, so they never read or wait for the store.
+
+    Args:
+        load: Callable returning the items to page through, in list order.
+        page_size: Number of items per page.
+
+    Attributes:
+        total: Number of items, as of the last read.
+    """
+
+    def __init__(self, load, page_size=PAGE_SIZE):
+        self._load = load
+        self.page_size = page_size
+        self._items = None
+        self._number = 0
+        self.total = 0
+
+    def _all(self):
+        if self._items is None:
+            self._items = self._load()
+            self.total = len(self._items)
+        return self._items
+
+    def page(self):
+        """Return the current page."""
+        items = self._all()
+        self._number = min(self._number, max(0, -(-len(items) // self.page_size) - 1))
+        return self.page_at(self._number)
+
+    def page_at(self, number):
+        """Return a page by number without moving the cursor.
+
+        Args:
+            number: Zero-based page number.
+
+        Returns:
+            The Page, empty if the number is past the last page.
+        """
+        items = self._all()
+        start = number * self.page_size
+        end = start + self.page_size
+        return Page(items[start:end], number, start, end if end < len(items) else None)
+
+    def has_next(self):
+        """Return True if there is a page after the current one."""
+        return self.page().next_offset is not None
+
+    def has_prev(self):
+        """Return True if there is a page before the current one."""
+        return self.page().number > 0
+
+    def next(self):
+        """Move to the next page if there is one."""
+        if self.has_next():
+            self._number += 1
+
+    def prev(self):
+        """Move to the previous page if there is one."""
+        if self.has_prev():
+            self._number -= 1
+
+    def refresh(self):
+        """Forget the items so they are read again on next access."""
+        self._items = None
+
+    def item_at(self, position):
+        """Return the item at a one-based position, or None if there is none."""
+        items = self._all()
+        return items[position - 1] if 1 <= position <= len(items) else None
+
+    def select(self, selection):
+        """Return the items picked by a selection, in list order.
+
+        Args:
+            selection: Selection as accepted by ``TodoCursor.select``.
+        """
+        items = self._all()
+        if selection.last is not None:
+            items = items[:selection.last]
+        return [
+            todo for position, todo in enumerate(items, 1)
+            if position in selection and selection.accepts(todo.to_dict())
+        ]
+
+
+class ManagedCursor:
+    """Page-by-page navigation over a user's items kept by a TodoManager.
+
+    While the manager has unsaved changes, pages come from the items it
+    holds, so a screen shown right after a change does not wait for the
+    autosave. Otherwise they are read from the store with a TodoCursor,
+    which only reads the visible page.
+
+    Args:
+        manager: TodoManager of the store.
+        username: Owner of the items.
+        match: Predicate selecting the raw records of the items.
+        accept: Predicate selecting the same items among TodoItem objects.
+        count: Callable returning the number of items in the store.
+        page_size: Number of items per page.
+    """
+
+    def __init__(self, manager, username, match, accept, count, page_size=PAGE_SIZE):
+        self._manager = manager
+        self._match = match
+        self._count = count
+        self.page_size = page_size
+        self._held = ItemCursor(lambda: [todo for todo in manager.todos(username) if accept(todo)], page_size)
+        self._stored = None
+        self._active = None
+        self._number = 0
+
+    def _cursor(self):
+        if self._manager.pending():
+            cursor = self._held
+        else:
+            if self._stored is None:
+                self._stored = TodoCursor(self._manager.filename, self._match, self.page_size)
+            cursor = self._stored
+        if cursor is not self._active or cursor._number != self._number:
+            # The other cursor may have moved or seen other items meanwhile
+            cursor._number = self._number
+            cursor.refresh()
+            self._active = cursor
+        return cursor
+
+    @property
+    def total(self):
+        """Number of items, from the held items or the store's counters."""
+        cursor = self._cursor()
+        return cursor.total if cursor is self._held else self._count()
+
+    def page(self):
+        """Return the current page."""
+        cursor = self._cursor()
+        page = cursor.page()
+        self._number = cursor._number
+        return page
+
+    def page_at(self, number):
+        """Return a page by number without moving the cursor."""
+        return self._cursor().page_at(number)
+
+    def has_next(self):
+        """Return True if there is a page after the current one."""
+        return self._cursor().has_next()
+
+    def has_prev(self):
+        """Return True if there is a page before the current one."""
+        return self._cursor().has_prev()
+
+    def next(self):
+        """Move to the next page if there is one."""
+        cursor = self._cursor()
+        cursor.next()
+        self._number = cursor._number
+
+    def prev(self):
+        """Move to the previous page if there is one."""
+        cursor = self._cursor()
+        cursor.prev()
+        self._number = cursor._number
+
+    def refresh(self):
+        """Forget the current page so it is read again on next access."""
+        self._cursor().refresh()
+
+    def item_at(self, position):
+        """Return the item at a one-based position, or None if there is none."""
+        return self._cursor().item_at(position)
+
+    def select(self, selection):
+        """Return the items picked by a selection, in list order.
+
+        Args:
+            selection: Selection as accepted by ``TodoCursor.select``.
+        """
+        return self._cursor().select(selection)
@@ -0,0 +1,377 @@
+"""A small filter and update language for to-do items.
+
+Filters compare item fields with values and combine the comparisons with
+``and``, ``or``, ``not`` and parentheses::
+
+    owner = alice and status = pending and created_at < now-90d
+    title ~ "invoice" or (priority = HIGH and updated_at >= 2024-01-01)
+
+Updates are comma-separated assignments::
+
+    priority = LOW, status = completed
+
+Supported fields are ``title``, ``priority``, ``status``, ``owner``,
+``created_at`` and ``updated_at``. ``~`` is a case-insensitive substring
+match on text fields. Timestamps may be ISO-8601 dates or times, ``now``,
+``today``, or ``now`` minus an amount such as ``now-90d``, ``now-12h`` or
+``now-2w``.
+
+``plan`` picks the candidates for a filter from the in-memory indexes when
+the filter pins down an owner, and ``run_update`` evaluates the filter
+against those candidates. The caller saves every change with a single
+``save_todos`` call.
+"""
+
+import re
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+from id_index import IdPrefixIndex
+from models import Priority, Status
+from next_up import NextUpIndex
+from operations import parse_priority
+
+TEXT_FIELDS = ("title", "owner")
+ENUM_FIELDS = ("priority", "status")
+TIME_FIELDS = ("created_at", "updated_at")
+FIELDS = TEXT_FIELDS + ENUM_FIELDS + TIME_FIELDS
+UPDATE_FIELDS = ("title", "priority", "status")
+
+OPERATORS = ("=", "!=", "<", "<=", ">", ">=", "~")
+FIELD_OPERATORS = {
+    "title": ("=", "!=", "~"),
+    "owner": ("=", "!=", "~"),
+    "priority": ("=", "!="),
+    "status": ("=", "!="),
+    "created_at": ("=", "!=", "<", "<=", ">", ">="),
+    "updated_at": ("=", "!=", "<", "<=", ">", ">="),
+}
+
+_TOKEN = re.compile(r"""\s*(?:(?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')|(?P<op>!=|<=|>=|==|[=<>~(),])|(?P<word>[^\s"'=<>~!(),]+))""")
+_RELATIVE = re.compile(r"now-(\d+)([mhdw])$")
+_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+class QueryError(ValueError):
+    """Raised when a filter or update expression is not valid."""
+
+
+def tokenize(text):
+    """Split an expression into ``(kind, value)`` tokens."""
+    tokens = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            raise QueryError(f"Unexpected character at position {position + 1}: {text[position:position + 10]!r}")
+        position = match.end()
+        if match.group("string") is not None:
+            raw = match.group("string")[1:-1]
+            tokens.append(("string", re.sub(r"\\(.)", r"\1", raw)))
+        elif match.group("op") is not None:
+            op = match.group("op")
+            tokens.append(("op", "=" if op == "==" else op))
+        else:
+            tokens.append(("word", match.group("word")))
+    return tokens
+
+
+def resolve_time(value, now=None):
+    """Turn a timestamp literal into an ISO-8601 string.
+
+    Raises:
+        QueryError: If the value is not a timestamp.
+    """
+    now = now or datetime.now()
+    text = value.strip().lower()
+    if text == "now":
+        return now.isoformat()
+    if text == "today":
+        return now.replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
+    relative = _RELATIVE.match(text)
+    if relative:
+        amount, unit = relative.groups()
+        return (now - timedelta(**{_UNITS[unit]: int(amount)})).isoformat()
+    try:
+        return datetime.fromisoformat(value.strip()).isoformat()
+    except ValueError:
+        raise QueryError(f"'{value}' is not a timestamp.") from None
+
+
+def field_value(item, name):
+    """Return a field of a TodoItem or raw record as a string."""
+    if isinstance(item, dict):
+        return item[name]
+    value = getattr(item, name)
+    return value.value if isinstance(value, (Priority, Status)) else value
+
+
+def _normalize(field, value, now):
+    if field == "priority":
+        try:
+            return parse_priority(value).value
+        except ValueError as error:
+            raise QueryError(str(error)) from None
+    if field == "status":
+        try:
+            return Status(value.strip().upper()).value
+        except ValueError:
+            raise QueryError(f"Unknown status '{value}'. Use PENDING or COMPLETED.") from None
+    if field in TIME_FIELDS:
+        return resolve_time(value, now)
+    return value
+
+
+class Comparison:
+    """``field op value`` test on a single item."""
+
+    def __init__(self, field, op, value):
+        self.field = field
+        self.op = op
+        self.value = value
+        self._folded = value.lower()
+
+    def matches(self, item):
+        actual = field_value(item, self.field)
+        op = self.op
+        if op == "=":
+            return actual == self.value
+        if op == "!=":
+            return actual != self.value
+        if op == "~":
+            return self._folded in actual.lower()
+        if op == "<":
+            return actual < self.value
+        if op == "<=":
+            return actual <= self.value
+        if op == ">":
+            return actual > self.value
+        return actual >= self.value
+
+
+class And:
+    """True when every part matches."""
+
+    def __init__(self, parts):
+        self.parts = parts
+
+    def matches(self, item):
+        return all(part.matches(item) for part in self.parts)
+
+
+class Or:
+    """True when any part matches."""
+
+    def __init__(self, parts):
+        self.parts = parts
+
+    def matches(self, item):
+        return any(part.matches(item) for part in self.parts)
+
+
+class Not:
+    """True when the part does not match."""
+
+    def __init__(self, part):
+        self.part = part
+
+    def matches(self, item):
+        return not self.part.matches(item)
+
+
+class _Parser:
+    def __init__(self, text, now):
+        self.tokens = tokenize(text)
+        self.position = 0
+        self.now = now
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def take(self):
+        token = self.peek()
+        if token[0] is None:
+            raise QueryError("Unexpected end of expression.")
+        self.position += 1
+        return token
+
+    def keyword(self, word):
+        kind, value = self.peek()
+        if kind == "word" and value.lower() == word:
+            self.position += 1
+            return True
+        return False
+
+    def done(self):
+        if self.position < len(self.tokens):
+            raise QueryError(f"Unexpected '{self.tokens[self.position][1]}'.")
+
+    def expression(self):
+        parts = [self.term()]
+        while self.keyword("or"):
+            parts.append(self.term())
+        return parts[0] if len(parts) == 1 else Or(parts)
+
+    def term(self):
+        parts = [self.factor()]
+        while self.keyword("and"):
+            parts.append(self.factor())
+        return parts[0] if len(parts) == 1 else And(parts)
+
+    def factor(self):
+        if self.keyword("not"):
+            return Not(self.factor())
+        if self.peek() == ("op", "("):
+            self.take()
+            node = self.expression()
+            if self.take() != ("op", ")"):
+                raise QueryError("Missing ')'.")
+            return node
+        return self.comparison()
+
+    def field(self, allowed):
+        kind, name = self.take()
+        if kind != "word" or name.lower() not in allowed:
+            raise QueryError(f"Unknown field '{name}'. Use one of: {', '.join(allowed)}.")
+        return name.lower()
+
+    def value(self, field):
+        kind, value = self.take()
+        if kind == "op":
+            raise QueryError(f"Expected a value after '{field}', got '{value}'.")
+        return _normalize(field, value, self.now)
+
+    def comparison(self):
+        field = self.field(FIELDS)
+        kind, op = self.take()
+        if kind != "op" or op not in OPERATORS:
+            raise QueryError(f"Expected a comparison after '{field}', got '{op}'.")
+        if op not in FIELD_OPERATORS[field]:
+            raise QueryError(f"'{op}' cannot be used with {field}.")
+        return Comparison(field, op, self.value(field))
+
+    def assignments(self):
+        assignments = {}
+        while True:
+            field = self.field(UPDATE_FIELDS)
+            if self.take() != ("op", "="):
+                raise QueryError(f"Expected '=' after '{field}'.")
+            value = self.value(field)
+            if field == "title" and not value.strip():
+                raise QueryError("Title cannot be empty.")
+            assignments[field] = value
+            if self.peek()[0] is None:
+                return assignments
+            if self.take() != ("op", ","):
+                raise QueryError("Separate assignments with ','.")
+
+
+def parse_filter(text, now=None):
+    """Parse a filter expression into a tree with a ``matches(item)`` method.
+
+    Raises:
+        QueryError: If the expression is not valid.
+    """
+    parser = _Parser(text, now)
+    node = parser.expression()
+    parser.done()
+    return node
+
+
+def parse_update(text, now=None):
+    """Parse update assignments into a ``{field: value}`` dictionary.
+
+    Raises:
+        QueryError: If the assignments are not valid.
+    """
+    return _Parser(text, now).assignments()
+
+
+def equality_terms(node):
+    """Return the ``field = value`` terms that every match must satisfy.
+
+    Terms of nested ``and`` groups count too, e.g. a user's filter wrapped
+    together with an owner term.
+    """
+    if isinstance(node, And):
+        terms = {}
+        for part in node.parts:
+            terms.update(equality_terms(part))
+        return terms
+    if isinstance(node, Comparison) and node.op == "=":
+        return {node.field: node.value}
+    return {}
+
+
+def plan(node, indexes, filename, loader):
+    """Choose how to find the candidates for a filter.
+
+    Args:
+        node: Parsed filter.
+        indexes: IndexCache holding the in-memory indexes.
+        filename: Path of the todos JSON file.
+        loader: Callable loading the items of ``filename`` to build an index.
+
+    Returns:
+        A ``(name, ids)`` pair: the plan name and the candidate item ids in
+        the index's order, or ``("scan", None)`` when every item must be
+        checked.
+    """
+    terms = equality_terms(node)
+    owner = terms.get("owner")
+    if owner is None:
+        return "scan", None
+    if terms.get("status") == Status.PENDING.value:
+        priority = terms.get("priority")
+        index = indexes.get(NextUpIndex, filename, loader)
+        return "next-up index", index.pending_ids(owner, Priority(priority) if priority else None)
+    return "owner index", indexes.get(IdPrefixIndex, filename, loader).ids(owner)
+
+
+def apply_update(todo, assignments, now=None):
+    """Apply assignments to an item in place.
+
+    Returns:
+        The ``(before, todo)`` change, or None if no field changed.
+    """
+    values = {
+        "title": assignments.get("title", todo.title),
+        "priority": Priority(assignments["priority"]) if "priority" in assignments else todo.priority,
+        "status": Status(assignments["status"]) if "status" in assignments else todo.status,
+    }
+    if all(getattr(todo, name) == value for name, value in values.items()):
+        return None
+    before = replace(todo)
+    for name, value in values.items():
+        setattr(todo, name, value)
+    todo.updated_at = (now or datetime.now()).isoformat()
+    return (before, todo)
+
+
+def run_update(todos, node, assignments, candidates=None, dry_run=False):
+    """Apply an update to every matching item of a loaded store.
+
+    Args:
+        todos: Every item in the store.
+        node: Parsed filter.
+        assignments: Parsed update assignments.
+        candidates: Optional ids to check instead of every item, as returned
+            by ``plan``.
+        dry_run: Count matches without changing anything.
+
+    Returns:
+        ``(matched, changes)``: the number of matching items and the list of
+        ``(before, after)`` changes made.
+    """
+    if candidates is None:
+        items = todos
+    else:
+        by_id = {todo.id: todo for todo in todos}
+        items = [by_id[todo_id] for todo_id in candidates if todo_id in by_id]
+    matched = [todo for todo in items if node.matches(todo)]
+    if dry_run:
+        return len(matched), []
+    now = datetime.now()
+    changes = [change for change in (apply_update(todo, assignments, now) for todo in matched) if change]
+    return len(matched), changes
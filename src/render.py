@@ -0,0 +1,128 @@
+"""Buffered rendering of the list screens.
+
+A screen is assembled as a list of lines and written with a single call
+instead of several print() calls per item. Formatted item text is memoized
+by item id and ``updated_at``, so paging back and forth over a list only
+formats items that changed since they were last shown.
+"""
+
+from collections import OrderedDict
+
+from id_index import short_id
+from models import Status
+
+ITEM_CACHE_SIZE = 4096
+
+
+def status_symbol(todo):
+    """Return the list symbol for an item's status."""
+    return "✓" if todo.status == Status.COMPLETED else "○"
+
+
+def _format_full(todo):
+    details = f"    Details: {todo.details}\n" if todo.details else ""
+    return (
+        f"{status_symbol(todo)} {todo.title}\n"
+        f"    ID: #{short_id(todo)}\n"
+        f"    Priority: {todo.priority.value}\n"
+        f"    Status: {todo.status.value}\n"
+        f"{details}"
+        f"    Created: {todo.created_at}\n"
+        f"    Updated: {todo.updated_at}"
+    )
+
+
+def _format_urgency(todo):
+    return (
+        f"{status_symbol(todo)} {todo.title}\n"
+        f"    Priority: {todo.priority.value}\n"
+        f"    Created: {todo.created_at}"
+    )
+
+
+def _format_symbol(todo):
+    return f"{status_symbol(todo)} {todo.title}"
+
+
+def _format_status(todo):
+    return f"{todo.title} (Priority: {todo.priority.value}, Status: {todo.status.value})"
+
+
+def _format_priority(todo):
+    return f"{todo.title} (Priority: {todo.priority.value})"
+
+
+ITEM_FORMATS = {
+    "full": _format_full,
+    "urgency": _format_urgency,
+    "symbol": _format_symbol,
+    "status": _format_status,
+    "priority": _format_priority,
+}
+
+
+class ItemTextCache:
+    """Least-recently-used cache of formatted item text."""
+
+    def __init__(self, maxsize=ITEM_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def format(self, todo, style):
+        """Return the formatted text of an item in a given style.
+
+        Args:
+            todo: The TodoItem to format.
+            style: Key of ``ITEM_FORMATS``.
+
+        Returns:
+            The formatted text, without the leading item number.
+        """
+        key = (style, todo.id, todo.updated_at)
+        text = self._entries.get(key)
+        if text is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return text
+
+        self.misses += 1
+        text = ITEM_FORMATS[style](todo)
+        self._entries[key] = text
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return text
+
+    def clear(self):
+        """Drop all cached text and reset the statistics."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+ITEM_TEXT = ItemTextCache()
+
+
+def render_items(items, start=0, style="full", cache=ITEM_TEXT):
+    """Format numbered list entries for a page of items.
+
+    Args:
+        items: TodoItem objects to list.
+        start: Zero-based position of the first item, used for numbering.
+        style: Key of ``ITEM_FORMATS``.
+        cache: ItemTextCache used to memoize formatted text.
+
+    Returns:
+        List of entries such as ``"[3] ○ Buy milk"``.
+    """
+    return [f"[{number}] {cache.format(todo, style)}" for number, todo in enumerate(items, start + 1)]
+
+
+def write_screen(lines):
+    """Write a whole screen with a single output call.
+
+    Args:
+        lines: Lines of the screen, without trailing newlines.
+    """
+    print("\n".join(lines))
@@ -0,0 +1,300 @@
+"""Full-text search over item titles and details.
+
+An inverted index maps each word to the sorted ids of the items containing
+it, separately for every owner. It is persisted in ``todos.search.json``,
+tagged with the store signature like the counters, and kept current from
+the changes passed to ``save_todos``. A save appends only the entries of the
+changed items to ``todos.search.log``; the snapshot is rewritten once the
+log grows past half its size. A query only reads the posting lists of its
+terms, so its cost does not depend on how much text the items hold.
+
+Queries are words separated by spaces, all of which must match; ``OR``
+separates alternatives, and a trailing ``*`` matches any word starting with
+the term::
+
+    invoice march
+    report* OR slides
+"""
+
+import json
+import os
+import re
+from bisect import bisect_left, insort
+
+from sidecars import replace_json, sidecar_path, store_signature
+
+_WORD = re.compile(r"\w+")
+COMPACT_RATIO = 0.5
+
+
+def search_index_path(todos_filename):
+    """Return the search index file used alongside a todos file."""
+    return sidecar_path(todos_filename, ".search.json")
+
+
+def search_log_path(todos_filename):
+    """Return the log of search index changes used alongside a todos file."""
+    return sidecar_path(todos_filename, ".search.log")
+
+
+def tokenize(text):
+    """Return the distinct lower-case words of a text, sorted."""
+    return sorted(set(_WORD.findall(text.lower()))) if text else []
+
+
+class SearchIndex:
+    """Per-owner inverted index over titles and details.
+
+    Besides the posting lists, the index remembers the words of each item,
+    so a change can be applied even if the old item's details were never
+    loaded.
+    """
+
+    def __init__(self, owners=None, docs=None):
+        self.owners = owners or {}
+        self.docs = docs or {}
+        self._vocabulary = {}
+
+    def rebuild(self, todos):
+        """Index every item from scratch; items must have their details loaded."""
+        self.owners = {}
+        self.docs = {}
+        self._vocabulary = {}
+        for todo in todos:
+            self.apply(None, todo)
+
+    def _add(self, owner, todo_id, words):
+        postings = self.owners.setdefault(owner, {})
+        vocabulary = self._vocabulary.get(owner)
+        for word in words:
+            ids = postings.get(word)
+            if ids is None:
+                postings[word] = [todo_id]
+                if vocabulary is not None:
+                    insort(vocabulary, word)
+            else:
+                insort(ids, todo_id)
+
+    def _remove(self, owner, todo_id, words):
+        postings = self.owners.get(owner, {})
+        for word in words:
+            ids = postings.get(word)
+            if not ids:
+                continue
+            position = bisect_left(ids, todo_id)
+            if position < len(ids) and ids[position] == todo_id:
+                del ids[position]
+            if not ids:
+                del postings[word]
+                vocabulary = self._vocabulary.get(owner)
+                if vocabulary is not None:
+                    del vocabulary[bisect_left(vocabulary, word)]
+
+    def apply(self, before, after):
+        """Update the index for a single item change.
+
+        Args:
+            before: The item before the change, or None if it was created.
+            after: The item after the change, or None if it was removed.
+        """
+        if after is None:
+            if before is not None:
+                self.set_doc(before.id, None)
+            return
+        old = self.docs.get(before.id) if before is not None else None
+        self.set_doc(after.id, {
+            "owner": after.owner,
+            "title": tokenize(after.title),
+            "details": (
+                tokenize(after.details) if after.details is not None
+                else (old["details"] if old is not None else [])
+            ),
+        })
+
+    def set_doc(self, todo_id, doc):
+        """Replace the indexed words of one item.
+
+        Args:
+            todo_id: Id of the item.
+            doc: ``{"owner", "title", "details"}`` with the words of the
+                title and details, as in ``docs``; None removes the item.
+        """
+        old = self.docs.get(todo_id)
+        old_words = set(old["title"]) | set(old["details"]) if old is not None else set()
+        if doc is None:
+            if old is not None:
+                self._remove(old["owner"], todo_id, old_words)
+                del self.docs[todo_id]
+            return
+        new_words = set(doc["title"]) | set(doc["details"])
+        if old is not None and old["owner"] != doc["owner"]:
+            self._remove(old["owner"], todo_id, old_words)
+            old_words = set()
+        self._remove(doc["owner"], todo_id, old_words - new_words)
+        self._add(doc["owner"], todo_id, new_words - old_words)
+        self.docs[todo_id] = doc
+
+    def _words_with_prefix(self, owner, prefix):
+        vocabulary = self._vocabulary.get(owner)
+        if vocabulary is None:
+            vocabulary = self._vocabulary[owner] = sorted(self.owners.get(owner, {}))
+        words = []
+        position = bisect_left(vocabulary, prefix)
+        while position < len(vocabulary) and vocabulary[position].startswith(prefix):
+            words.append(vocabulary[position])
+            position += 1
+        return words
+
+    def search(self, owner, query):
+        """Return the ids of an owner's items matching a query.
+
+        Args:
+            owner: Username whose items to search.
+            query: Words to match; see the module documentation.
+
+        Returns:
+            Set of matching item ids.
+        """
+        postings = self.owners.get(owner, {})
+        results = set()
+        for group in re.split(r"\s+OR\s+", query.strip(), flags=re.IGNORECASE):
+            lists = []
+            for term in group.split():
+                words = _WORD.findall(term.lower())
+                if not words:
+                    continue
+                prefix = words.pop() if term.endswith("*") else None
+                lists.extend(postings.get(word, []) for word in words)
+                if prefix is not None:
+                    matched = set()
+                    for word in self._words_with_prefix(owner, prefix):
+                        matched.update(postings[word])
+                    lists.append(matched)
+            if not lists:
+                continue
+            lists.sort(key=len)
+            matched = set(lists[0])
+            for ids in lists[1:]:
+                if not matched:
+                    break
+                matched.intersection_update(ids)
+            results |= matched
+        return results
+
+    def to_json(self):
+        """Return the JSON-ready form of the index."""
+        return {"owners": self.owners, "docs": self.docs}
+
+
+_LOADED = {}
+
+
+def _read_index(todos_filename):
+    """Read the persisted snapshot and replay the logged changes on it.
+
+    Returns:
+        ``(signature, index)`` with the store signature the index reflects,
+        or None if there is no snapshot or the log cannot be replayed.
+    """
+    try:
+        with open(search_index_path(todos_filename), 'r') as f:
+            data = json.load(f)
+        index = SearchIndex(data["owners"], data["docs"])
+        signature = data.get("store")
+        try:
+            log = open(search_log_path(todos_filename), 'r')
+        except FileNotFoundError:
+            return signature, index
+        with log:
+            for line in log:
+                entry = json.loads(line)
+                if entry["since"] != signature:
+                    return None
+                for todo_id, doc in entry["docs"].items():
+                    index.set_doc(todo_id, doc)
+                signature = entry["store"]
+    except FileNotFoundError:
+        return None
+    except (ValueError, KeyError):
+        return None
+    return signature, index
+
+
+def load_search_index(todos_filename):
+    """Load the persisted search index if it matches the current store.
+
+    Returns:
+        The SearchIndex, or None if it is missing or stale.
+    """
+    signature = store_signature(todos_filename)
+    key = os.path.abspath(todos_filename)
+    cached = _LOADED.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    persisted = _read_index(todos_filename) if signature is not None else None
+    if persisted is None or persisted[0] != signature:
+        return None
+    _LOADED[key] = persisted
+    return persisted[1]
+
+
+def write_search_index(todos_filename, index):
+    """Persist a snapshot of a search index for the current store contents."""
+    signature = store_signature(todos_filename)
+    data = index.to_json()
+    data["store"] = signature
+    replace_json(search_index_path(todos_filename), data)
+    try:
+        os.remove(search_log_path(todos_filename))
+    except FileNotFoundError:
+        pass
+    _LOADED[os.path.abspath(todos_filename)] = (signature, index)
+
+
+def update_search_index(todos_filename, changes, previous_signature):
+    """Carry the persisted search index across a save of the store.
+
+    Call after the todos file has been written. If the index was current for
+    ``previous_signature`` the changes are applied and the new entries of the
+    changed items are appended to the log; otherwise the index is removed
+    and rebuilt on the next search, so saves never pay for reading every
+    item's details.
+
+    Args:
+        todos_filename: Path of the todos JSON file.
+        changes: List of ``(before, after)`` item pairs, or None.
+        previous_signature: Store signature before the save.
+    """
+    key = os.path.abspath(todos_filename)
+    index = None
+    if changes is not None:
+        cached = _LOADED.get(key)
+        if cached is not None and cached[0] == previous_signature:
+            index = cached[1]
+        else:
+            persisted = _read_index(todos_filename)
+            if persisted is not None and persisted[0] == previous_signature:
+                index = persisted[1]
+    if index is None:
+        _LOADED.pop(key, None)
+        for path in (search_index_path(todos_filename), search_log_path(todos_filename)):
+            if os.path.exists(path):
+                os.remove(path)
+        return
+
+    for before, after in changes:
+        index.apply(before, after)
+    log_path = search_log_path(todos_filename)
+    if (os.path.exists(log_path)
+            and os.path.getsize(log_path) > os.path.getsize(search_index_path(todos_filename)) * COMPACT_RATIO):
+        write_search_index(todos_filename, index)
+        return
+    ids = {(after or before).id for before, after in changes}
+    signature = store_signature(todos_filename)
+    with open(log_path, 'a') as f:
+        f.write(json.dumps({
+            "since": previous_signature,
+            "store": signature,
+            "docs": {todo_id: index.docs.get(todo_id) for todo_id in ids},
+        }) + "\n")
+    _LOADED[key] = (signature, index)
@@ -0,0 +1,91 @@
+"""Parsing of multi-item selections typed at a list prompt.
+
+A selection is either a comma-separated list of item numbers and ranges,
+such as ``1-50,73,80-90``, or ``all`` optionally followed by a priority,
+such as ``all HIGH``.
+"""
+
+from bisect import bisect_right
+
+from operations import parse_priority
+
+
+class Selection:
+    """A set of one-based list positions, optionally limited to a priority.
+
+    Args:
+        ranges: Sorted, non-overlapping inclusive ``(first, last)`` ranges,
+            or None to select every position.
+        priority: Optional Priority the selected items must have.
+    """
+
+    def __init__(self, ranges=None, priority=None):
+        self.ranges = ranges
+        self.priority = priority
+        self._starts = [first for first, _ in ranges] if ranges is not None else None
+
+    @property
+    def last(self):
+        """Highest position the selection can contain, or None for no limit."""
+        return self.ranges[-1][1] if self.ranges else None
+
+    def __contains__(self, position):
+        if self.ranges is None:
+            return True
+        index = bisect_right(self._starts, position) - 1
+        return index >= 0 and position <= self.ranges[index][1]
+
+    def accepts(self, record):
+        """Return True if a raw record passes the selection's priority filter."""
+        return self.priority is None or record["priority"] == self.priority.value
+
+
+def is_multi_selection(text):
+    """Return True if prompt input is a list, range or ``all`` selection.
+
+    ``#id`` and ``/title`` input is never a selection, even when it holds a
+    dash or a comma.
+    """
+    text = text.strip().lower()
+    if text.startswith(("#", "/")):
+        return False
+    return "," in text or "-" in text or text.split(" ")[0] == "all"
+
+
+def parse_selection(text):
+    """Parse a multi-item selection.
+
+    Args:
+        text: Input such as ``"1-50,73,80-90"``, ``"all"`` or ``"all high"``.
+
+    Returns:
+        The Selection.
+
+    Raises:
+        ValueError: If the input is not a valid selection.
+    """
+    words = text.strip().split()
+    if words and words[0].lower() == "all":
+        if len(words) > 2:
+            raise ValueError("Use 'all' or 'all' followed by a priority.")
+        return Selection(priority=parse_priority(words[1]) if len(words) == 2 else None)
+
+    ranges = []
+    for part in "".join(words).split(","):
+        first, dash, last = part.partition("-")
+        try:
+            first = int(first)
+            last = int(last) if dash else first
+        except ValueError:
+            raise ValueError(f"'{part}' is not an item number or range.") from None
+        if first < 1 or last < first:
+            raise ValueError(f"'{part}' is not a valid range.")
+        ranges.append((first, last))
+
+    merged = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return Selection(merged)
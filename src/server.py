@@ -0,0 +1,319 @@
+"""Long-running to-do server on a local Unix domain socket.
+
+The server loads the users and the todo store once and keeps them in
+memory, so a request costs a dictionary lookup and, for changes, a write of
+the store instead of an interpreter start and a full parse of both files.
+Items saved by other sessions are refreshed from the store's change log on
+the next request; a file changed in a way the log cannot tell is loaded
+again.
+
+Clients send one JSON object per line and get one JSON object per line
+back, in order, so several requests may be written before reading the
+replies. A connection must log in before it can use the other operations::
+
+    {"op": "login", "user": "alice", "password": "secret"}
+    {"op": "list", "status": "pending"}
+    {"op": "show", "id": "1a2b"}
+    {"op": "create", "title": "Buy milk", "details": "", "priority": "high"}
+    {"op": "edit", "id": "1a2b", "title": "Buy oat milk"}
+    {"op": "complete", "id": "1a2b"}
+
+Successful replies are ``{"result": ...}``; failures are
+``{"error": "message"}``.
+
+Usage:
+    python src/server.py [--socket todo.sock]
+"""
+
+import argparse
+import inspect
+import json
+import os
+import socketserver
+import sys
+import threading
+from dataclasses import replace
+
+from changelog import ChangeFeed
+from id_index import IdPrefixIndex
+from locking import store_lock
+from main import (
+    append_todos,
+    authenticate,
+    load_todo_details,
+    load_todos,
+    load_users,
+    log_login_attempt,
+    save_todos,
+)
+from models import Priority, Status
+from operations import create_todo, edit_todo, complete_todo, parse_priority, text_value, todo_json
+from sidecars import store_signature
+
+SOCKET_PATH = "todo.sock"
+
+
+class RequestError(Exception):
+    """Raised when a request cannot be carried out."""
+
+
+class NotFoundError(RequestError):
+    """Raised when a request names an item the user does not have."""
+
+
+class TodoService:
+    """In-memory users and items answering protocol requests.
+
+    Requests are handled one at a time.
+
+    Args:
+        todos_filename: Path of the todos JSON file.
+        users_filename: Path of the users JSON file.
+    """
+
+    def __init__(self, todos_filename="todos.json", users_filename="users.json"):
+        self.todos_filename = todos_filename
+        self.users_filename = users_filename
+        self._lock = threading.Lock()
+        self._todos = None
+        self._by_id = {}
+        self._positions = {}
+        self._ids = IdPrefixIndex()
+        self._feed = None
+        self._users = None
+        self._users_signature = None
+
+    def _store(self):
+        if self._todos is not None and not self._feed.changed():
+            return self._todos
+        with store_lock(self.todos_filename):
+            changes = self._feed.poll() if self._todos is not None else None
+            if changes is None:
+                self._todos = load_todos(self.todos_filename, with_details=False)
+                self._feed = ChangeFeed(self.todos_filename)
+                self._ids.rebuild(self._todos)
+                self._by_id = {todo.id: todo for todo in self._todos}
+                self._positions = {todo.id: position for position, todo in enumerate(self._todos)}
+                return self._todos
+        for before, after in changes:
+            self._ids.apply(before, after)
+            position = self._positions.get(after.id)
+            if position is None:
+                self._positions[after.id] = len(self._todos)
+                self._todos.append(after)
+            else:
+                self._todos[position] = after
+            self._by_id[after.id] = after
+        return self._todos
+
+    def _commit(self, changes):
+        """Apply changes made to the loaded items and write them to the store."""
+        self._apply(changes)
+        self._write(changes)
+
+    def _apply(self, changes):
+        for before, after in changes:
+            self._ids.apply(before, after)
+            if before is None:
+                self._by_id[after.id] = after
+                self._positions[after.id] = len(self._todos) - 1
+
+    def _write(self, changes, todos=None):
+        with store_lock(self.todos_filename, exclusive=True):
+            # If another program saved in between, its changes are kept in
+            # the file but not in memory; the old feed reads them next time
+            outside = self._feed.changed()
+            if all(before is None for before, _ in changes):
+                append_todos([after for _, after in changes], self.todos_filename)
+            else:
+                save_todos(self._todos if todos is None else todos, self.todos_filename, changes=changes)
+            if not outside:
+                self._feed = ChangeFeed(self.todos_filename)
+
+    def _find(self, username, id_prefix):
+        prefix = str(id_prefix or "").lstrip("#").lower()
+        if not prefix:
+            raise RequestError("An item id is required.")
+        self._store()
+        matches = self._ids.find(username, prefix)
+        if not matches:
+            raise NotFoundError(f"No to-do item matches '{id_prefix}'.")
+        if len(matches) > 1:
+            raise RequestError(f"'{id_prefix}' matches several items; use more of the id.")
+        return self._by_id[matches[0].id]
+
+    def login(self, username, password, log_success=True):
+        """Check credentials against the users file, reloading it if it changed.
+
+        Failed attempts are always recorded in the login history.
+
+        Args:
+            username: Username to check.
+            password: Password given for it.
+            log_success: Record successful attempts too.
+        """
+        signature = store_signature(self.users_filename)
+        if self._users is None or signature != self._users_signature:
+            self._users = load_users(self.users_filename)
+            self._users_signature = signature
+        success = authenticate(self._users, username, str(password))
+        if log_success or not success:
+            log_login_attempt(username, success)
+        return success
+
+    def list(self, username, status=None, priority=None):
+        """Return a user's items without details."""
+        status = text_value(status, "status")
+        priority = text_value(priority, "priority")
+        status = Status(status.upper()) if status else None
+        priority = parse_priority(priority) if priority else None
+        return [
+            todo_json(todo) for todo in self._store()
+            if todo.owner == username
+            and (status is None or todo.status == status)
+            and (priority is None or todo.priority == priority)
+        ]
+
+    def create(self, username, title=None, details=None, priority=None):
+        """Create an item and append it to the store."""
+        title, details = text_value(title, "title"), text_value(details, "details")
+        priority = text_value(priority, "priority")
+        change = create_todo(self._store(), username, title or "", details or "",
+                             parse_priority(priority) if priority else Priority.MID)
+        self._commit([change])
+        return todo_json(change[1], with_details=True)
+
+    def show(self, username, id):
+        """Return one item including its details."""
+        todo = replace(self._find(username, id))
+        load_todo_details(todo, self.todos_filename)
+        return todo_json(todo, with_details=True)
+
+    def edit(self, username, id, title=None, details=None, priority=None):
+        """Change the title, details or priority of an item."""
+        title, details = text_value(title, "title"), text_value(details, "details")
+        priority = text_value(priority, "priority")
+        if title is None and details is None and priority is None:
+            raise RequestError("Nothing to change; give title, details or priority.")
+        todo = self._find(username, id)
+        change = edit_todo(todo, title=title, details=details,
+                           priority=parse_priority(priority) if priority else None)
+        self._commit([change])
+        return todo_json(todo)
+
+    def complete(self, username, id):
+        """Mark an item as completed."""
+        todo = self._find(username, id)
+        change = complete_todo(todo)
+        if change is not None:
+            self._commit([change])
+        return dict(todo_json(todo), changed=change is not None)
+
+    def handle(self, session, request):
+        """Carry out one request.
+
+        Args:
+            session: Dictionary holding the state of the connection; a
+                successful login stores the username under ``"user"``.
+            request: The decoded request object.
+
+        Returns:
+            The reply object.
+        """
+        if not isinstance(request, dict):
+            return {"error": "A request must be a JSON object."}
+        params = dict(request)
+        op = params.pop("op", None)
+        with self._lock:
+            try:
+                if op == "login":
+                    username = params.get("user")
+                    if not username or not self.login(username, params.get("password", "")):
+                        session["user"] = None
+                        raise RequestError("Invalid username or password.")
+                    session["user"] = username
+                    return {"result": {"user": username}}
+                handler = OPERATIONS.get(op)
+                if handler is None:
+                    raise RequestError(f"Unknown operation '{op}'.")
+                if session.get("user") is None:
+                    raise RequestError("Log in first.")
+                check_params(op, params)
+                return {"result": handler(self, session["user"], **params)}
+            except (RequestError, ValueError) as error:
+                return {"error": str(error)}
+
+
+OPERATIONS = {
+    "list": TodoService.list,
+    "show": TodoService.show,
+    "create": TodoService.create,
+    "edit": TodoService.edit,
+    "complete": TodoService.complete,
+}
+
+
+def check_params(op, params):
+    """Check request parameters against the signature of an operation.
+
+    Raises:
+        RequestError: If a parameter is unknown or a required one is missing.
+    """
+    try:
+        inspect.signature(OPERATIONS[op]).bind(None, None, **params)
+    except TypeError:
+        raise RequestError(f"Invalid parameters for '{op}'.") from None
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        session = {"user": None}
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError:
+                reply = {"error": "A request must be a JSON object."}
+            else:
+                reply = self.server.service.handle(session, request)
+            self.wfile.write(json.dumps(reply, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+class TodoServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serves a TodoService on a Unix domain socket, one thread per connection.
+
+    Args:
+        path: Path of the socket; a stale socket file is replaced.
+        service: TodoService answering the requests.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path, service):
+        if os.path.exists(path):
+            os.remove(path)
+        self.service = service
+        super().__init__(path, _Handler)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+def main(argv=None):
+    """Serve requests until interrupted."""
+    parser = argparse.ArgumentParser(description="Serve the to-do list on a Unix domain socket.")
+    parser.add_argument("--socket", default=SOCKET_PATH, help=f"socket path (default: {SOCKET_PATH})")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    with TodoServer(args.socket, TodoService()) as server:
+        print(f"Serving on {args.socket}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
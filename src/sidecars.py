@@ -0,0 +1,92 @@
+"""Helpers for files kept alongside the todo store.
+
+Derived data such as counters and indexes is persisted next to
+``todos.json`` and tagged with the store signature it was built from, so a
+stale file can be detected after the store is changed by someone else.
+
+Writes to the store may also be queued and run in the background. Code that
+queues them registers a barrier for the store, and everything that reads
+the store from disk calls ``settle`` first, so a read always sees the
+changes made before it.
+"""
+
+import json
+import os
+import tempfile
+
+_BARRIERS = {}
+
+
+def sidecar_path(todos_filename, suffix):
+    """Return the path of a file stored next to a todos file.
+
+    Args:
+        todos_filename: Path of the todos JSON file.
+        suffix: Suffix replacing the ``.json`` extension, e.g. ``".details"``.
+
+    Returns:
+        Path of the sidecar file.
+    """
+    root, _ = os.path.splitext(todos_filename)
+    return root + suffix
+
+
+def replace_json(path, data, indent=None):
+    """Write a JSON sidecar through a temporary file and move it into place.
+
+    Readers never see a partly written file, and sessions rebuilding the
+    same file at once each write their own temporary file.
+
+    Args:
+        path: Path of the sidecar file.
+        data: JSON-serializable contents.
+        indent: Indentation passed to ``json.dump``.
+    """
+    fd, temporary = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=indent)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def register_barrier(todos_filename, wait):
+    """Register a callable that waits for the queued writes of a store.
+
+    Args:
+        todos_filename: Path of the todos JSON file.
+        wait: Callable taking no arguments; it must return at once when
+            called from the thread doing the writes.
+    """
+    _BARRIERS[os.path.abspath(todos_filename)] = wait
+
+
+def settle(todos_filename):
+    """Wait until the queued writes of a store, if any, are on disk."""
+    if _BARRIERS:
+        wait = _BARRIERS.get(os.path.abspath(todos_filename))
+        if wait is not None:
+            wait()
+
+
+def store_signature(filename, wait=True):
+    """Return a cheap signature identifying the current store contents.
+
+    Args:
+        filename: Path of the todos JSON file.
+        wait: Settle queued writes first; pass False from code that holds
+            items the queued writes need.
+
+    Returns:
+        ``[mtime_ns, size]`` of the file, or None if it does not exist.
+    """
+    if wait:
+        settle(filename)
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
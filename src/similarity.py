@@ -0,0 +1,216 @@
+"""TF-IDF similarity between a user's items.
+
+Each owner's items are kept as a sparse term-count matrix in coordinate
+form: parallel NumPy arrays of row, column and count, plus the document
+frequency of every term. A change appends the new counts and blanks out
+the old ones instead of rebuilding the matrix, and the arrays are compacted
+only once most of their entries are dead. Scoring a text against every item
+is a handful of vectorized operations over the non-zero entries, using
+smoothed IDF weights and cosine similarity.
+
+NumPy is optional; without it ``similarity_available()`` is False and the
+duplicate warnings and related-item lists are simply not offered.
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import replace
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is an optional dependency
+    np = None
+
+from indexes import TodoIndex
+
+DUPLICATE_THRESHOLD = 0.8
+RELATED_THRESHOLD = 0.1
+RELATED_LIMIT = 5
+
+_WORD = re.compile(r"\w+")
+
+
+def similarity_available():
+    """Return True if NumPy is installed."""
+    return np is not None
+
+
+def term_counts(text):
+    """Return a Counter of the lower-case words of a text."""
+    return Counter(_WORD.findall(text.lower())) if text else Counter()
+
+
+class _OwnerMatrix:
+    """Sparse term counts of one owner's items."""
+
+    def __init__(self):
+        self.vocabulary = {}
+        self.df = np.zeros(16, dtype=np.float64)
+        self.rows = np.zeros(64, dtype=np.int64)
+        self.cols = np.zeros(64, dtype=np.int64)
+        self.counts = np.zeros(64, dtype=np.float64)
+        self.size = 0
+        self.dead = 0
+        self.ids = []
+        self.spans = {}
+
+    def _column(self, term):
+        column = self.vocabulary.get(term)
+        if column is None:
+            column = self.vocabulary[term] = len(self.vocabulary)
+            if column >= len(self.df):
+                self.df = np.concatenate([self.df, np.zeros(len(self.df), dtype=np.float64)])
+        return column
+
+    def _reserve(self, extra):
+        needed = self.size + extra
+        if needed > len(self.rows):
+            capacity = max(needed, 2 * len(self.rows))
+            for name in ("rows", "cols", "counts"):
+                grown = np.zeros(capacity, dtype=getattr(self, name).dtype)
+                grown[:self.size] = getattr(self, name)[:self.size]
+                setattr(self, name, grown)
+
+    def add(self, todo_id, counts):
+        row = len(self.ids)
+        self.ids.append(todo_id)
+        columns = [self._column(term) for term in counts]
+        start = self.size
+        self._reserve(len(columns))
+        end = start + len(columns)
+        self.rows[start:end] = row
+        self.cols[start:end] = columns
+        self.counts[start:end] = list(counts.values())
+        self.df[columns] += 1
+        self.size = end
+        self.spans[todo_id] = (row, start, end)
+
+    def remove(self, todo_id):
+        row, start, end = self.spans.pop(todo_id)
+        self.df[self.cols[start:end]] -= 1
+        self.counts[start:end] = 0
+        self.ids[row] = None
+        self.dead += end - start
+        if self.dead > self.size // 2:
+            self._compact()
+
+    def _compact(self):
+        size = 0
+        ids = []
+        spans = {}
+        for todo_id, (row, start, end) in sorted(self.spans.items(), key=lambda item: item[1][1]):
+            length = end - start
+            self.rows[size:size + length] = len(ids)
+            self.cols[size:size + length] = self.cols[start:end]
+            self.counts[size:size + length] = self.counts[start:end]
+            spans[todo_id] = (len(ids), size, size + length)
+            ids.append(todo_id)
+            size += length
+        self.ids = ids
+        self.spans = spans
+        self.size = size
+        self.dead = 0
+
+    def scores(self, counts):
+        """Return the cosine similarity of a text's counts with every row."""
+        documents = len(self.spans)
+        if not documents or not counts:
+            return np.zeros(len(self.ids))
+        vocabulary = len(self.vocabulary)
+        idf = np.log((1 + documents) / (1 + self.df[:vocabulary])) + 1
+
+        # Words no item contains still count towards the text's norm, with
+        # the weight of a document frequency of zero
+        unseen_idf = math.log(1 + documents) + 1
+        query = np.zeros(vocabulary)
+        query_norm = 0.0
+        for term, count in counts.items():
+            column = self.vocabulary.get(term)
+            if column is None:
+                query_norm += (count * unseen_idf) ** 2
+            else:
+                query[column] = count * idf[column]
+                query_norm += query[column] ** 2
+        query_norm = math.sqrt(query_norm)
+
+        rows = self.rows[:self.size]
+        cols = self.cols[:self.size]
+        weights = self.counts[:self.size] * idf[cols]
+        norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=len(self.ids)))
+        dots = np.bincount(rows, weights=weights * query[cols], minlength=len(self.ids))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result = np.where(norms > 0, dots / (norms * query_norm), 0.0)
+        return result
+
+
+class SimilarityIndex(TodoIndex):
+    """Per-owner TF-IDF vectors over titles and details.
+
+    Build it with items that have their details loaded. Changes whose item
+    was loaded without details keep the details words indexed before.
+    """
+
+    def __init__(self):
+        self._owners = {}
+        self._docs = {}
+
+    def rebuild(self, todos):
+        self._owners = {}
+        self._docs = {}
+        for todo in todos:
+            self.apply(None, todo)
+
+    def apply(self, before, after):
+        old = self._docs.get(before.id) if before is not None else None
+        if old is not None:
+            self._owners[old[0]].remove(before.id)
+            del self._docs[before.id]
+        if after is None:
+            return
+        title = term_counts(after.title)
+        details = term_counts(after.details) if after.details is not None else (old[2] if old else Counter())
+        self._owners.setdefault(after.owner, _OwnerMatrix()).add(after.id, title + details)
+        self._docs[after.id] = (after.owner, title, details, replace(after, details=None))
+
+    def similar(self, owner, text, limit=RELATED_LIMIT, threshold=RELATED_THRESHOLD, exclude=None):
+        """Return the owner's items most similar to a text.
+
+        Args:
+            owner: Username whose items to compare against.
+            text: Title and details to compare.
+            limit: Maximum number of items.
+            threshold: Minimum cosine similarity.
+            exclude: Optional item id to leave out.
+
+        Returns:
+            List of ``(todo, score)`` pairs, most similar first, where each
+            todo is a copy of the TodoItem without its details.
+        """
+        return self._top(owner, term_counts(text), limit, threshold, exclude)
+
+    def related(self, todo_id, limit=RELATED_LIMIT, threshold=RELATED_THRESHOLD):
+        """Return the items of the same owner most similar to an item.
+
+        Returns:
+            List of ``(todo, score)`` pairs as for ``similar``; empty if the
+            item is not indexed.
+        """
+        doc = self._docs.get(todo_id)
+        if doc is None:
+            return []
+        owner, title, details, _ = doc
+        return self._top(owner, title + details, limit, threshold, todo_id)
+
+    def _top(self, owner, counts, limit, threshold, exclude):
+        matrix = self._owners.get(owner)
+        if matrix is None:
+            return []
+        scores = matrix.scores(counts)
+        if exclude is not None and exclude in matrix.spans:
+            scores[matrix.spans[exclude][0]] = 0.0
+        candidates = np.flatnonzero((scores >= threshold) & (scores > 0))
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        ordered = sorted(candidates, key=lambda row: -scores[row])
+        return [(replace(self._docs[matrix.ids[row]][3]), float(scores[row])) for row in ordered]
@@ -0,0 +1,366 @@
+"""In-memory owner of the todo store for the interactive application.
+
+A ``TodoManager`` loads the store once and keeps the items in memory, so the
+screens that change items do not parse the whole file every time. The items
+are protected by a readers-writer lock: any number of threads may read at
+once, and a change waits only for the reads in progress. Changes are applied
+in memory and queued; a background thread writes them to disk, merging
+everything queued while it was busy into one save. By default a change
+returns once it is written; with ``write_behind`` set it returns at once,
+and with a ``debounce`` delay the thread also waits that long after the
+first unwritten change, so a burst of edits is saved in one write.
+The manager registers a barrier for its store, so code that reads the file
+directly waits for the queued writes first. Changes saved by other sessions
+are read from the store's change log, so only the changed items are
+replaced; the whole store is loaded again only when the log cannot tell
+what changed.
+"""
+
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import replace
+
+from changelog import ChangeFeed
+from locking import holds_lock, store_lock
+from models import Priority
+from operations import ConflictError, coalesce_changes, create_todo
+from sidecars import register_barrier
+
+
+class RWLock:
+    """Readers-writer lock that lets waiting writers go first.
+
+    Readers share the lock; a writer holds it alone. Once a writer is
+    waiting, new readers wait too, so a stream of reads cannot starve it.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def reading(self):
+        """Hold the lock shared for the duration of a ``with`` block."""
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def writing(self):
+        """Hold the lock exclusively for the duration of a ``with`` block."""
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer = False
+                self._condition.notify_all()
+
+
+class TodoManager:
+    """Holds the items of one store and writes changes behind the caller.
+
+    Args:
+        filename: Path of the todos JSON file.
+        load: Callable loading the items of ``filename`` without details.
+        save: Callable ``save(todos, filename, changes)`` rewriting the store.
+        append: Callable ``append(todos, filename)`` adding new items.
+        write_behind: Return from changes without waiting for the write.
+        debounce: Seconds to hold changes before writing them, unless
+            someone waits for them with ``flush``.
+    """
+
+    def __init__(self, filename, load, save, append, write_behind=False, debounce=0.0):
+        self.filename = filename
+        self.write_behind = write_behind
+        self.debounce = debounce
+        self._load = load
+        self._save = save
+        self._append = append
+        self._lock = RWLock()
+        self._todos = None
+        self._positions = {}
+        self._feed = None
+
+        self._queue_condition = threading.Condition()
+        self._queue = []
+        self._queued = 0
+        self._queued_at = 0.0
+        self._written = 0
+        self._wanted = 0
+        self._writing = 0
+        self._error = None
+        self._thread = None
+        self._closed = False
+        register_barrier(filename, self.settle)
+        atexit.register(self.close)
+
+    # ---------------------------------------------------------------- state
+
+    def _stale(self):
+        # Outside changes are only looked for while no write is queued,
+        # since queued writes change the file themselves
+        if self._todos is None:
+            return True
+        with self._queue_condition:
+            if self._written != self._queued:
+                return False
+        return self._feed is None or self._feed.changed()
+
+    def _current(self):
+        """Return the held items, brought up to date if the store changed.
+
+        Must be called with the lock held for writing.
+        """
+        if not self._stale():
+            return self._todos
+        with store_lock(self.filename):
+            changes = self._feed.poll() if self._todos is not None and self._feed is not None else None
+            if changes is None:
+                self._todos = self._load(self.filename)
+                self._positions = {todo.id: position for position, todo in enumerate(self._todos)}
+                self._feed = ChangeFeed(self.filename)
+                return self._todos
+        for _, after in changes:
+            position = self._positions.get(after.id)
+            if position is None:
+                self._positions[after.id] = len(self._todos)
+                self._todos.append(after)
+            else:
+                self._todos[position] = after
+        return self._todos
+
+    def _refresh(self):
+        with self._lock.reading():
+            stale = self._stale()
+        if stale:
+            with self._lock.writing():
+                self._current()
+
+    def get(self, todo_id):
+        """Return a copy of an item, or None if there is none with that id."""
+        self._refresh()
+        with self._lock.reading():
+            position = self._positions.get(todo_id)
+            return replace(self._todos[position]) if position is not None else None
+
+    def todos(self, owner=None):
+        """Return copies of the items, optionally only those of one owner."""
+        self._refresh()
+        with self._lock.reading():
+            return [replace(todo) for todo in self._todos if owner is None or todo.owner == owner]
+
+    # -------------------------------------------------------------- changes
+
+    def create(self, username, title, details="", priority=Priority.MID):
+        """Create an item and queue it to be written.
+
+        Returns:
+            A copy of the new TodoItem.
+
+        Raises:
+            ValueError: If the title is empty.
+            OSError: If waiting for the write and it failed.
+        """
+        with self._lock.writing():
+            todos = self._current()
+            change = create_todo(todos, username, title, details, priority)
+            self._positions[change[1].id] = len(todos) - 1
+            self._enqueue([change])
+        if not self.write_behind:
+            self.flush()
+        return replace(change[1])
+
+    def commit(self, changes):
+        """Store changed items and queue the changes to be written.
+
+        Args:
+            changes: List of ``(before, after)`` pairs; each ``after`` item
+                replaces the held item with the same id, and an item whose
+                ``before`` is None is added. None entries are ignored.
+
+        Raises:
+            OSError, ValueError: If waiting for the write and it failed.
+        """
+        changes = [change for change in changes if change is not None]
+        if not changes:
+            return
+        with self._lock.writing():
+            todos = self._current()
+            for before, after in changes:
+                position = self._positions.get(after.id)
+                if position is None:
+                    self._positions[after.id] = len(todos)
+                    todos.append(replace(after))
+                else:
+                    todos[position] = replace(after)
+            self._enqueue(changes)
+        if not self.write_behind:
+            self.flush()
+
+    # --------------------------------------------------------------- writes
+
+    def _enqueue(self, changes):
+        with self._queue_condition:
+            if not self._queue:
+                self._queued_at = time.monotonic()
+            self._queue.extend(changes)
+            self._queued += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="todo-writer", daemon=True)
+                self._thread.start()
+            self._queue_condition.notify_all()
+
+    def _take(self):
+        """Take the queued changes together with the items to write.
+
+        Changes are only queued with the lock held for writing, so holding
+        it for reading here keeps the items in step with the changes taken.
+        """
+        with self._lock.reading():
+            with self._queue_condition:
+                changes, self._queue = coalesce_changes(self._queue), []
+                target = self._queued
+                self._writing = len(changes)
+            if all(before is None for before, _ in changes):
+                todos = [replace(self._todos[self._positions[after.id]]) for _, after in changes]
+                return changes, todos, True, target
+            return changes, [replace(todo) for todo in self._todos], False, target
+
+    def _run(self):
+        while True:
+            with self._queue_condition:
+                while not self._queue and not self._closed:
+                    self._queue_condition.wait()
+                if not self._queue:
+                    return
+                self._hold()
+            changes, todos, appending, target = self._take()
+            try:
+                with store_lock(self.filename, exclusive=True):
+                    # Another session saving in between means the held items
+                    # miss its changes; the old feed reads them after the write
+                    outside = self._feed is None or self._feed.changed()
+                    if appending:
+                        self._append(todos, self.filename)
+                    else:
+                        self._save(todos, self.filename, changes)
+                    feed = self._feed if outside else ChangeFeed(self.filename)
+            except ConflictError as error:
+                # Every other change of the batch was saved; the conflicting
+                # items go back to their stored version
+                with self._lock.writing():
+                    for todo in error.todos:
+                        position = self._positions.get(todo.id)
+                        if position is not None:
+                            self._todos[position] = todo
+                self._finish(target, error)
+                continue
+            except (OSError, ValueError) as error:
+                # Only this batch is lost; changes queued since are still
+                # written, and the store is loaded again once they are
+                with self._lock.writing():
+                    self._feed = None
+                self._finish(target, error)
+                continue
+            with self._lock.writing():
+                self._feed = feed
+                # The save gave the written copies new versions and details
+                # references; later changes of the held items build on them
+                for saved in (todos if appending else [after for _, after in changes]):
+                    position = self._positions.get(saved.id)
+                    if position is not None:
+                        held = self._todos[position]
+                        held.version, held.details_ref = saved.version, saved.details_ref
+            self._finish(target)
+
+    def _finish(self, target, error=None):
+        with self._queue_condition:
+            if error is not None:
+                self._error = error
+            self._written = target
+            self._writing = 0
+            self._queue_condition.notify_all()
+
+    def _hold(self):
+        """Wait out the debounce delay; the queue condition must be held."""
+        deadline = self._queued_at + self.debounce
+        while not self._closed and self._wanted <= self._written:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            self._queue_condition.wait(remaining)
+
+    def pending(self):
+        """Return True if some changes are not written yet."""
+        with self._queue_condition:
+            return self._written != self._queued
+
+    def unsaved(self):
+        """Return the number of items whose changes are not written yet."""
+        with self._queue_condition:
+            return len({after.id for _, after in self._queue}) + self._writing
+
+    def _wait(self):
+        with self._queue_condition:
+            target = self._queued
+            if self._wanted < target:
+                self._wanted = target
+                self._queue_condition.notify_all()
+            while self._written < target:
+                self._queue_condition.wait()
+
+    def flush(self):
+        """Wait until every change queued so far is written.
+
+        Raises:
+            OSError, ValueError: If a write failed since the last flush; the
+                changes it held are lost and the store is loaded again. A
+                ConflictError loses only the conflicting changes.
+        """
+        self._wait()
+        error = self.take_error()
+        if error is not None:
+            raise error
+
+    def take_error(self):
+        """Return the failure of the last write and forget it, or None."""
+        with self._queue_condition:
+            error, self._error = self._error, None
+        return error
+
+    def settle(self):
+        """Wait for the queued writes, unless called from the writing thread.
+
+        Threads holding the store's lock do not wait either, since the
+        writing thread needs the lock to write. A failed write is left for
+        ``flush`` or ``take_error`` to report.
+        """
+        if threading.current_thread() is not self._thread and not holds_lock(self.filename):
+            self._wait()
+
+    def close(self):
+        """Write everything queued and stop the writing thread."""
+        with self._queue_condition:
+            self._closed = True
+            self._queue_condition.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
@@ -0,0 +1,145 @@
+"""Title completion with a per-owner compressed prefix trie.
+
+Each owner's titles are kept in a radix trie: every edge holds a run of
+characters and nodes with a single child are merged into their parent, so
+the trie stays shallow. Looking up a typed prefix walks one edge per run of
+matching characters and then visits only as many nodes as are needed to
+collect the first ``limit`` items, however many items the owner has.
+"""
+
+from dataclasses import replace
+
+from indexes import TodoIndex
+
+COMPLETION_LIMIT = 10
+
+
+def title_key(title):
+    """Return the form of a title used for prefix matching."""
+    return title.casefold()
+
+
+class _Node:
+    __slots__ = ("children", "items")
+
+    def __init__(self):
+        self.children = {}
+        self.items = {}
+
+
+def _common_prefix_length(a, b):
+    length = min(len(a), len(b))
+    for position in range(length):
+        if a[position] != b[position]:
+            return position
+    return length
+
+
+class TitleTrie(TodoIndex):
+    """Per-owner radix tries mapping titles to items."""
+
+    def __init__(self):
+        self._roots = {}
+        self._keys = {}
+
+    def rebuild(self, todos):
+        self._roots = {}
+        self._keys = {}
+        for todo in todos:
+            self._insert(todo)
+
+    def apply(self, before, after):
+        if before is not None:
+            self._delete(before.id)
+        if after is not None:
+            self._insert(after)
+
+    def _insert(self, todo):
+        key = title_key(todo.title)
+        self._keys[todo.id] = (todo.owner, key)
+        node = self._roots.setdefault(todo.owner, _Node())
+        rest = key
+        while rest:
+            edge = node.children.get(rest[0])
+            if edge is None:
+                child = _Node()
+                node.children[rest[0]] = (rest, child)
+                node = child
+                break
+            label, child = edge
+            common = _common_prefix_length(label, rest)
+            if common < len(label):
+                middle = _Node()
+                middle.children[label[common]] = (label[common:], child)
+                node.children[rest[0]] = (label[:common], middle)
+                child = middle
+            node = child
+            rest = rest[common:]
+        node.items[todo.id] = todo
+
+    def _delete(self, todo_id):
+        entry = self._keys.pop(todo_id, None)
+        if entry is None:
+            return
+        owner, key = entry
+        path = []
+        node = self._roots[owner]
+        rest = key
+        while rest:
+            label, child = node.children[rest[0]]
+            path.append((node, rest[0]))
+            node = child
+            rest = rest[len(label):]
+        node.items.pop(todo_id, None)
+
+        # Remove nodes left empty and merge nodes left with a single child
+        while path and not node.items and not node.children:
+            parent, first = path.pop()
+            del parent.children[first]
+            node = parent
+        if path and not node.items and len(node.children) == 1:
+            parent, first = path[-1]
+            label, _ = parent.children[first]
+            child_label, grandchild = next(iter(node.children.values()))
+            parent.children[first] = (label + child_label, grandchild)
+
+    def complete(self, owner, prefix, limit=COMPLETION_LIMIT, accept=None):
+        """Return an owner's items whose title starts with a prefix.
+
+        Args:
+            owner: Username whose items to search.
+            prefix: Typed start of the title; case is ignored.
+            limit: Maximum number of items to return.
+            accept: Optional predicate an item must satisfy.
+
+        Returns:
+            Copies of the matching TodoItem objects, in title order.
+        """
+        node = self._roots.get(owner)
+        rest = title_key(prefix)
+        while node is not None and rest:
+            edge = node.children.get(rest[0])
+            if edge is None:
+                return []
+            label, child = edge
+            if label.startswith(rest):
+                rest = ""
+            elif rest.startswith(label):
+                rest = rest[len(label):]
+            else:
+                return []
+            node = child
+        if node is None:
+            return []
+
+        matches = []
+        stack = [node]
+        while stack and len(matches) < limit:
+            current = stack.pop()
+            for todo in current.items.values():
+                if accept is None or accept(todo):
+                    matches.append(replace(todo))
+                    if len(matches) == limit:
+                        break
+            stack.extend(child for _, (_, child) in sorted(current.children.items(), reverse=True))
+        return matches
@@ -0,0 +1,355 @@
+"""Full-screen terminal UI for browsing a user's to-do list.
+
+The list is virtualized: rows are read from the store in fixed-size blocks
+only when they scroll into view, and a small number of blocks is kept in
+memory. Each redraw compares the text of every screen row with what was
+drawn last time and only rewrites the rows that changed, so scrolling a
+very long list costs the same as scrolling a short one.
+
+While the screen waits for a key it redraws every ``REFRESH_MS``
+milliseconds. The list follows the store's change log, so items saved by
+another session are patched into the loaded rows instead of reading the
+list again.
+"""
+
+import sys
+from collections import OrderedDict
+
+try:
+    import curses
+except ImportError:  # pragma: no cover - curses is missing on some platforms
+    curses = None
+
+from changelog import ChangeFeed
+from locking import store_lock
+from paging import TodoCursor
+from render import status_symbol
+from sidecars import settle
+
+BLOCK_SIZE = 200
+MAX_BLOCKS = 8
+REFRESH_MS = 1000
+
+
+def tui_available():
+    """Return True if the full-screen UI can run in this terminal."""
+    return curses is not None and sys.stdin.isatty() and sys.stdout.isatty()
+
+
+class VirtualList:
+    """Row-addressable view of the items matching a predicate.
+
+    Rows are loaded in blocks through a TodoCursor, which remembers the
+    byte offset of each block, and the most recently used blocks are kept.
+    Changes saved to the store are applied to the loaded blocks: a changed
+    item is replaced where it is, a new match is added at the end and only
+    the blocks from a removed match on are read again.
+
+    Args:
+        filename: Path of the todos JSON file.
+        match: Predicate over raw record dictionaries.
+        total: Number of matching items.
+        block_size: Number of rows read at once.
+        max_blocks: Number of blocks kept in memory.
+        count: Optional callable returning the number of matching items,
+            used to count them again when the whole store was replaced.
+    """
+
+    def __init__(self, filename, match, total, block_size=BLOCK_SIZE, max_blocks=MAX_BLOCKS, count=None):
+        self.filename = filename
+        self.match = match
+        self.total = total
+        self.block_size = block_size
+        self.max_blocks = max_blocks
+        self.count = count
+        self.loads = 0
+        self._reset()
+
+    def _reset(self):
+        self._cursor = TodoCursor(self.filename, self.match, self.block_size)
+        self._blocks = OrderedDict()
+        self._feed = ChangeFeed(self.filename)
+
+    def invalidate(self):
+        """Drop loaded rows so they are read again from the store."""
+        self._reset()
+        if self.count is not None:
+            self.total = self.count()
+
+    def refresh(self):
+        """Apply the changes saved to the store since the last look."""
+        settle(self.filename)
+        if not self._feed.changed():
+            return
+        with store_lock(self.filename):
+            changes = self._feed.poll()
+        if changes is None:
+            self.invalidate()
+            return
+        touched = False
+        for before, after in changes:
+            was = before is not None and self.match(before.to_dict())
+            now = self.match(after.to_dict())
+            if was or now:
+                touched = True
+                self._patch(before, after, was, now)
+        if touched:
+            # Saves rewrite the file, so the remembered block offsets are gone
+            self._cursor = TodoCursor(self.filename, self.match, self.block_size)
+
+    def _locate(self, todo_id):
+        for number, block in self._blocks.items():
+            for offset, todo in enumerate(block):
+                if todo.id == todo_id:
+                    return number, offset
+        return None
+
+    def _patch(self, before, after, was, now):
+        """Apply one change of a matching item to the loaded rows."""
+        found = self._locate(after.id)
+        if was and now:
+            if found is not None:
+                self._blocks[found[0]][found[1]] = after
+        elif now:
+            if before is None:
+                # New items are saved at the end of the store
+                self._drop_from(self.total // self.block_size)
+            else:
+                self._blocks.clear()
+            self.total += 1
+        else:
+            self._drop_from(found[0] if found is not None else 0)
+            self.total -= 1
+
+    def _drop_from(self, number):
+        for loaded in [loaded for loaded in self._blocks if loaded >= number]:
+            del self._blocks[loaded]
+
+    def _block(self, number):
+        block = self._blocks.get(number)
+        if block is None:
+            block = self._cursor.page_at(number).items
+            self.loads += 1
+            self._blocks[number] = block
+            if len(self._blocks) > self.max_blocks:
+                self._blocks.popitem(last=False)
+        else:
+            self._blocks.move_to_end(number)
+        return block
+
+    def _row(self, index):
+        if index < 0:
+            return None
+        block = self._block(index // self.block_size)
+        offset = index % self.block_size
+        return block[offset] if offset < len(block) else None
+
+    def row(self, index):
+        """Return the item at a zero-based row, or None past the end."""
+        self.refresh()
+        return self._row(index)
+
+    def rows(self, start, count):
+        """Return the items of up to ``count`` rows starting at ``start``."""
+        self.refresh()
+        items = []
+        for index in range(start, start + count):
+            todo = self._row(index)
+            if todo is None:
+                break
+            items.append(todo)
+        return items
+
+
+class Viewport:
+    """Scroll position and selection within a list of ``total`` rows."""
+
+    def __init__(self, total, height):
+        self.total = total
+        self.height = max(1, height)
+        self.top = 0
+        self.selected = 0
+
+    def move(self, delta):
+        """Move the selection by ``delta`` rows, scrolling to keep it visible."""
+        if self.total == 0:
+            return
+        self.selected = min(max(self.selected + delta, 0), self.total - 1)
+        if self.selected < self.top:
+            self.top = self.selected
+        elif self.selected >= self.top + self.height:
+            self.top = self.selected - self.height + 1
+
+    def page(self, delta):
+        """Move the selection by ``delta`` screens."""
+        self.move(delta * self.height)
+
+    def home(self):
+        """Select the first row."""
+        self.move(-self.selected)
+
+    def end(self):
+        """Select the last row."""
+        self.move(self.total - 1 - self.selected)
+
+    def resize(self, height):
+        """Change the number of visible rows."""
+        self.height = max(1, height)
+        self.move(0)
+
+    def set_total(self, total):
+        """Change the number of rows, keeping the selection inside the list."""
+        self.total = total
+        if total == 0:
+            self.top = self.selected = 0
+        else:
+            self.move(0)
+
+
+def format_row(number, todo, width):
+    """Format one list row, clipped to the screen width."""
+    text = f"{number:>7}  {status_symbol(todo)} {todo.priority.value:<4}  {todo.title}"
+    return text[:max(0, width - 1)]
+
+
+def changed_rows(previous, current):
+    """Return the screen rows whose content differs from the last draw.
+
+    Args:
+        previous: Dictionary mapping screen row to what was drawn there.
+        current: Dictionary mapping screen row to what should be drawn.
+
+    Returns:
+        Sorted list of screen rows that need redrawing.
+    """
+    return sorted(row for row in previous.keys() | current.keys() if previous.get(row) != current.get(row))
+
+
+class TodoListScreen:
+    """Curses screen showing a virtualized, scrollable to-do list."""
+
+    HEADER_ROWS = 2
+    FOOTER_ROWS = 2
+
+    def __init__(self, stdscr, username, rows, complete):
+        self.stdscr = stdscr
+        self.username = username
+        self.rows = rows
+        self.complete = complete
+        self.message = ""
+        self._drawn = {}
+        height, self.width = stdscr.getmaxyx()
+        self.viewport = Viewport(rows.total, height - self.HEADER_ROWS - self.FOOTER_ROWS)
+
+    def _content(self):
+        self.rows.refresh()
+        if self.viewport.total != self.rows.total:
+            self.viewport.set_total(self.rows.total)
+        height = self.viewport.height
+        content = {
+            0: f" {self.username}'s To-Do Items ({self.rows.total} total)"[:self.width - 1],
+            1: "-" * (self.width - 1),
+        }
+        visible = self.rows.rows(self.viewport.top, height)
+        for offset in range(height):
+            row = self.HEADER_ROWS + offset
+            if offset < len(visible):
+                number = self.viewport.top + offset
+                text = format_row(number + 1, visible[offset], self.width)
+                content[row] = (text, number == self.viewport.selected)
+            else:
+                content[row] = ""
+
+        selected = self.rows.row(self.viewport.selected)
+        footer = self.HEADER_ROWS + height
+        content[footer] = "-" * (self.width - 1)
+        if self.message:
+            content[footer + 1] = self.message[:self.width - 1]
+        elif selected is not None:
+            content[footer + 1] = (
+                f" {selected.status.value}  updated {selected.updated_at}"
+                "   [↑/↓ PgUp/PgDn Home/End] move  [c] complete  [q] quit"
+            )[:self.width - 1]
+        else:
+            content[footer + 1] = " [q] quit"
+        return content
+
+    def draw(self):
+        """Redraw the rows that changed since the last draw."""
+        content = self._content()
+        for row in changed_rows(self._drawn, content):
+            value = content.get(row, "")
+            text, highlight = value if isinstance(value, tuple) else (value, False)
+            try:
+                self.stdscr.move(row, 0)
+                self.stdscr.clrtoeol()
+                self.stdscr.addstr(row, 0, text, curses.A_REVERSE if highlight else curses.A_NORMAL)
+            except curses.error:
+                pass  # row is outside a terminal that is too small
+        self._drawn = content
+        self.stdscr.refresh()
+
+    def resize(self):
+        """Adapt to a new terminal size and redraw everything."""
+        height, self.width = self.stdscr.getmaxyx()
+        self.viewport.resize(height - self.HEADER_ROWS - self.FOOTER_ROWS)
+        self.stdscr.clear()
+        self._drawn = {}
+
+    def handle_key(self, key):
+        """Apply a key press.
+
+        Args:
+            key: Key code from ``getch``; -1 when the refresh interval
+                passed without a key press.
+
+        Returns:
+            False when the screen should close.
+        """
+        if key == -1:
+            return True
+        self.message = ""
+        if key in (ord("q"), ord("Q"), 27):
+            return False
+        if key in (curses.KEY_DOWN, ord("j")):
+            self.viewport.move(1)
+        elif key in (curses.KEY_UP, ord("k")):
+            self.viewport.move(-1)
+        elif key == curses.KEY_NPAGE:
+            self.viewport.page(1)
+        elif key == curses.KEY_PPAGE:
+            self.viewport.page(-1)
+        elif key == curses.KEY_HOME:
+            self.viewport.home()
+        elif key == curses.KEY_END:
+            self.viewport.end()
+        elif key == curses.KEY_RESIZE:
+            self.resize()
+        elif key in (ord("c"), ord("C")):
+            todo = self.rows.row(self.viewport.selected)
+            if todo is not None:
+                self.message = self.complete(todo)
+        return True
+
+    def run(self):
+        """Run the input loop until the user quits."""
+        curses.curs_set(0)
+        self.stdscr.keypad(True)
+        self.stdscr.timeout(REFRESH_MS)
+        self.stdscr.clear()
+        while True:
+            self.draw()
+            if not self.handle_key(self.stdscr.getch()):
+                return
+
+
+def run_todo_tui(username, rows, complete):
+    """Show the full-screen list until the user quits.
+
+    Args:
+        username: The username of the current user.
+        rows: VirtualList of the user's items.
+        complete: Callable marking an item completed and returning a
+            status message.
+    """
+    curses.wrapper(lambda stdscr: TodoListScreen(stdscr, username, rows, complete).run())
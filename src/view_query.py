@@ -0,0 +1,166 @@
+"""Filtered and sorted pages of a user's items for the view screens.
+
+A ``QueryCursor`` pages through the items matching a filter in a chosen
+order. When the filter keeps only pending items and the order is by
+priority, the pages are slices of the next-up index, which already holds
+those items in that order. Otherwise each page is produced by one pass over
+the store that keeps only the best ``(page + 1) * page_size`` records in a
+heap, so showing the first pages never sorts the user's whole list.
+"""
+
+import heapq
+from dataclasses import replace
+
+from models import TodoItem, Priority, Status
+from next_up import NextUpIndex, PRIORITY_RANK
+from paging import PAGE_SIZE, Page, iter_records
+from query import equality_terms, field_value
+from sidecars import store_signature
+
+_PRIORITY_RANK = {priority.value: rank for priority, rank in PRIORITY_RANK.items()}
+_STATUS_RANK = {Status.PENDING.value: 0, Status.COMPLETED.value: 1}
+
+SORT_KEYS = {
+    "priority": lambda item: (
+        _PRIORITY_RANK[field_value(item, "priority")], field_value(item, "created_at"), field_value(item, "id")
+    ),
+    "status": lambda item: (_STATUS_RANK[field_value(item, "status")], field_value(item, "created_at")),
+    "created": lambda item: field_value(item, "created_at"),
+    "updated": lambda item: field_value(item, "updated_at"),
+    "title": lambda item: field_value(item, "title").casefold(),
+}
+
+
+def parse_sort(text):
+    """Parse a sort choice such as ``"priority"`` or ``"-updated"``.
+
+    Returns:
+        A ``(field, descending)`` pair, or ``(None, False)`` for list order.
+
+    Raises:
+        ValueError: If the field is not one of ``SORT_KEYS``.
+    """
+    text = text.strip().lower()
+    if not text:
+        return None, False
+    descending = text.startswith("-")
+    field = text.lstrip("-").strip()
+    if field not in SORT_KEYS:
+        raise ValueError(f"Cannot sort by '{field}'. Use one of: {', '.join(SORT_KEYS)}.")
+    return field, descending
+
+
+class QueryCursor:
+    """Page-by-page navigation over a user's filtered, sorted items.
+
+    Offers the same navigation methods as ``paging.TodoCursor`` plus the
+    number of matching items in ``total``.
+
+    Args:
+        filename: Path of the todos JSON file.
+        username: Owner of the items.
+        node: Optional parsed filter from ``query.parse_filter``.
+        sort: Optional key of ``SORT_KEYS``; None keeps list order.
+        descending: Reverse the sort order.
+        indexes: IndexCache holding the in-memory indexes.
+        loader: Callable loading the items of ``filename`` to build an index.
+        page_size: Items per page.
+    """
+
+    def __init__(self, filename, username, node=None, sort=None, descending=False,
+                 indexes=None, loader=None, page_size=PAGE_SIZE):
+        self.filename = filename
+        self.username = username
+        self.node = node
+        self.sort = sort
+        self.descending = descending
+        self.indexes = indexes
+        self.loader = loader
+        self.page_size = page_size
+        self.total = 0
+        self._number = 0
+        self._page = None
+        self._signature = None
+        terms = equality_terms(node) if node is not None else {}
+        self.plan = (
+            "next-up index"
+            if sort == "priority" and terms.get("status") == Status.PENDING.value and indexes is not None
+            else "scan"
+        )
+
+    def _matches(self, record):
+        return record["owner"] == self.username and (self.node is None or self.node.matches(record))
+
+    def _read_index(self, number):
+        priority = equality_terms(self.node).get("priority")
+        index = self.indexes.get(NextUpIndex, self.filename, self.loader)
+        items = [
+            todo for todo in index.pending(self.username, Priority(priority) if priority else None)
+            if self.node.matches(todo)
+        ]
+        if self.descending:
+            items.reverse()
+        self.total = len(items)
+        start = number * self.page_size
+        return [replace(todo) for todo in items[start:start + self.page_size]]
+
+    def _read_scan(self, number):
+        count = 0
+
+        def matching():
+            nonlocal count
+            for position, (_, record) in enumerate(iter_records(self.filename)):
+                if self._matches(record):
+                    count += 1
+                    yield position, record
+
+        wanted = (number + 1) * self.page_size
+        if self.sort is None:
+            key = lambda entry: entry[0]
+        else:
+            sort_key = SORT_KEYS[self.sort]
+            key = lambda entry: sort_key(entry[1])
+        select = heapq.nlargest if self.descending else heapq.nsmallest
+        best = select(wanted, matching(), key=key)
+        self.total = count
+        return [TodoItem.from_dict(record) for _, record in best[number * self.page_size:]]
+
+    def page(self):
+        """Return the current page, reading it again if the store changed."""
+        signature = store_signature(self.filename)
+        if self._page is None or signature != self._signature:
+            self._signature = signature
+            while True:
+                read = self._read_index if self.plan != "scan" else self._read_scan
+                items = read(self._number)
+                if items or self._number == 0:
+                    break
+                self._number -= 1
+            start = self._number * self.page_size
+            self._page = Page(items, self._number, start, None)
+        return self._page
+
+    def has_next(self):
+        """Return True if there is a page after the current one."""
+        page = self.page()
+        return page.start + len(page.items) < self.total
+
+    def has_prev(self):
+        """Return True if there is a page before the current one."""
+        return self.page().number > 0
+
+    def next(self):
+        """Move to the next page if there is one."""
+        if self.has_next():
+            self._number += 1
+            self._page = None
+
+    def prev(self):
+        """Move to the previous page if there is one."""
+        if self.has_prev():
+            self._number -= 1
+            self._page = None
+
+    def refresh(self):
+        """Forget the current page so it is read again on next access."""
+        self._page = None
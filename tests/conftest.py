@@ -1,7 +1,22 @@
 """Pytest configuration and fixtures."""
 
+import pytest
 import sys
 import os
 
 # Add src directory to Python path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+
+@pytest.fixture
+def todo_store(tmp_path, monkeypatch):
+    """Run the test in a temporary directory holding the todo store.
+
+    Returns:
+        A function that writes the given TodoItem list to ``todos.json``.
+    """
+    from main import save_todos
+
+    monkeypatch.chdir(tmp_path)
+    return save_todos
+
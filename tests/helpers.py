@@ -0,0 +1,12 @@
+"""Helpers shared by the tests for building items."""
+
+from models import Priority, TodoItem
+
+
+def make_todos(count, owner="alice", title="Task", priorities=(Priority.MID,)):
+    """Build numbered todo items, cycling through the given priorities."""
+    return [
+        TodoItem(title=f"{title} {i}", details=f"Details {i}", priority=priorities[(i - 1) % len(priorities)],
+                 owner=owner)
+        for i in range(1, count + 1)
+    ]
@@ -0,0 +1,110 @@
+"""Tests for the columnar analytics report."""
+
+import pytest
+import json
+import os
+import tempfile
+
+np = pytest.importorskip("numpy")
+
+from models import Priority
+from analytics import (
+    columns_from_records,
+    load_columns,
+    completion_by_owner,
+    counts_by_priority,
+    lead_time_percentiles,
+    format_report,
+)
+
+
+def make_record(owner, priority="MID", status="PENDING",
+                created="2025-01-01T10:00:00", updated="2025-01-01T10:00:00"):
+    """Build a raw todo record as stored in todos.json."""
+    return {
+        "id": f"{owner}-{priority}-{status}-{created}",
+        "title": "Task",
+        "priority": priority,
+        "status": status,
+        "owner": owner,
+        "created_at": created,
+        "updated_at": updated,
+        "details_ref": None,
+    }
+
+
+class TestColumns:
+    """Tests for building columns from the store."""
+
+    def test_columns_use_categorical_codes(self):
+        """Test owners, priorities and statuses are encoded as codes."""
+        columns = columns_from_records([
+            make_record("bob", "HIGH"),
+            make_record("alice", "LOW", "COMPLETED"),
+            make_record("bob", "LOW"),
+        ])
+        assert len(columns) == 3
+        assert columns.owners == ["alice", "bob"]
+        assert columns.owner_codes.tolist() == [1, 0, 1]
+        assert columns.priority_codes.dtype == np.int8
+        assert columns.created_at.dtype == np.int64
+
+    def test_load_columns_missing_file(self):
+        """Test loading a missing store gives empty columns."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            columns = load_columns(os.path.join(tmpdir, "todos.json"))
+            assert len(columns) == 0
+            assert counts_by_priority(columns)[Priority.HIGH] == 0
+
+    def test_load_columns_from_file(self):
+        """Test loading columns from a todos file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            todos_file = os.path.join(tmpdir, "todos.json")
+            with open(todos_file, 'w') as f:
+                json.dump([make_record("alice"), make_record("bob")], f)
+            assert load_columns(todos_file).owners == ["alice", "bob"]
+
+
+class TestAggregates:
+    """Tests for the vectorized report aggregates."""
+
+    def test_completion_by_owner(self):
+        """Test completion rate is computed per owner."""
+        columns = columns_from_records([
+            make_record("alice", status="COMPLETED"),
+            make_record("alice"),
+            make_record("bob", status="COMPLETED"),
+        ])
+        result = completion_by_owner(columns)
+        assert result["alice"] == (2, 1, 0.5)
+        assert result["bob"] == (1, 1, 1.0)
+
+    def test_counts_by_priority(self):
+        """Test items are counted per priority level."""
+        columns = columns_from_records([
+            make_record("alice", "HIGH"),
+            make_record("alice", "HIGH"),
+            make_record("bob", "LOW"),
+        ])
+        assert counts_by_priority(columns) == {Priority.HIGH: 2, Priority.MID: 0, Priority.LOW: 1}
+
+    def test_lead_time_percentiles(self):
+        """Test lead time uses completed items only."""
+        columns = columns_from_records([
+            make_record("alice", status="COMPLETED", updated="2025-01-01T11:00:00"),
+            make_record("alice", status="COMPLETED", updated="2025-01-01T12:00:00"),
+            make_record("alice", updated="2025-02-01T10:00:00"),
+        ])
+        result = lead_time_percentiles(columns, percentiles=(0, 100))
+        assert result == {0: 3600.0, 100: 7200.0}
+
+    def test_lead_time_without_completed_items(self):
+        """Test lead time is empty when nothing is completed."""
+        assert lead_time_percentiles(columns_from_records([make_record("alice")])) == {}
+
+    def test_format_report(self):
+        """Test the report text mentions users and priorities."""
+        report = format_report(columns_from_records([make_record("alice", "HIGH", "COMPLETED")]))
+        assert "alice" in report
+        assert "HIGH" in report
+        assert "100.0%" in report
@@ -0,0 +1,132 @@
+"""Tests for batch command mode."""
+
+import pytest
+import json
+from unittest.mock import Mock
+from models import TodoItem, Priority, Status
+from main import save_todos, load_todos, load_todos_for_index, load_todo_summary
+from batch import run_batch
+from operations import coalesce_changes, complete_todo, create_todo
+
+
+def run(lines, commit_every=0):
+    """Run a batch for alice against todos.json and collect its output."""
+    output = []
+    save = Mock(wraps=save_todos)
+    summary = run_batch(
+        [json.dumps(line) if isinstance(line, dict) else line for line in lines],
+        "alice", "todos.json", load_todos_for_index, save, commit_every, output.append,
+    )
+    return summary, [json.loads(line) for line in output], save
+
+
+class TestCoalesceChanges:
+    """Tests for merging repeated changes to one item."""
+
+    def test_keeps_first_before_and_last_after(self):
+        """Test a created then completed item is a single creation."""
+        todos = []
+        created = create_todo(todos, "alice", "Task")
+        completed = complete_todo(todos[0])
+        assert coalesce_changes([created, completed]) == [(None, todos[0])]
+
+
+class TestRunBatch:
+    """Tests for applying JSONL commands."""
+
+    def test_commands_share_one_load_and_commit(self, todo_store):
+        """Test creates, edits and completes are saved once."""
+        summary, results, save = run([
+            {"op": "create", "title": "Task", "priority": "high"},
+            {"op": "create", "title": "Other"},
+        ])
+        first = results[0]["id"]
+        summary2, results2, save2 = run([
+            {"op": "edit", "id": first[:8], "title": "Renamed"},
+            {"op": "complete", "id": first},
+        ])
+        assert save.call_count == 1
+        assert save2.call_count == 1
+        assert summary["applied"] == 2
+        assert summary2["commits"] == 1
+
+        todos = {todo.id: todo for todo in load_todos()}
+        assert todos[first].title == "Renamed"
+        assert todos[first].status == Status.COMPLETED
+        assert todos[first].priority == Priority.HIGH
+
+    def test_commit_every(self, todo_store):
+        """Test changes are saved every N successful commands."""
+        summary, _, save = run([{"op": "create", "title": f"Task {i}"} for i in range(5)], commit_every=2)
+        assert save.call_count == 3
+        assert summary["commits"] == 3
+        assert len(load_todos()) == 5
+
+    def test_failures_are_reported_per_line(self, todo_store):
+        """Test bad commands fail individually without stopping the batch."""
+        summary, results, _ = run([
+            "not json",
+            {"op": "delete", "id": "abc"},
+            {"op": "create", "title": "  "},
+            {"op": "complete", "id": "ffff"},
+            "",
+            {"op": "create", "title": "Task"},
+        ])
+        assert [result["ok"] for result in results] == [False, False, False, False, True]
+        assert [result["line"] for result in results] == [1, 2, 3, 4, 6]
+        assert (summary["commands"], summary["failed"], summary["applied"]) == (5, 4, 1)
+
+    def test_null_fields_are_missing(self, todo_store):
+        """Test JSON null is not stored as the text 'None'."""
+        _, results, _ = run([
+            {"op": "create", "title": None},
+            {"op": "create", "title": "Task", "details": None},
+        ])
+        assert [result["ok"] for result in results] == [False, True]
+        assert "Title cannot be empty" in results[0]["error"]
+        todo = load_todos()[0]
+        assert (todo.title, todo.details) == ("Task", "")
+
+    def test_only_own_items_can_be_changed(self, todo_store):
+        """Test commands cannot address another user's items."""
+        todo = TodoItem(title="Bob's", details="", priority=Priority.MID, owner="bob")
+        todo_store([todo])
+        _, results, save = run([{"op": "complete", "id": todo.id}])
+        assert results[0]["ok"] is False
+        assert save.call_count == 0
+
+    def test_repeated_changes_keep_counters_right(self, todo_store):
+        """Test an item changed twice in one commit is counted once."""
+        run([{"op": "create", "title": "Task"}])
+        todo_id = load_todos()[0].id
+        run([
+            {"op": "edit", "id": todo_id, "priority": "LOW"},
+            {"op": "complete", "id": todo_id},
+            {"op": "complete", "id": todo_id},
+        ])
+        counts = load_todo_summary("alice")
+        assert (counts["total"], counts["completed"], counts["LOW"], counts["MID"]) == (1, 1, 1, 0)
+
+    def test_details_survive_batch(self, todo_store):
+        """Test items not touched by the batch keep their details."""
+        todo_store([TodoItem(title="Kept", details="Notes", priority=Priority.MID, owner="alice")])
+        run([{"op": "create", "title": "New", "details": "More notes"}])
+        assert sorted(todo.details for todo in load_todos()) == ["More notes", "Notes"]
+
+
+class TestBatchCommand:
+    """Tests for the batch subcommand."""
+
+    def test_batch_from_file(self, todo_store, tmp_path, capsys):
+        """Test the CLI reads commands from a file and prints a summary."""
+        from main import save_users
+        from cli import main as cli_main
+
+        save_users([{"username": "alice", "password": "secret"}])
+        commands = tmp_path / "commands.jsonl"
+        commands.write_text('{"op": "create", "title": "Task"}\n{"op": "bogus"}\n')
+        assert cli_main(["--user", "alice", "--password", "secret", "batch", str(commands)]) == 0
+
+        lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [line.get("ok") for line in lines[:2]] == [True, False]
+        assert lines[2]["summary"]["applied"] == 1
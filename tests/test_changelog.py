@@ -0,0 +1,207 @@
+"""Tests for the change log and the sessions refreshing from it."""
+
+import json
+import os
+
+import changelog
+from changelog import ChangeFeed, changes_path, latest_seq
+from id_index import IdPrefixIndex
+from indexes import IndexCache
+from locking import store_lock
+from models import Status
+from operations import complete_todo, edit_todo
+from main import append_todos, load_todos, load_todos_for_index, save_todos
+from server import TodoService
+from todo_manager import TodoManager
+from tests.helpers import make_todos
+
+
+def save_elsewhere(position, **fields):
+    """Change one item the way another session would, from a fresh load."""
+    todos = load_todos(with_details=False)
+    change = edit_todo(todos[position], **fields) if fields else complete_todo(todos[position])
+    save_todos(todos, "todos.json", changes=[change])
+
+
+def read_log():
+    """Return the entries of the change log."""
+    with open(changes_path("todos.json"), encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestChangeLog:
+    """Tests for the entries written by saves."""
+
+    def test_saves_are_numbered(self, todo_store):
+        """Test every changed item gets the next sequence number."""
+        todo_store(make_todos(2))
+        save_elsewhere(0, title="Renamed")
+        append_todos(make_todos(2, owner="bob"), "todos.json")
+
+        entries = read_log()
+        assert [entry["seq"] for entry in entries] == [1, 2, 3, 4]
+        assert entries[0].get("reset") is True
+        assert (entries[1]["before"]["title"], entries[1]["after"]["title"]) == ("Task 1", "Renamed")
+        assert entries[2]["before"] is None
+        assert "details" not in entries[1]["after"]
+        assert latest_seq("todos.json") == 4
+
+    def test_no_log_is_seq_zero(self, tmp_path):
+        """Test a store without a log has seen no changes."""
+        assert latest_seq(str(tmp_path / "todos.json")) == 0
+
+    def test_long_log_is_emptied_and_keeps_numbering(self, todo_store, monkeypatch):
+        """Test the log is trimmed once it grows too long."""
+        monkeypatch.setattr(changelog, "MAX_LOG_BYTES", 100)
+        todo_store(make_todos(2))
+        save_elsewhere(0, title="Renamed")
+        save_elsewhere(1)
+
+        assert [entry["seq"] for entry in read_log()] == [3]
+
+    def test_torn_tail_is_replaced_by_a_reset(self, todo_store):
+        """Test a save after a crash while logging still succeeds."""
+        todo_store(make_todos(1))
+        feed = ChangeFeed("todos.json")
+        with open(changes_path("todos.json"), "a") as f:
+            f.write('{"seq": 2, "sto')
+        assert latest_seq("todos.json") == 1
+
+        append_todos(make_todos(1, owner="bob"), "todos.json")
+        assert [todo.owner for todo in load_todos()] == ["alice", "bob"]
+        assert [(entry["seq"], entry.get("reset")) for entry in read_log()] == [(1, True), (2, True)]
+        assert feed.poll() is None
+
+    def test_unwritable_log_does_not_fail_the_save(self, todo_store):
+        """Test a save whose changes cannot be logged is noticed by readers."""
+        todo_store(make_todos(2))
+        feed = ChangeFeed("todos.json")
+        os.remove(changes_path("todos.json"))
+        os.mkdir(changes_path("todos.json"))
+        save_elsewhere(0, title="Unlogged")
+        os.rmdir(changes_path("todos.json"))
+        save_elsewhere(1)
+
+        assert load_todos()[0].title == "Unlogged"
+        assert feed.poll() is None
+
+
+class TestChangeFeed:
+    """Tests for reading the changes saved since a known point."""
+
+    def test_poll_returns_changes_since_last_poll(self, todo_store):
+        """Test only new changes are returned, with replaced details loaded."""
+        todo_store(make_todos(2))
+        feed = ChangeFeed("todos.json")
+        assert not feed.changed()
+
+        save_elsewhere(1, details="New details")
+        assert feed.changed()
+        with store_lock("todos.json"):
+            changes = feed.poll()
+        assert [(after.title, after.details, after.version) for _, after in changes] == [
+            ("Task 2", "New details", 1)
+        ]
+        assert not feed.changed()
+        assert feed.poll() == []
+
+    def test_unchanged_details_are_not_loaded(self, todo_store):
+        """Test items whose details were kept come back without them."""
+        todo_store(make_todos(1))
+        feed = ChangeFeed("todos.json")
+        save_elsewhere(0)
+        (_, after), = feed.poll()
+        assert (after.status, after.details) == (Status.COMPLETED, None)
+
+    def test_replaced_store_needs_full_load(self, todo_store):
+        """Test a save of the whole list cannot be followed."""
+        todo_store(make_todos(2))
+        feed = ChangeFeed("todos.json")
+        todo_store(make_todos(3))
+        assert feed.poll() is None
+
+    def test_unlogged_write_needs_full_load(self, todo_store):
+        """Test a store written by a program without the log is noticed."""
+        todo_store(make_todos(2))
+        feed = ChangeFeed("todos.json")
+        save_elsewhere(0, title="Renamed")
+        with open("todos.json", "a") as f:
+            f.write("\n")
+        assert feed.poll() is None
+
+    def test_trimmed_log_needs_full_load(self, todo_store, monkeypatch):
+        """Test a feed behind a trimmed log loads the store again."""
+        monkeypatch.setattr(changelog, "MAX_LOG_BYTES", 100)
+        todo_store(make_todos(2))
+        feed = ChangeFeed("todos.json")
+        save_elsewhere(0, title="Renamed")
+        save_elsewhere(1)
+        assert feed.poll() is None
+
+
+class TestIncrementalRefresh:
+    """Tests for sessions applying the changes of other sessions."""
+
+    def test_index_applies_changes_of_other_sessions(self, todo_store):
+        """Test an index is updated from the log instead of rebuilt."""
+        todo_store(make_todos(2))
+        cache = IndexCache()
+        loads = []
+
+        def loader(filename):
+            loads.append(filename)
+            return load_todos_for_index(filename)
+
+        index = cache.get(IdPrefixIndex, "todos.json", loader)
+        todo_id = load_todos()[1].id
+        save_elsewhere(1, title="Renamed")
+
+        assert cache.get(IdPrefixIndex, "todos.json", loader) is index
+        assert index.find("alice", todo_id[:8])[0].title == "Renamed"
+        assert len(loads) == 1
+
+    def test_manager_replaces_only_changed_items(self, todo_store):
+        """Test the manager keeps its items and swaps the changed one."""
+        todo_store(make_todos(3))
+        loads = []
+
+        def load(filename):
+            loads.append(filename)
+            return load_todos_for_index(filename)
+
+        manager = TodoManager("todos.json", load, save_todos, append_todos)
+        assert len(manager.todos()) == 3
+        save_elsewhere(2)
+        append_todos(make_todos(1, owner="bob"), "todos.json")
+
+        todos = manager.todos()
+        assert [todo.status for todo in todos] == [Status.PENDING, Status.PENDING, Status.COMPLETED, Status.PENDING]
+        assert todos[3].owner == "bob"
+        assert len(loads) == 1
+
+    def test_own_writes_do_not_reload(self, todo_store):
+        """Test the manager's own saves are not read back."""
+        todo_store(make_todos(2))
+        loads = []
+
+        def load(filename):
+            loads.append(filename)
+            return load_todos_for_index(filename)
+
+        manager = TodoManager("todos.json", load, save_todos, append_todos)
+        manager.commit([complete_todo(manager.todos()[0])])
+        manager.create("alice", "New task")
+        assert len(manager.todos()) == 3
+        assert len(loads) == 1
+
+    def test_server_sees_other_sessions(self, todo_store):
+        """Test the server refreshes items changed by another session."""
+        todo_store(make_todos(2))
+        service = TodoService()
+        assert [item["status"] for item in service.list("alice")] == ["PENDING", "PENDING"]
+        save_elsewhere(0, title="Renamed")
+        append_todos(make_todos(1), "todos.json")
+
+        assert [item["title"] for item in service.list("alice")] == ["Renamed", "Task 2", "Task 1"]
+        assert service.complete("alice", service.list("alice")[0]["id"])["changed"]
+        assert load_todos()[0].status == Status.COMPLETED
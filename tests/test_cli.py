@@ -0,0 +1,147 @@
+"""Tests for the non-interactive subcommand CLI."""
+
+import pytest
+import json
+from unittest.mock import patch
+from models import TodoItem, Priority, Status
+from main import save_users, load_todos
+from cli import main as cli_main
+from operations import create_todo, edit_todo, complete_todo, parse_priority
+
+AUTH = ["--user", "alice", "--password", "secret"]
+
+
+@pytest.fixture
+def cli_store(todo_store):
+    """Temporary store with one registered user, alice."""
+    save_users([{"username": "alice", "password": "secret"}])
+    return todo_store
+
+
+def json_lines(output):
+    """Parse captured output into a list of JSON documents."""
+    return [json.loads(line) for line in output.splitlines() if line.strip()]
+
+
+class TestOperations:
+    """Tests for the shared business rules."""
+
+    def test_create_todo_appends_and_returns_change(self):
+        """Test a created item is appended and returned as a new change."""
+        todos = []
+        before, todo = create_todo(todos, "alice", "  Task  ", " Notes ", Priority.HIGH)
+        assert before is None
+        assert todos == [todo]
+        assert (todo.title, todo.details, todo.priority) == ("Task", "Notes", Priority.HIGH)
+
+    def test_create_todo_rejects_empty_title(self):
+        """Test an empty title raises ValueError."""
+        with pytest.raises(ValueError):
+            create_todo([], "alice", "   ")
+
+    def test_edit_todo_ignores_empty_values(self):
+        """Test empty fields keep their previous values."""
+        todo = TodoItem(title="Task", details="Notes", priority=Priority.LOW, owner="alice")
+        before, after = edit_todo(todo, title="", details="New notes")
+        assert before.details == "Notes"
+        assert (after.title, after.details, after.priority) == ("Task", "New notes", Priority.LOW)
+
+    def test_complete_todo_only_once(self):
+        """Test completing an already completed item is not a change."""
+        todo = TodoItem(title="Task", details="", priority=Priority.MID, owner="alice")
+        before, after = complete_todo(todo)
+        assert before.status == Status.PENDING
+        assert after.status == Status.COMPLETED
+        assert complete_todo(todo) is None
+
+    def test_parse_priority(self):
+        """Test priority names are parsed case-insensitively."""
+        assert parse_priority(" high ") == Priority.HIGH
+        with pytest.raises(ValueError):
+            parse_priority("urgent")
+
+
+class TestCli:
+    """Tests for the CLI subcommands."""
+
+    def test_rejects_bad_password(self, cli_store, capsys):
+        """Test commands are refused without valid credentials."""
+        assert cli_main(["--user", "alice", "--password", "wrong", "list"]) == 1
+        assert "error" in json.loads(capsys.readouterr().err)
+
+    def test_password_from_environment(self, cli_store, capsys, monkeypatch):
+        """Test the password can be given in TODO_PASSWORD."""
+        monkeypatch.setenv("TODO_PASSWORD", "secret")
+        assert cli_main(["--user", "alice", "list"]) == 0
+
+    def test_add_and_list(self, cli_store, capsys):
+        """Test added items are saved and listed as JSON lines."""
+        assert cli_main(AUTH + ["add", "Buy milk", "--priority", "high", "--details", "2 litres"]) == 0
+        added = json.loads(capsys.readouterr().out)
+        assert added["title"] == "Buy milk"
+        assert added["priority"] == "HIGH"
+
+        assert cli_main(AUTH + ["list"]) == 0
+        listed = json_lines(capsys.readouterr().out)
+        assert [item["id"] for item in listed] == [added["id"]]
+        assert "details" not in listed[0]
+
+    def test_add_appends_without_loading(self, cli_store, capsys):
+        """Test add writes the new record without reading the existing ones."""
+        cli_store([TodoItem(title="Existing", details="", priority=Priority.MID, owner="alice")])
+        with patch("cli.load_todos", side_effect=AssertionError("loaded the store")), \
+                patch("cli.save_todos", side_effect=AssertionError("rewrote the store")):
+            assert cli_main(AUTH + ["add", "Buy milk"]) == 0
+        assert [todo.title for todo in load_todos()] == ["Existing", "Buy milk"]
+
+    def test_list_filters_by_owner_and_status(self, cli_store, capsys):
+        """Test list shows only the user's items with the given status."""
+        done = TodoItem(title="Done", details="", priority=Priority.MID, owner="alice")
+        done.status = Status.COMPLETED
+        cli_store([
+            TodoItem(title="Open", details="", priority=Priority.MID, owner="alice"),
+            done,
+            TodoItem(title="Bob's", details="", priority=Priority.MID, owner="bob"),
+        ])
+        assert cli_main(AUTH + ["list", "--status", "pending"]) == 0
+        assert [item["title"] for item in json_lines(capsys.readouterr().out)] == ["Open"]
+
+    def test_show_by_prefix_includes_details(self, cli_store, capsys):
+        """Test show finds an item by id prefix and prints its details."""
+        todo = TodoItem(title="Task", details="Notes", priority=Priority.MID, owner="alice")
+        cli_store([todo])
+        assert cli_main(AUTH + ["show", "#" + todo.id[:6]]) == 0
+        assert json.loads(capsys.readouterr().out)["details"] == "Notes"
+
+    def test_show_other_users_item_fails(self, cli_store, capsys):
+        """Test another user's item cannot be found."""
+        todo = TodoItem(title="Task", details="", priority=Priority.MID, owner="bob")
+        cli_store([todo])
+        assert cli_main(AUTH + ["show", todo.id]) == 1
+        assert "No to-do item" in json.loads(capsys.readouterr().err)["error"]
+
+    def test_edit_updates_item(self, cli_store, capsys):
+        """Test edit changes the given fields and keeps the details."""
+        todo = TodoItem(title="Task", details="Notes", priority=Priority.MID, owner="alice")
+        cli_store([todo])
+        assert cli_main(AUTH + ["edit", todo.id[:8], "--title", "Renamed", "--priority", "low"]) == 0
+
+        saved = load_todos()[0]
+        assert (saved.title, saved.priority, saved.details) == ("Renamed", Priority.LOW, "Notes")
+
+    def test_edit_without_changes_fails(self, cli_store, capsys):
+        """Test edit requires at least one field."""
+        todo = TodoItem(title="Task", details="", priority=Priority.MID, owner="alice")
+        cli_store([todo])
+        assert cli_main(AUTH + ["edit", todo.id]) == 1
+
+    def test_complete_marks_item(self, cli_store, capsys):
+        """Test complete saves the new status and reports whether it changed."""
+        todo = TodoItem(title="Task", details="", priority=Priority.MID, owner="alice")
+        cli_store([todo])
+        assert cli_main(AUTH + ["complete", todo.id]) == 0
+        assert json.loads(capsys.readouterr().out)["changed"] is True
+        assert load_todos()[0].status == Status.COMPLETED
+
+        assert cli_main(AUTH + ["complete", todo.id]) == 0
+        assert json.loads(capsys.readouterr().out)["changed"] is False
@@ -0,0 +1,164 @@
+"""Tests for the materialized per-owner counters."""
+
+import pytest
+import json
+import os
+import tempfile
+from dataclasses import replace
+from unittest.mock import patch
+from models import TodoItem, Priority, Status
+from counters import apply_change, build_counters, counters_path, empty_counts, load_counters
+import main
+from locking import holds_lock
+from main import save_todos, load_todos, load_todo_summary, format_todo_summary
+
+
+def make_todo(owner="alice", priority=Priority.HIGH, status=Status.PENDING):
+    """Build a todo item for counter tests."""
+    return TodoItem(title="Task", details="", priority=priority, owner=owner, status=status)
+
+
+class TestCounterUpdates:
+    """Tests for counting and incremental counter changes."""
+
+    def test_build_counters(self):
+        """Test counters are computed per owner."""
+        owners = build_counters([
+            make_todo("alice", Priority.HIGH),
+            make_todo("alice", Priority.LOW, Status.COMPLETED),
+            make_todo("bob", Priority.MID),
+        ])
+        assert owners["alice"] == {"total": 2, "pending": 1, "completed": 1, "HIGH": 1, "MID": 0, "LOW": 1}
+        assert owners["bob"]["total"] == 1
+
+    def test_apply_change_create(self):
+        """Test a created item is added to the counters."""
+        owners = {}
+        apply_change(owners, None, make_todo())
+        assert owners["alice"]["total"] == 1
+        assert owners["alice"]["pending"] == 1
+
+    def test_apply_change_complete(self):
+        """Test completing an item moves it from pending to completed."""
+        todo = make_todo()
+        owners = build_counters([todo])
+        before = replace(todo)
+        todo.status = Status.COMPLETED
+        apply_change(owners, before, todo)
+        assert owners["alice"]["pending"] == 0
+        assert owners["alice"]["completed"] == 1
+        assert owners["alice"]["total"] == 1
+
+    def test_apply_change_priority_edit(self):
+        """Test editing priority moves the item between priority counts."""
+        todo = make_todo(priority=Priority.HIGH)
+        owners = build_counters([todo])
+        before = replace(todo)
+        todo.priority = Priority.LOW
+        apply_change(owners, before, todo)
+        assert owners["alice"]["HIGH"] == 0
+        assert owners["alice"]["LOW"] == 1
+
+
+class TestPersistedCounters:
+    """Tests for counters persisted alongside the store."""
+
+    def test_save_todos_writes_counters(self):
+        """Test saving the store also writes matching counters."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            todos_file = os.path.join(tmpdir, "todos.json")
+            save_todos([make_todo(), make_todo("bob")], todos_file)
+            owners = load_counters(todos_file)
+            assert owners["alice"]["total"] == 1
+            assert owners["bob"]["total"] == 1
+
+    def test_save_todos_applies_changes_incrementally(self):
+        """Test a save with changes updates the stored counters."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            todos_file = os.path.join(tmpdir, "todos.json")
+            todos = [make_todo()]
+            save_todos(todos, todos_file)
+
+            new_todo = make_todo(priority=Priority.LOW)
+            todos.append(new_todo)
+            save_todos(todos, todos_file, changes=[(None, new_todo)])
+
+            assert load_counters(todos_file)["alice"]["LOW"] == 1
+            assert load_counters(todos_file)["alice"]["total"] == 2
+
+    def test_stale_counters_are_ignored(self):
+        """Test counters are not trusted after the store changes externally."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            todos_file = os.path.join(tmpdir, "todos.json")
+            save_todos([make_todo()], todos_file)
+            with open(todos_file, 'w') as f:
+                json.dump([], f)
+            assert load_counters(todos_file) is None
+
+    def test_stale_counters_are_rebuilt_on_incremental_save(self):
+        """Test changes are not applied on top of stale counters."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            todos_file = os.path.join(tmpdir, "todos.json")
+            save_todos([make_todo()], todos_file)
+            with open(counters_path(todos_file), 'w') as f:
+                json.dump({"store": None, "owners": {"alice": empty_counts()}}, f)
+
+            todos = load_todos(todos_file)
+            new_todo = make_todo()
+            todos.append(new_todo)
+            save_todos(todos, todos_file, changes=[(None, new_todo)])
+            assert load_counters(todos_file)["alice"]["total"] == 2
+
+    def test_load_todo_summary_rebuilds_missing_counters(self):
+        """Test the summary is rebuilt once when counters are missing."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            todos_file = os.path.join(tmpdir, "todos.json")
+            save_todos([make_todo(status=Status.COMPLETED)], todos_file)
+            os.remove(counters_path(todos_file))
+
+            counts = load_todo_summary("alice", todos_file)
+            assert counts["completed"] == 1
+            assert os.path.exists(counters_path(todos_file))
+
+    def test_cut_off_counters_are_rebuilt(self):
+        """Test an empty counters file is treated as missing by readers and saves."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            todos_file = os.path.join(tmpdir, "todos.json")
+            save_todos([make_todo()], todos_file)
+            open(counters_path(todos_file), 'w').close()
+            assert load_todo_summary("alice", todos_file)["total"] == 1
+
+            open(counters_path(todos_file), 'w').close()
+            todos = load_todos(todos_file)
+            new_todo = make_todo()
+            save_todos(todos + [new_todo], todos_file, changes=[(None, new_todo)])
+            assert load_counters(todos_file)["alice"]["total"] == 2
+
+    def test_summary_rebuild_holds_the_store_lock(self):
+        """Test no save can land between loading the items and writing the counters."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            todos_file = os.path.join(tmpdir, "todos.json")
+            save_todos([make_todo()], todos_file)
+            os.remove(counters_path(todos_file))
+            locked = []
+
+            def load(filename, **kwargs):
+                locked.append(holds_lock(filename))
+                return load_todos(filename, **kwargs)
+
+            with patch.object(main, "load_todos", side_effect=load):
+                load_todo_summary("alice", todos_file)
+            assert locked == [True]
+
+    def test_load_todo_summary_unknown_user(self):
+        """Test a user without items gets zero counts."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            todos_file = os.path.join(tmpdir, "todos.json")
+            assert load_todo_summary("nobody", todos_file) == empty_counts()
+
+    def test_format_todo_summary(self):
+        """Test the summary line shows every counter."""
+        line = format_todo_summary({"total": 3, "pending": 2, "completed": 1, "HIGH": 1, "MID": 1, "LOW": 1})
+        assert "3 items" in line
+        assert "2 pending" in line
+        assert "1 completed" in line
@@ -0,0 +1,187 @@
+"""Tests for the content-addressed details blob storage."""
+
+import pytest
+import json
+import os
+import tempfile
+from models import TodoItem, Priority
+from details_store import DetailsStore, details_index_path, details_path, details_digest
+from main import append_todos, compact_details, load_todos, save_todo_changes, save_todos, load_todo_details
+from operations import edit_todo
+
+
+class TestDetailsStore:
+    """Tests for the DetailsStore blob file."""
+
+    def test_details_path_is_next_to_todos_file(self):
+        """Test the blob file lives next to the todos file."""
+        assert details_path(os.path.join("data", "todos.json")) == os.path.join("data", "todos.details")
+
+    def test_put_and_get_roundtrip(self):
+        """Test a stored text can be read back by reference."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with DetailsStore(os.path.join(tmpdir, "todos.details")) as store:
+                ref = store.put("Buy milk and eggs ✓")
+                assert store.get(ref) == "Buy milk and eggs ✓"
+                assert ref["sha256"] == details_digest("Buy milk and eggs ✓")
+
+    def test_identical_texts_are_stored_once(self):
+        """Test identical details share a single blob."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "todos.details")
+            with DetailsStore(path) as store:
+                first = store.put("Same text")
+                second = store.put("Same text")
+            assert first == second
+            assert os.path.getsize(path) == len("Same text")
+
+    def test_remembered_reference_is_reused(self):
+        """Test references from a previous session deduplicate new puts."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "todos.details")
+            with DetailsStore(path) as store:
+                ref = store.put("Long notes")
+            with DetailsStore(path) as store:
+                store.remember(ref)
+                assert store.put("Long notes") == ref
+            assert os.path.getsize(path) == len("Long notes")
+
+    def test_truncated_blob_raises(self):
+        """Test reading past the end of the blob file is reported."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with DetailsStore(os.path.join(tmpdir, "todos.details")) as store:
+                with pytest.raises(ValueError):
+                    store.get({"offset": 0, "length": 10, "sha256": "x"})
+
+
+class TestTodosDetailsSplit:
+    """Tests for keeping details out of the todos JSON file."""
+
+    def test_save_todos_moves_details_to_blob(self):
+        """Test saved records reference details instead of embedding them."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            todos_file = os.path.join(tmpdir, "todos.json")
+            todo = TodoItem(title="Task", details="Very long notes", priority=Priority.HIGH, owner="alice")
+            save_todos([todo], todos_file)
+
+            with open(todos_file, 'r') as f:
+                saved = json.load(f)
+            assert "details" not in saved[0]
+            assert saved[0]["details_ref"]["length"] == len("Very long notes")
+
+    def test_load_without_details_defers_text(self):
+        """Test list-view loads leave details unloaded until requested."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            todos_file = os.path.join(tmpdir, "todos.json")
+            save_todos([TodoItem(title="Task", details="Notes", priority=Priority.LOW, owner="alice")], todos_file)
+
+            todo = load_todos(todos_file, with_details=False)[0]
+            assert todo.details is None
+            assert load_todo_details(todo, todos_file) == "Notes"
+            assert todo.details == "Notes"
+
+    def test_saving_unloaded_details_keeps_reference(self):
+        """Test saving items loaded without details does not lose them."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            todos_file = os.path.join(tmpdir, "todos.json")
+            save_todos([TodoItem(title="Task", details="Notes", priority=Priority.LOW, owner="alice")], todos_file)
+
+            todos = load_todos(todos_file, with_details=False)
+            todos[0].title = "Renamed"
+            save_todos(todos, todos_file)
+
+            reloaded = load_todos(todos_file)
+            assert reloaded[0].title == "Renamed"
+            assert reloaded[0].details == "Notes"
+
+    def test_duplicate_details_share_blob(self):
+        """Test todos with identical details reference the same blob."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            todos_file = os.path.join(tmpdir, "todos.json")
+            todos = [
+                TodoItem(title=f"Task {i}", details="Shared notes", priority=Priority.MID, owner="alice")
+                for i in range(3)
+            ]
+            save_todos(todos, todos_file)
+
+            assert os.path.getsize(details_path(todos_file)) == len("Shared notes")
+            assert len({todo.details_ref["offset"] for todo in todos}) == 1
+
+    def test_appended_duplicate_details_share_blob(self, todo_store):
+        """Test appends reuse a text already in the blob file."""
+        append_todos([TodoItem(title="Milk", details="whole milk", priority=Priority.MID, owner="alice")])
+        append_todos([TodoItem(title="More milk", details="whole milk", priority=Priority.MID, owner="bob")])
+
+        assert os.path.getsize(details_path("todos.json")) == len("whole milk")
+        assert [todo.details for todo in load_todos()] == ["whole milk", "whole milk"]
+
+    def test_append_to_store_without_index_reuses_stored_text(self, todo_store):
+        """Test a blob file written before the index existed is still deduplicated."""
+        todo_store([TodoItem(title="Milk", details="whole milk", priority=Priority.MID, owner="alice")])
+        os.remove(details_index_path(details_path("todos.json")))
+        append_todos([TodoItem(title="More milk", details="whole milk", priority=Priority.MID, owner="bob")])
+
+        assert os.path.getsize(details_path("todos.json")) == len("whole milk")
+
+    def test_empty_details_need_no_blob(self):
+        """Test empty details are stored without a blob reference."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            todos_file = os.path.join(tmpdir, "todos.json")
+            save_todos([TodoItem(title="Task", details="", priority=Priority.MID, owner="alice")], todos_file)
+
+            loaded = load_todos(todos_file, with_details=False)
+            assert loaded[0].details == ""
+            assert not os.path.exists(details_path(todos_file))
+
+    def test_inline_details_are_migrated_on_save(self):
+        """Test legacy records with inline details still load and migrate."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            todos_file = os.path.join(tmpdir, "todos.json")
+            legacy = [{
+                "id": "uuid-1",
+                "title": "Legacy",
+                "details": "Inline notes",
+                "priority": "HIGH",
+                "status": "PENDING",
+                "owner": "alice",
+                "created_at": "2025-01-01T10:00:00",
+                "updated_at": "2025-01-01T10:00:00"
+            }]
+            with open(todos_file, 'w') as f:
+                json.dump(legacy, f)
+
+            todos = load_todos(todos_file, with_details=False)
+            assert todos[0].details == "Inline notes"
+            save_todos(todos, todos_file)
+
+            with open(todos_file, 'r') as f:
+                saved = json.load(f)
+            assert "details" not in saved[0]
+            assert load_todos(todos_file)[0].details == "Inline notes"
+
+
+class TestCompactDetails:
+    """Tests for dropping unreferenced texts from the blob file."""
+
+    def test_replaced_texts_are_dropped(self, todo_store):
+        """Test only the texts still referenced are kept."""
+        todos = [TodoItem(title=f"Task {i}", details=f"Notes {i}", priority=Priority.MID, owner="alice")
+                 for i in range(2)]
+        todo_store(todos)
+        save_todo_changes([edit_todo(todos[0], details="Newer notes")])
+
+        assert compact_details() == (len("Notes 0Notes 1Newer notes"), len("Notes 1Newer notes"))
+        assert [todo.details for todo in load_todos()] == ["Newer notes", "Notes 1"]
+        append_todos([TodoItem(title="Copy", details="Notes 1", priority=Priority.MID, owner="alice")])
+        assert os.path.getsize(details_path("todos.json")) == len("Notes 1Newer notes")
+
+    def test_unloaded_details_survive_compaction(self, todo_store):
+        """Test a change made from items loaded before a compaction keeps its details."""
+        todo_store([TodoItem(title=f"Task {i}", details=f"Notes {i}", priority=Priority.MID, owner="alice")
+                    for i in range(2)])
+        save_todo_changes([edit_todo(load_todos()[0], details="Replaced")])
+        todos = load_todos(with_details=False)
+        compact_details()
+        save_todo_changes([edit_todo(todos[1], title="Renamed")])
+
+        assert [(todo.title, todo.details) for todo in load_todos()] == [("Task 0", "Replaced"), ("Renamed", "Notes 1")]
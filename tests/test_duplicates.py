@@ -0,0 +1,99 @@
+"""Tests for the MinHash near-duplicate sweep."""
+
+import pytest
+import random
+from models import TodoItem, Priority
+
+np = pytest.importorskip("numpy")
+
+import duplicates
+from duplicates import MinHasher, find_duplicates, format_report, shingles, sweep
+
+
+def make_record(title, owner="alice", todo_id=None):
+    """Build a raw todo record as stored in todos.json."""
+    return {"id": todo_id or title, "title": title, "owner": owner, "status": "PENDING"}
+
+
+class TestMinHash:
+    """Tests for shingles and signatures."""
+
+    def test_shingles_ignore_case_and_punctuation(self):
+        """Test texts differing only in case and punctuation share every shingle."""
+        assert shingles("Buy milk, eggs!") == shingles("buy   MILK eggs")
+        assert shingles("") == set()
+        assert len(shingles("ab")) == 1
+
+    def test_signature_agreement_estimates_jaccard(self):
+        """Test the fraction of equal signature positions approximates Jaccard similarity."""
+        a = shingles("the quick brown fox jumps over the lazy dog")
+        b = shingles("the quick brown fox jumped over a lazy dog")
+        signatures = MinHasher(512).signatures([a, b])
+        assert signatures.shape == (2, 512)
+        estimate = np.mean(signatures[0] == signatures[1])
+        assert estimate == pytest.approx(len(a & b) / len(a | b), abs=0.08)
+
+    def test_chunking_does_not_change_signatures(self, monkeypatch):
+        """Test sets split across shingle chunks get the same signatures."""
+        sets = [shingles(f"item {i} " * (i + 1)) for i in range(20)]
+        expected = MinHasher().signatures(sets)
+        monkeypatch.setattr(duplicates, "SIGNATURE_CHUNK", 7)
+        signatures = MinHasher().signatures(sets)
+        assert signatures.dtype == np.uint32
+        assert np.array_equal(signatures, expected)
+
+
+class TestFindDuplicates:
+    """Tests for grouping near-duplicate items."""
+
+    def test_groups_near_duplicates_per_owner(self):
+        """Test near-identical items are grouped and owners are kept apart."""
+        records = [
+            make_record("Renew the car insurance policy", todo_id="1"),
+            make_record("Water the plants", todo_id="2"),
+            make_record("renew the car insurance policy!", todo_id="3"),
+            make_record("Renew the car insurance policy", owner="bob", todo_id="4"),
+            make_record("Renew the car insurance policies", todo_id="5"),
+        ]
+        groups = find_duplicates(records, [record["title"] for record in records])
+        assert len(groups) == 1
+        assert groups[0].owner == "alice"
+        assert [record["id"] for record in groups[0].records] == ["1", "3", "5"]
+        assert 0.8 <= groups[0].similarity <= 1.0
+
+    def test_unrelated_items_are_not_grouped(self):
+        """Test a store of distinct items reports nothing."""
+        rng = random.Random(5)
+        words = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel"]
+        titles = {" ".join(rng.sample(words, 4)) for _ in range(200)}
+        records = [make_record(title) for title in titles]
+        for group in find_duplicates(records, [record["title"] for record in records]):
+            assert group.similarity >= 0.8
+
+    def test_empty_texts_are_skipped(self):
+        """Test items without words are never grouped."""
+        records = [make_record("!!", todo_id="1"), make_record("??", todo_id="2")]
+        assert find_duplicates(records, ["!!", "??"]) == []
+
+
+class TestSweep:
+    """Tests for sweeping a todos file."""
+
+    def test_sweep_reads_details(self, todo_store):
+        """Test details take part in the comparison and the report groups by owner."""
+        todo_store([
+            TodoItem(title="Call", details="ask the plumber about the leaking kitchen tap", priority=Priority.MID, owner="alice"),
+            TodoItem(title="Call", details="ask the plumber about the leaking kitchen tap", priority=Priority.LOW, owner="alice"),
+            TodoItem(title="Call", details="book a table for dinner on friday", priority=Priority.MID, owner="alice"),
+        ])
+        groups = sweep("todos.json")
+        assert len(groups) == 1
+        assert len(groups[0].records) == 2
+        report = format_report(groups)
+        assert "alice (1 group):" in report
+        assert "Near-Duplicate Items (1 group)" in report
+
+    def test_sweep_missing_file(self, todo_store):
+        """Test a missing store gives an empty report."""
+        assert sweep("missing.json") == []
+        assert "No near-duplicates found." in format_report([])
@@ -0,0 +1,81 @@
+"""Tests for streaming export."""
+
+import pytest
+import csv
+import io
+import json
+from models import TodoItem, Priority, Status
+from main import save_todos, save_users
+from exporter import export_lines, export_matcher, write_export
+from cli import main as cli_main
+
+
+def make_store(todos_file):
+    """Save a store with items of two users."""
+    done = TodoItem(title="Done", details="", priority=Priority.LOW, owner="alice", created_at="2024-02-01T00:00:00")
+    done.status = Status.COMPLETED
+    save_todos([
+        TodoItem(title="Task, \"quoted\"", details="Line 1\nLine 2", priority=Priority.HIGH, owner="alice",
+                 created_at="2024-01-01T00:00:00"),
+        TodoItem(title="Bob's", details="Secret", priority=Priority.HIGH, owner="bob"),
+        done,
+    ], todos_file)
+
+
+class TestExportLines:
+    """Tests for the export pipeline."""
+
+    def test_jsonl_only_contains_owner_items_with_details(self, tmp_path):
+        """Test another user's items are never exported."""
+        todos_file = str(tmp_path / "todos.json")
+        make_store(todos_file)
+        rows = [json.loads(line) for line in export_lines(todos_file, export_matcher("alice"))]
+        assert [row["title"] for row in rows] == ['Task, "quoted"', "Done"]
+        assert rows[0]["details"] == "Line 1\nLine 2"
+        assert rows[1]["details"] == ""
+        assert "details_ref" not in rows[0]
+
+    def test_csv_round_trips(self, tmp_path):
+        """Test CSV output parses back to the same values."""
+        todos_file = str(tmp_path / "todos.json")
+        make_store(todos_file)
+        out = io.StringIO()
+        assert write_export(export_lines(todos_file, export_matcher("alice"), "csv"), out) == 3
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+        assert [(row["title"], row["details"]) for row in rows] == [('Task, "quoted"', "Line 1\nLine 2"), ("Done", "")]
+
+    def test_csv_header_without_rows(self, tmp_path):
+        """Test an empty export still has a CSV header."""
+        todos_file = str(tmp_path / "todos.json")
+        make_store(todos_file)
+        lines = list(export_lines(todos_file, export_matcher("carol"), "csv", with_details=False))
+        assert lines == ["id,title,priority,status,owner,created_at,updated_at\n"]
+
+    def test_filters(self, tmp_path):
+        """Test status, priority and creation-time filters."""
+        todos_file = str(tmp_path / "todos.json")
+        make_store(todos_file)
+
+        def titles(**filters):
+            lines = export_lines(todos_file, export_matcher("alice", **filters), with_details=False)
+            return [json.loads(line)["title"] for line in lines]
+
+        assert titles(status=Status.COMPLETED) == ["Done"]
+        assert titles(priority=Priority.HIGH) == ['Task, "quoted"']
+        assert titles(since="2024-01-15T00:00:00") == ["Done"]
+        assert titles(until="2024-01-15T00:00:00") == ['Task, "quoted"']
+
+
+class TestExportCommand:
+    """Tests for the export subcommand."""
+
+    def test_export_to_csv_file(self, todo_store, tmp_path, capsys):
+        """Test the format follows the output file name."""
+        save_users([{"username": "alice", "password": "secret"}])
+        make_store("todos.json")
+        output = tmp_path / "out.csv"
+        assert cli_main([
+            "--user", "alice", "--password", "secret", "export", "--status", "pending", "-o", str(output),
+        ]) == 0
+        assert json.loads(capsys.readouterr().err) == {"exported": 1}
+        assert [row["priority"] for row in csv.DictReader(io.StringIO(output.read_text()))] == ["HIGH"]
@@ -0,0 +1,169 @@
+"""Tests for the asyncio HTTP/JSON API."""
+
+import asyncio
+import base64
+import json
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from models import TodoItem, Priority, Status
+from main import save_users, load_todos, load_login_history
+from http_api import AsyncTodoService, start
+from server import OPERATIONS
+
+
+def request(method, path, body=None, user="alice", password="secret", close=False):
+    """Encode an HTTP request."""
+    data = json.dumps(body).encode("utf-8") if body is not None else b""
+    headers = [f"{method} {path} HTTP/1.1", "Host: localhost", f"Content-Length: {len(data)}"]
+    if user is not None:
+        token = base64.b64encode(f"{user}:{password}".encode()).decode()
+        headers.append(f"Authorization: Basic {token}")
+    if close:
+        headers.append("Connection: close")
+    return ("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + data
+
+
+async def read_response(reader):
+    """Read one response and return its status and decoded body."""
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line == b"\r\n":
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+def exchange(*requests, connections=1):
+    """Serve the store, send the requests pipelined on each connection and return the responses."""
+
+    async def run():
+        with ThreadPoolExecutor(1) as executor:
+            server = await start(AsyncTodoService(executor), "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+
+            async def client():
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(b"".join(requests))
+                responses = [await read_response(reader) for _ in requests]
+                writer.close()
+                return responses
+
+            async with server:
+                results = await asyncio.gather(*(client() for _ in range(connections)))
+        return results[0] if connections == 1 else results
+
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def api_store(todo_store):
+    """Store with one user and one item."""
+    save_users([{"username": "alice", "password": "secret"}])
+    todo_store([TodoItem(title="Existing", details="old notes", priority=Priority.LOW, owner="alice")])
+    return load_todos()[0]
+
+
+class TestEndpoints:
+    """Tests for the HTTP endpoints."""
+
+    def test_pipelined_operations(self, api_store):
+        """Test pipelined requests are answered in order and saved."""
+        short = api_store.id[:6]
+        responses = exchange(
+            request("POST", "/todos", {"title": "Buy milk", "priority": "high"}),
+            request("GET", "/todos?status=pending"),
+            request("GET", f"/todos/{short}"),
+            request("PATCH", f"/todos/{short}", {"title": "Renamed"}),
+            request("POST", f"/todos/{short}/complete", close=True),
+        )
+        assert [status for status, _ in responses] == [201, 200, 200, 200, 200]
+        assert responses[0][1]["priority"] == "HIGH"
+        assert [item["title"] for item in responses[1][1]] == ["Existing", "Buy milk"]
+        assert responses[2][1]["details"] == "old notes"
+        assert responses[4][1]["changed"] is True
+        todos = load_todos()
+        assert [(t.title, t.status) for t in todos] == [("Renamed", Status.COMPLETED), ("Buy milk", Status.PENDING)]
+        assert todos[0].details == "old notes"
+
+    def test_errors(self, api_store):
+        """Test error responses carry a status and a JSON message."""
+        responses = exchange(
+            request("GET", "/todos", user=None),
+            request("GET", "/todos", password="wrong"),
+            request("GET", "/nothing"),
+            request("DELETE", "/todos"),
+            request("GET", "/todos/ffff"),
+            request("POST", "/todos", {"title": " "}),
+            request("POST", "/todos", {"title": "x", "colour": "red"}),
+            request("POST", "/todos", ["not", "an", "object"]),
+        )
+        assert [status for status, _ in responses] == [401, 401, 404, 405, 404, 400, 400, 400]
+        assert all("error" in body for _, body in responses)
+
+    def test_failed_logins_are_logged(self, api_store):
+        """Test wrong credentials are recorded but per-request logins are not."""
+        exchange(request("GET", "/todos"), request("GET", "/todos", password="wrong"))
+        assert [(record["username"], record["success"]) for record in load_login_history()] == [("alice", False)]
+        assert len(load_todos()) == 1
+
+    def test_null_and_non_string_fields(self, api_store):
+        """Test null fields count as missing and other non-strings get 400."""
+        short = api_store.id[:6]
+        responses = exchange(
+            request("POST", "/todos", {"title": None}),
+            request("POST", "/todos", {"title": "Buy milk", "details": None}),
+            request("PATCH", f"/todos/{short}", {"title": 5}),
+            request("GET", "/todos?status=pending"),
+        )
+        assert [status for status, _ in responses] == [400, 201, 400, 200]
+        assert responses[1][1]["details"] == ""
+        assert responses[2][1] == {"error": "'title' must be a string."}
+        assert [todo.title for todo in load_todos()] == ["Existing", "Buy milk"]
+
+    def test_unexpected_errors_get_a_reply(self, api_store, monkeypatch):
+        """Test a failing operation answers 500 and keeps the connection."""
+        def broken(service, username, status=None, priority=None):
+            raise AttributeError("bug")
+
+        monkeypatch.setitem(OPERATIONS, "list", broken)
+        responses = exchange(request("GET", "/todos"), request("POST", "/todos", {"title": "Task"}))
+        assert [status for status, _ in responses] == [500, 201]
+        assert responses[0][1] == {"error": "Internal server error."}
+
+    def test_concurrent_creates_are_all_saved(self, api_store):
+        """Test changes made while a write is running are written by the next one."""
+        creates = [request("POST", "/todos", {"title": f"Task {i}"}) for i in range(10)]
+        results = exchange(*creates, connections=8)
+        assert all(status == 201 for responses in results for status, _ in responses)
+        assert len(load_todos()) == 81
+        assert len({todo.id for todo in load_todos()}) == 81
+
+    def test_edits_and_creates_mixed(self, api_store):
+        """Test a rewrite and appends in flight together keep every change."""
+        short = api_store.id[:6]
+        requests = []
+        for i in range(20):
+            requests.append(request("PATCH", f"/todos/{short}", {"title": f"Title {i}"}))
+            requests.append(request("POST", "/todos", {"title": f"Task {i}"}))
+        exchange(*requests, connections=3)
+        todos = load_todos()
+        assert len(todos) == 61
+        assert todos[0].title == "Title 19"
+
+    def test_repeated_details_edits_do_not_conflict(self, api_store):
+        """Test the held item follows the version and details each write saved."""
+
+        async def run():
+            with ThreadPoolExecutor(1) as executor:
+                service = AsyncTodoService(executor)
+                for number in range(1, 4):
+                    service.edit("alice", api_store.id[:6], details=f"d{number}")
+                    await service.flush()
+
+        asyncio.run(run())
+        saved = load_todos()[0]
+        assert (saved.details, saved.version) == ("d3", 3)
@@ -0,0 +1,122 @@
+"""Tests for addressing items by short id prefix."""
+
+import pytest
+from unittest.mock import patch
+from models import TodoItem, Priority, Status
+from id_index import IdPrefixIndex, short_id
+from main import handle_view_todo_details, handle_mark_todo_completed, load_todos
+
+
+def make_todo(todo_id, owner="alice", status=Status.PENDING, title=None):
+    """Build a todo item with a fixed id."""
+    return TodoItem(
+        id=todo_id,
+        title=title or f"Task {todo_id}",
+        details=f"Details {todo_id}",
+        priority=Priority.MID,
+        owner=owner,
+        status=status,
+    )
+
+
+@pytest.fixture
+def todos():
+    """Items with ids sharing prefixes."""
+    return [
+        make_todo("abc12345-0000"),
+        make_todo("abc19999-0000"),
+        make_todo("def00000-0000"),
+        make_todo("abd00000-0000", owner="bob"),
+    ]
+
+
+class TestIdPrefixIndex:
+    """Tests for IdPrefixIndex lookups."""
+
+    def test_unique_prefix(self, todos):
+        """Test a unique prefix finds one item."""
+        index = IdPrefixIndex()
+        index.rebuild(todos)
+        assert [todo.id for todo in index.find("alice", "def")] == ["def00000-0000"]
+
+    def test_ambiguous_prefix(self, todos):
+        """Test an ambiguous prefix returns more than one match."""
+        index = IdPrefixIndex()
+        index.rebuild(todos)
+        assert len(index.find("alice", "abc1")) == 2
+        assert [todo.id for todo in index.find("alice", "abc12")] == ["abc12345-0000"]
+
+    def test_prefix_is_scoped_to_owner(self, todos):
+        """Test other users' items are never matched."""
+        index = IdPrefixIndex()
+        index.rebuild(todos)
+        assert index.find("alice", "abd") == []
+        assert len(index.find("bob", "abd")) == 1
+
+    def test_find_returns_copies(self, todos):
+        """Test callers cannot modify the indexed items."""
+        index = IdPrefixIndex()
+        index.rebuild(todos)
+        index.find("alice", "def")[0].title = "Changed"
+        assert index.find("alice", "def")[0].title == "Task def00000-0000"
+
+    def test_apply_create_and_remove(self, todos):
+        """Test the index follows created and removed items."""
+        index = IdPrefixIndex()
+        index.rebuild(todos)
+        new_todo = make_todo("fff00000-0000")
+        index.apply(None, new_todo)
+        assert len(index.find("alice", "fff")) == 1
+        index.apply(new_todo, None)
+        assert index.find("alice", "fff") == []
+
+    def test_short_id(self):
+        """Test the short id is the first eight characters."""
+        assert short_id(make_todo("0123456789abcdef")) == "01234567"
+
+
+class TestShortIdSelection:
+    """Tests for #id selection in the item screens."""
+
+    def test_view_details_by_short_id(self, todos, todo_store):
+        """Test an item can be opened by its id prefix."""
+        todo_store(todos)
+        with patch('builtins.print') as mock_print:
+            with patch('builtins.input', side_effect=['#DEF', '0', '0']):
+                handle_view_todo_details("alice")
+        output = ''.join(str(call) for call in mock_print.call_args_list)
+        assert "Details def00000-0000" in output
+
+    def test_ambiguous_short_id_is_reported(self, todos, todo_store):
+        """Test an ambiguous prefix asks for more characters."""
+        todo_store(todos)
+        with patch('builtins.print') as mock_print:
+            with patch('builtins.input', side_effect=['#abc', '0']):
+                handle_view_todo_details("alice")
+        assert any("several items" in str(call) for call in mock_print.call_args_list)
+
+    def test_unknown_short_id_is_reported(self, todos, todo_store):
+        """Test a prefix without matches is reported."""
+        todo_store(todos)
+        with patch('builtins.print') as mock_print:
+            with patch('builtins.input', side_effect=['#abd', '0']):
+                handle_view_todo_details("alice")
+        assert any("No to-do item matches" in str(call) for call in mock_print.call_args_list)
+
+    def test_mark_completed_by_short_id(self, todos, todo_store):
+        """Test an item can be completed by its id prefix."""
+        todo_store(todos)
+        with patch('builtins.print'):
+            with patch('builtins.input', side_effect=['#abc19', '0']):
+                handle_mark_todo_completed("alice")
+        stored = {todo.id: todo for todo in load_todos()}
+        assert stored["abc19999-0000"].status == Status.COMPLETED
+        assert stored["abc12345-0000"].status == Status.PENDING
+
+    def test_mark_completed_rejects_completed_item(self, todo_store):
+        """Test a completed item cannot be completed again by id."""
+        todo_store([make_todo("aaa00000", status=Status.COMPLETED), make_todo("bbb00000")])
+        with patch('builtins.print') as mock_print:
+            with patch('builtins.input', side_effect=['#aaa', '0']):
+                handle_mark_todo_completed("alice")
+        assert any("is not pending" in str(call) for call in mock_print.call_args_list)
@@ -0,0 +1,151 @@
+"""Tests for bulk import and appending to the store."""
+
+import pytest
+import io
+import json
+from datetime import datetime, timezone
+from models import TodoItem, Priority, Status
+from main import save_todos, load_todos, append_todos, load_todo_summary, save_users
+from importer import iter_rows, normalize_timestamp, validate_row, validate_rows
+from cli import main as cli_main
+
+NOW = "2024-01-01T00:00:00"
+
+
+class TestAppendTodos:
+    """Tests for appending items without rewriting the store."""
+
+    def test_append_matches_full_save(self, tmp_path):
+        """Test an appended store is byte-identical to a full save."""
+        first = [TodoItem(title="One", details="Notes", priority=Priority.MID, owner="alice")]
+        second = [TodoItem(title=f"Ünï {i}", details="", priority=Priority.LOW, owner="bob") for i in range(3)]
+
+        appended = str(tmp_path / "appended.json")
+        save_todos(first, appended)
+        append_todos(second, appended)
+        saved = str(tmp_path / "saved.json")
+        save_todos(first + second, saved)
+
+        with open(appended) as a, open(saved) as b:
+            assert a.read() == b.read()
+        assert [todo.title for todo in load_todos(appended)] == ["One", "Ünï 0", "Ünï 1", "Ünï 2"]
+
+    def test_append_to_empty_and_missing_store(self, tmp_path):
+        """Test appending works on an empty array and a missing file."""
+        todos_file = str(tmp_path / "todos.json")
+        append_todos([TodoItem(title="A", details="", priority=Priority.MID, owner="alice")], todos_file)
+        save_todos([], todos_file)
+        append_todos([TodoItem(title="B", details="D", priority=Priority.MID, owner="alice")], todos_file)
+        assert [(todo.title, todo.details) for todo in load_todos(todos_file)] == [("B", "D")]
+
+    def test_append_updates_counters(self, todo_store):
+        """Test the per-owner counters include appended items."""
+        todo_store([TodoItem(title="A", details="", priority=Priority.HIGH, owner="alice")])
+        load_todo_summary("alice")
+        append_todos([TodoItem(title="B", details="", priority=Priority.LOW, owner="alice")])
+        counts = load_todo_summary("alice")
+        assert (counts["total"], counts["HIGH"], counts["LOW"]) == (2, 1, 1)
+
+
+class TestValidation:
+    """Tests for turning imported rows into items."""
+
+    def test_normalize_timestamp(self):
+        """Test common timestamp layouts are converted to naive ISO-8601."""
+        assert normalize_timestamp("2024-03-05", NOW) == "2024-03-05T00:00:00"
+        assert normalize_timestamp("2024/03/05 14:30", NOW) == "2024-03-05T14:30:00"
+        assert normalize_timestamp("", NOW) == NOW
+        utc = datetime(2024, 3, 5, 12, tzinfo=timezone.utc)
+        assert normalize_timestamp("2024-03-05T12:00:00Z", NOW) == utc.astimezone().replace(tzinfo=None).isoformat()
+        assert normalize_timestamp(utc.timestamp(), NOW) == normalize_timestamp("2024-03-05T12:00:00Z", NOW)
+        with pytest.raises(ValueError):
+            normalize_timestamp("next tuesday", NOW)
+
+    def test_validate_row_maps_aliases(self):
+        """Test column and value aliases from other trackers are understood."""
+        todo = validate_row(
+            {"Name": " Task ", "Description": "Notes", "Priority": "urgent", "State": "Done", "Created": "2024-03-05"},
+            "alice", NOW,
+        )
+        assert (todo.title, todo.details, todo.owner) == ("Task", "Notes", "alice")
+        assert (todo.priority, todo.status) == (Priority.HIGH, Status.COMPLETED)
+        assert todo.created_at == todo.updated_at == "2024-03-05T00:00:00"
+
+    def test_validate_row_defaults(self):
+        """Test missing optional fields get the usual defaults."""
+        todo = validate_row('{"title": "Task"}', "alice", NOW)
+        assert (todo.priority, todo.status, todo.created_at) == (Priority.MID, Status.PENDING, NOW)
+
+    @pytest.mark.parametrize("row", [
+        {"title": ""},
+        {"title": "Task", "priority": "someday"},
+        {"title": "Task", "status": "blocked"},
+        {"title": "Task", "created_at": "yesterday"},
+        {"title": "Task", "created_at": "1e400"},
+        {"title": "Task", "created_at": 1e18},
+        {"title": "Task", "created_at": "nan"},
+        "[1, 2]",
+        "{not json",
+    ])
+    def test_validate_row_rejects(self, row):
+        """Test invalid rows raise ValueError."""
+        with pytest.raises(ValueError):
+            validate_row(row, "alice", NOW)
+
+
+class TestValidateRows:
+    """Tests for chunked validation."""
+
+    def test_rows_keep_input_order_across_workers(self):
+        """Test parallel validation returns items in input order."""
+        rows = [(i, json.dumps({"title": f"Task {i}"})) for i in range(1, 51)]
+        rows[9] = (10, "{broken")
+        progress = []
+        accepted, rejected = validate_rows(
+            rows, "alice", workers=2, chunk_rows=7, progress=lambda done, bad: progress.append((done, bad)),
+        )
+        assert [todo.title for todo in accepted] == [f"Task {i}" for i in range(1, 51) if i != 10]
+        assert [row["row"] for row in rejected] == [10]
+        assert progress[-1] == (50, 1)
+
+    def test_iter_rows_csv_and_jsonl(self):
+        """Test rows are numbered and blank JSONL lines are skipped."""
+        csv_rows = list(iter_rows(io.StringIO("title,priority\nA,high\nB,low\n"), "csv"))
+        assert csv_rows == [(1, {"title": "A", "priority": "high"}), (2, {"title": "B", "priority": "low"})]
+        jsonl_rows = list(iter_rows(io.StringIO('{"title": "A"}\n\n{"title": "B"}\n'), "jsonl"))
+        assert [number for number, _ in jsonl_rows] == [1, 3]
+
+
+class TestImportCommand:
+    """Tests for the import subcommand."""
+
+    def test_import_csv_with_rejects_file(self, todo_store, tmp_path, capsys):
+        """Test valid rows are imported and rejected rows are reported."""
+        save_users([{"username": "alice", "password": "secret"}])
+        todo_store([TodoItem(title="Existing", details="", priority=Priority.MID, owner="alice")])
+        source = tmp_path / "backlog.csv"
+        source.write_text('title,description,priority\nA,"multi\nline",high\n,missing title,low\nB,,p3\n')
+        rejects = tmp_path / "rejects.jsonl"
+
+        assert cli_main([
+            "--user", "alice", "--password", "secret",
+            "import", str(source), "--rejects", str(rejects), "--workers", "1", "--quiet",
+        ]) == 0
+        assert json.loads(capsys.readouterr().out) == {"imported": 2, "rejected": 1}
+        assert [json.loads(line)["row"] for line in rejects.read_text().splitlines()] == [2]
+        todos = load_todos()
+        assert [(todo.title, todo.details) for todo in todos] == [("Existing", ""), ("A", "multi\nline"), ("B", "")]
+
+    def test_out_of_range_timestamps_reject_only_their_rows(self, todo_store, tmp_path, capsys):
+        """Test a timestamp datetime cannot represent does not abort the import."""
+        save_users([{"username": "alice", "password": "secret"}])
+        source = tmp_path / "in.jsonl"
+        source.write_text(
+            '{"title": "A", "created_at": "1e400"}\n{"title": "B"}\n{"title": "C", "created_at": 1e18}\n'
+        )
+
+        assert cli_main([
+            "--user", "alice", "--password", "secret", "import", str(source), "--workers", "1", "--quiet",
+        ]) == 0
+        assert json.loads(capsys.readouterr().out) == {"imported": 1, "rejected": 2}
+        assert [todo.title for todo in load_todos()] == ["B"]
@@ -0,0 +1,103 @@
+"""Tests for the in-memory index cache."""
+
+import pytest
+import json
+import os
+import tempfile
+from models import TodoItem, Priority
+from indexes import IndexCache, TodoIndex
+from sidecars import store_signature
+from main import save_todos, load_todos_for_index
+
+
+class CountingIndex(TodoIndex):
+    """Index counting items, recording how it was maintained."""
+
+    builds = 0
+
+    def rebuild(self, todos):
+        CountingIndex.builds += 1
+        self.count = len(todos)
+
+    def apply(self, before, after):
+        self.count += (after is not None) - (before is not None)
+
+
+def make_todo(title="Task"):
+    """Build a todo item for index tests."""
+    return TodoItem(title=title, details="", priority=Priority.MID, owner="alice")
+
+
+class TestIndexCache:
+    """Tests for IndexCache."""
+
+    def test_index_is_built_once(self):
+        """Test an index is reused while the store is unchanged."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            todos_file = os.path.join(tmpdir, "todos.json")
+            save_todos([make_todo()], todos_file)
+            cache = IndexCache()
+            CountingIndex.builds = 0
+
+            first = cache.get(CountingIndex, todos_file, load_todos_for_index)
+            second = cache.get(CountingIndex, todos_file, load_todos_for_index)
+            assert first is second
+            assert CountingIndex.builds == 1
+
+    def test_commit_applies_changes(self):
+        """Test a save with changes updates the cached index in place."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            todos_file = os.path.join(tmpdir, "todos.json")
+            todos = [make_todo()]
+            save_todos(todos, todos_file)
+            cache = IndexCache()
+            index = cache.get(CountingIndex, todos_file, load_todos_for_index)
+
+            previous = store_signature(todos_file)
+            new_todo = make_todo("Second")
+            todos.append(new_todo)
+            save_todos(todos, todos_file)
+            cache.commit(todos_file, [(None, new_todo)], previous)
+
+            assert cache.get(CountingIndex, todos_file, load_todos_for_index) is index
+            assert index.count == 2
+
+    def test_commit_without_changes_drops_index(self):
+        """Test a full save without changes invalidates the index."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            todos_file = os.path.join(tmpdir, "todos.json")
+            save_todos([make_todo()], todos_file)
+            cache = IndexCache()
+            index = cache.get(CountingIndex, todos_file, load_todos_for_index)
+
+            cache.commit(todos_file, None, None)
+            assert cache.get(CountingIndex, todos_file, load_todos_for_index) is not index
+
+    def test_external_change_rebuilds_index(self):
+        """Test an index is rebuilt after the store changes on disk."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            todos_file = os.path.join(tmpdir, "todos.json")
+            save_todos([make_todo()], todos_file)
+            cache = IndexCache()
+            cache.get(CountingIndex, todos_file, load_todos_for_index)
+
+            with open(todos_file, 'w') as f:
+                json.dump([], f)
+            assert cache.get(CountingIndex, todos_file, load_todos_for_index).count == 0
+
+    def test_missing_store_is_not_cached(self):
+        """Test nothing is cached for a store that does not exist."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            todos_file = os.path.join(tmpdir, "todos.json")
+            cache = IndexCache()
+            first = cache.get(CountingIndex, todos_file, lambda f: [])
+            assert cache.get(CountingIndex, todos_file, lambda f: []) is not first
+
+    def test_index_must_implement_both_methods(self):
+        """Test an index missing a method cannot be created."""
+        class BuildOnlyIndex(TodoIndex):
+            def rebuild(self, todos):
+                pass
+
+        with pytest.raises(TypeError):
+            BuildOnlyIndex()
@@ -0,0 +1,185 @@
+"""Tests for store locks and versioned saves across sessions."""
+
+import multiprocessing
+import threading
+import time
+from dataclasses import replace
+
+import pytest
+from models import Priority, Status
+from operations import ConflictError, complete_todo, edit_todo, rebase_change
+from locking import lock_path, store_lock
+from main import load_todos, save_todos, save_todo_changes
+from counters import load_counters
+from tests.helpers import make_todos
+
+
+def rename_repeatedly(todos_file, position, rounds):
+    """Rename one item several times, each time from a fresh load."""
+    for round_number in range(rounds):
+        todos = load_todos(todos_file, with_details=False)
+        change = edit_todo(todos[position], title=f"Item {position} round {round_number}")
+        save_todos(todos, todos_file, changes=[change])
+
+
+class TestStoreLock:
+    """Tests for shared and exclusive store locks."""
+
+    def test_lock_file_is_next_to_store(self, tmp_path):
+        """Test the lock file replaces the store's extension."""
+        assert lock_path(str(tmp_path / "todos.json")) == str(tmp_path / "todos.lock")
+
+    def test_readers_share_the_lock(self, tmp_path):
+        """Test two threads hold the shared lock at the same time."""
+        todos_file = str(tmp_path / "todos.json")
+        inside = threading.Barrier(2, timeout=2)
+
+        def read():
+            with store_lock(todos_file):
+                inside.wait()
+
+        threads = [threading.Thread(target=read) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not inside.broken
+
+    def test_writer_excludes_readers(self, todo_store):
+        """Test loading the store waits while a save holds the lock."""
+        todo_store(make_todos(2))
+        events = []
+
+        def read():
+            load_todos()
+            events.append("read")
+
+        with store_lock("todos.json", exclusive=True):
+            reader = threading.Thread(target=read)
+            reader.start()
+            time.sleep(0.05)
+            events.append("write done")
+        reader.join()
+        assert events == ["write done", "read"]
+
+    def test_lock_is_reentrant(self, todo_store):
+        """Test code holding the exclusive lock can read and save the store."""
+        todo_store(make_todos(2))
+        with store_lock("todos.json"):
+            todos = load_todos(with_details=False)
+            with store_lock("todos.json", exclusive=True):
+                save_todos(todos, "todos.json", changes=[complete_todo(todos[0])])
+            assert load_todos()[0].status == Status.COMPLETED
+
+
+class TestRebaseChange:
+    """Tests for carrying a change over to a newer version of an item."""
+
+    def test_keeps_fields_changed_elsewhere(self):
+        """Test the other session's fields survive and ours are applied."""
+        todo = make_todos(1)[0]
+        current = replace(todo, priority=Priority.HIGH, version=1)
+        before, after = edit_todo(todo, title="Renamed")
+
+        rebase_change(before, after, current)
+        assert (after.title, after.priority) == ("Renamed", Priority.HIGH)
+
+    def test_same_field_changed_twice_conflicts(self):
+        """Test two different values for one field are a conflict."""
+        todo = make_todos(1)[0]
+        current = replace(todo, title="Theirs", version=1)
+        before, after = edit_todo(todo, title="Ours")
+
+        with pytest.raises(ConflictError, match="title"):
+            rebase_change(before, after, current)
+        assert after.title == "Ours"
+
+    def test_same_value_is_no_conflict(self):
+        """Test completing an item someone else completed is not a conflict."""
+        todo = make_todos(1)[0]
+        current = replace(todo, status=Status.COMPLETED, version=1)
+        before, after = complete_todo(todo)
+
+        rebase_change(before, after, current)
+        assert after.status == Status.COMPLETED
+
+
+class TestVersionedSave:
+    """Tests for saves checked against the records in the file."""
+
+    def test_save_increments_changed_versions(self, todo_store):
+        """Test only the changed records get a new version."""
+        todo_store(make_todos(2))
+        todos = load_todos(with_details=False)
+        change = edit_todo(todos[0], title="Renamed")
+        save_todos(todos, "todos.json", changes=[change])
+
+        assert [todo.version for todo in load_todos()] == [1, 0]
+        assert change[1].version == 1
+
+    def test_stale_list_keeps_other_sessions_items(self, todo_store):
+        """Test saving a list loaded earlier does not undo another save."""
+        todo_store(make_todos(2))
+        first = load_todos(with_details=False)
+        second = load_todos(with_details=False)
+
+        save_todos(first, "todos.json", changes=[edit_todo(first[0], title="From first")])
+        save_todos(second, "todos.json", changes=[complete_todo(second[1])])
+
+        saved = load_todos()
+        assert saved[0].title == "From first"
+        assert saved[1].status == Status.COMPLETED
+        assert load_counters("todos.json")["alice"]["completed"] == 1
+
+    def test_changes_to_one_item_are_merged(self, todo_store):
+        """Test two sessions changing different fields of an item both win."""
+        todo_store(make_todos(1))
+        first = load_todos(with_details=False)
+        second = load_todos(with_details=False)
+
+        save_todos(first, "todos.json", changes=[edit_todo(first[0], priority=Priority.HIGH)])
+        change = edit_todo(second[0], details="New details")
+        save_todos(second, "todos.json", changes=[change])
+
+        saved = load_todos()[0]
+        assert (saved.priority, saved.details, saved.version) == (Priority.HIGH, "New details", 2)
+        assert change[1].priority == Priority.HIGH
+
+    def test_conflict_saves_the_other_changes(self, todo_store):
+        """Test a conflicting change is reported and the rest are saved."""
+        todo_store(make_todos(2))
+        first = load_todos(with_details=False)
+        second = load_todos(with_details=False)
+        save_todos(first, "todos.json", changes=[edit_todo(first[0], title="From first")])
+
+        changes = [edit_todo(second[0], title="From second"), complete_todo(second[1])]
+        with pytest.raises(ConflictError, match="Task 1"):
+            save_todos(second, "todos.json", changes=changes)
+
+        saved = load_todos()
+        assert saved[0].title == "From first"
+        assert saved[1].status == Status.COMPLETED
+
+    def test_save_todo_changes_needs_no_list(self, todo_store):
+        """Test changed items are written over the stored records."""
+        todo_store(make_todos(3))
+        todo = load_todos(with_details=False)[2]
+        save_todo_changes([complete_todo(todo)])
+
+        assert [todo.status for todo in load_todos()] == [Status.PENDING, Status.PENDING, Status.COMPLETED]
+
+    def test_concurrent_processes_lose_no_updates(self, todo_store):
+        """Test processes saving at the same time keep each other's changes."""
+        todo_store(make_todos(4))
+        context = multiprocessing.get_context("fork")
+        processes = [context.Process(target=rename_repeatedly, args=("todos.json", position, 10))
+                     for position in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(30)
+        assert [process.exitcode for process in processes] == [0] * 4
+
+        saved = load_todos()
+        assert [todo.title for todo in saved] == [f"Item {position} round 9" for position in range(4)]
+        assert [todo.version for todo in saved] == [10] * 4
@@ -0,0 +1,136 @@
+"""Tests for the next-up index and view."""
+
+import pytest
+import tempfile
+from dataclasses import replace
+from unittest.mock import patch
+from models import TodoItem, Priority, Status
+from next_up import NextUpIndex
+from main import handle_view_next_up, save_todos, load_todos
+
+
+def make_todo(title, priority, created_at, owner="alice", status=Status.PENDING):
+    """Build a todo item with a fixed creation time."""
+    return TodoItem(
+        title=title,
+        details="",
+        priority=priority,
+        owner=owner,
+        status=status,
+        created_at=created_at,
+        updated_at=created_at,
+    )
+
+
+@pytest.fixture
+def todos():
+    """Todo items across priorities, owners and statuses."""
+    return [
+        make_todo("Low old", Priority.LOW, "2025-01-01T09:00:00"),
+        make_todo("High new", Priority.HIGH, "2025-01-03T09:00:00"),
+        make_todo("High old", Priority.HIGH, "2025-01-02T09:00:00"),
+        make_todo("Mid", Priority.MID, "2025-01-01T09:00:00"),
+        make_todo("Done", Priority.HIGH, "2025-01-01T08:00:00", status=Status.COMPLETED),
+        make_todo("Bob's", Priority.HIGH, "2025-01-01T08:00:00", owner="bob"),
+    ]
+
+
+class TestNextUpIndex:
+    """Tests for NextUpIndex ordering and maintenance."""
+
+    def test_top_orders_by_priority_then_age(self, todos):
+        """Test items are ordered by priority, then creation time."""
+        index = NextUpIndex()
+        index.rebuild(todos)
+        titles = [todo.title for todo in index.top("alice", 10)]
+        assert titles == ["High old", "High new", "Mid", "Low old"]
+
+    def test_top_limits_count(self, todos):
+        """Test only the requested number of items is returned."""
+        index = NextUpIndex()
+        index.rebuild(todos)
+        assert [todo.title for todo in index.top("alice", 2)] == ["High old", "High new"]
+        assert index.pending_count("alice") == 4
+
+    def test_unknown_owner(self, todos):
+        """Test an owner without items gets an empty list."""
+        index = NextUpIndex()
+        index.rebuild(todos)
+        assert index.top("nobody", 5) == []
+
+    def test_apply_create(self, todos):
+        """Test a created item is inserted in order."""
+        index = NextUpIndex()
+        index.rebuild(todos)
+        new_todo = make_todo("Urgent", Priority.HIGH, "2024-12-31T09:00:00")
+        index.apply(None, new_todo)
+        assert index.top("alice", 1)[0].title == "Urgent"
+
+    def test_apply_complete_removes_item(self, todos):
+        """Test completing an item removes it from the index."""
+        index = NextUpIndex()
+        index.rebuild(todos)
+        todo = todos[2]
+        before = replace(todo)
+        todo.status = Status.COMPLETED
+        index.apply(before, todo)
+        assert "High old" not in [t.title for t in index.top("alice", 10)]
+
+    def test_apply_priority_edit_reorders(self, todos):
+        """Test editing priority moves the item."""
+        index = NextUpIndex()
+        index.rebuild(todos)
+        todo = todos[0]
+        before = replace(todo)
+        todo.priority = Priority.HIGH
+        index.apply(before, todo)
+        assert index.top("alice", 1)[0].title == "Low old"
+
+
+class TestViewNextUp:
+    """Tests for handle_view_next_up."""
+
+    def test_view_next_up_shows_most_urgent(self, todos, monkeypatch):
+        """Test the view lists pending items in urgency order."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            monkeypatch.chdir(tmpdir)
+            save_todos(todos)
+            with patch('builtins.print') as mock_print:
+                with patch('builtins.input', return_value='0'):
+                    handle_view_next_up("alice", count=2)
+
+            output = ''.join(str(call) for call in mock_print.call_args_list)
+            assert output.index("High old") < output.index("High new")
+            assert "Low old" not in output
+            assert "Done" not in output
+
+    def test_view_next_up_follows_saved_changes(self, todos, monkeypatch):
+        """Test the cached index reflects later saves."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            monkeypatch.chdir(tmpdir)
+            save_todos(todos)
+            with patch('builtins.print'):
+                with patch('builtins.input', return_value='0'):
+                    handle_view_next_up("alice")
+
+            stored = load_todos()
+            todo = next(t for t in stored if t.title == "High old")
+            before = replace(todo)
+            todo.status = Status.COMPLETED
+            save_todos(stored, changes=[(before, todo)])
+
+            with patch('builtins.print') as mock_print:
+                with patch('builtins.input', return_value='0'):
+                    handle_view_next_up("alice")
+            output = ''.join(str(call) for call in mock_print.call_args_list)
+            assert "High old" not in output
+
+    def test_view_next_up_no_pending_items(self, monkeypatch):
+        """Test the view reports when nothing is pending."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            monkeypatch.chdir(tmpdir)
+            with patch('builtins.print') as mock_print:
+                with patch('builtins.input', return_value='') as mock_input:
+                    handle_view_next_up("alice")
+                    mock_input.assert_called()
+            assert any("no pending" in str(call) for call in mock_print.call_args_list)
@@ -0,0 +1,252 @@
+"""Tests for streaming, cursor-based paging over the todo store."""
+
+import pytest
+import json
+from unittest.mock import patch
+from models import TodoItem, Priority, Status
+from paging import ItemCursor, ManagedCursor, iter_records, skip_matches, TodoCursor
+from selection import parse_selection
+from main import save_todos, owner_matcher, page_count, handle_view_all_todos, todo_manager
+from tests.helpers import make_todos
+
+
+class TestIterRecords:
+    """Tests for streaming records out of todos.json."""
+
+    def test_iter_records_matches_json_load(self, tmp_path):
+        """Test streaming yields the same records as a full parse."""
+        todos_file = str(tmp_path / "todos.json")
+        save_todos(make_todos(5) + make_todos(3, owner="bob", title="Tâche ✓"), todos_file)
+
+        with open(todos_file, 'r') as f:
+            expected = json.load(f)
+        assert [record for _, record in iter_records(todos_file)] == expected
+
+    def test_iter_records_resumes_from_offset(self, tmp_path):
+        """Test a yielded offset can be used to resume streaming."""
+        todos_file = str(tmp_path / "todos.json")
+        save_todos(make_todos(4, title="Ünïcode"), todos_file)
+
+        offsets = [offset for offset, _ in iter_records(todos_file)]
+        resumed = [record["title"] for _, record in iter_records(todos_file, offsets[2])]
+        assert resumed == ["Ünïcode 3", "Ünïcode 4"]
+
+    def test_iter_records_small_chunks(self, tmp_path, monkeypatch):
+        """Test records spanning read chunks are decoded correctly."""
+        monkeypatch.setattr("paging.CHUNK_SIZE", 7)
+        todos_file = str(tmp_path / "todos.json")
+        save_todos(make_todos(3, title="Ωmega"), todos_file)
+        assert [record["title"] for _, record in iter_records(todos_file)] == ["Ωmega 1", "Ωmega 2", "Ωmega 3"]
+
+    def test_iter_records_missing_and_empty_files(self, tmp_path):
+        """Test missing and empty stores yield nothing."""
+        todos_file = str(tmp_path / "todos.json")
+        assert list(iter_records(todos_file)) == []
+        save_todos([], todos_file)
+        assert list(iter_records(todos_file)) == []
+
+    def test_skip_matches(self, tmp_path):
+        """Test skipping matches returns the offset of the next match."""
+        todos_file = str(tmp_path / "todos.json")
+        save_todos(make_todos(3) + make_todos(3, owner="bob"), todos_file)
+
+        offset = skip_matches(todos_file, owner_matcher("bob"), 1)
+        assert next(iter_records(todos_file, offset))[1]["title"] == "Task 2"
+        assert skip_matches(todos_file, owner_matcher("bob"), 3) is None
+
+
+class TestTodoCursor:
+    """Tests for TodoCursor navigation."""
+
+    def test_pages_contain_only_matching_items(self, tmp_path):
+        """Test pages are filled with the matching items in order."""
+        todos_file = str(tmp_path / "todos.json")
+        save_todos(make_todos(3, owner="bob") + make_todos(5), todos_file)
+
+        cursor = TodoCursor(todos_file, owner_matcher("alice"), page_size=2)
+        assert [todo.title for todo in cursor.page().items] == ["Task 1", "Task 2"]
+        assert cursor.has_next()
+        assert not cursor.has_prev()
+
+    def test_next_and_prev(self, tmp_path):
+        """Test moving between pages."""
+        todos_file = str(tmp_path / "todos.json")
+        save_todos(make_todos(5), todos_file)
+
+        cursor = TodoCursor(todos_file, owner_matcher("alice"), page_size=2)
+        cursor.next()
+        cursor.next()
+        page = cursor.page()
+        assert [todo.title for todo in page.items] == ["Task 5"]
+        assert page.start == 4
+        assert not cursor.has_next()
+
+        cursor.prev()
+        assert [todo.title for todo in cursor.page().items] == ["Task 3", "Task 4"]
+
+    def test_page_items_have_unloaded_details(self, tmp_path):
+        """Test page items are loaded without their details text."""
+        todos_file = str(tmp_path / "todos.json")
+        save_todos([TodoItem(title="Task", details="Notes", priority=Priority.MID, owner="alice")], todos_file)
+        assert TodoCursor(todos_file, owner_matcher("alice")).page().items[0].details is None
+
+    def test_item_at_beyond_current_page(self, tmp_path):
+        """Test items on other pages can be addressed by position."""
+        todos_file = str(tmp_path / "todos.json")
+        save_todos(make_todos(5), todos_file)
+
+        cursor = TodoCursor(todos_file, owner_matcher("alice"), page_size=2)
+        assert cursor.item_at(1).title == "Task 1"
+        assert cursor.item_at(5).title == "Task 5"
+        assert cursor.item_at(6) is None
+        assert cursor.item_at(0) is None
+
+    def test_cursor_follows_rewritten_store(self, tmp_path):
+        """Test the cursor finds its page again after the store is rewritten."""
+        todos_file = str(tmp_path / "todos.json")
+        todos = make_todos(4, owner="bob") + make_todos(4)
+        save_todos(todos, todos_file)
+
+        cursor = TodoCursor(todos_file, owner_matcher("alice", Status.PENDING), page_size=2)
+        cursor.next()
+        assert [todo.title for todo in cursor.page().items] == ["Task 3", "Task 4"]
+
+        save_todos(todos[4:], todos_file)
+        cursor.refresh()
+        assert [todo.title for todo in cursor.page().items] == ["Task 3", "Task 4"]
+
+    def test_cursor_steps_back_when_page_empties(self, tmp_path):
+        """Test the cursor moves back if its page no longer has items."""
+        todos_file = str(tmp_path / "todos.json")
+        todos = make_todos(3)
+        save_todos(todos, todos_file)
+
+        cursor = TodoCursor(todos_file, owner_matcher("alice", Status.PENDING), page_size=2)
+        cursor.next()
+        todos[2].status = Status.COMPLETED
+        save_todos(todos, todos_file)
+        cursor.refresh()
+        assert cursor.page().number == 0
+
+
+class TestItemCursor:
+    """Tests for paging through items held in memory."""
+
+    def test_pages_and_positions(self):
+        """Test pages, positions and selections follow the list order."""
+        todos = make_todos(25)
+        cursor = ItemCursor(lambda: todos, page_size=10)
+        assert [todo.title for todo in cursor.page().items][:2] == ["Task 1", "Task 2"]
+        cursor.next()
+        cursor.next()
+        page = cursor.page()
+        assert (page.number, page.start, len(page.items), cursor.has_next()) == (2, 20, 5, False)
+        assert cursor.item_at(25).title == "Task 25"
+        assert cursor.item_at(26) is None
+        assert [todo.title for todo in cursor.select(parse_selection("2-3,30"))] == ["Task 2", "Task 3"]
+        assert cursor.total == 25
+
+    def test_refresh_reads_the_items_again(self):
+        """Test a shorter list moves the cursor back to its last page."""
+        todos = make_todos(25)
+        cursor = ItemCursor(lambda: list(todos), page_size=10)
+        cursor.next()
+        cursor.next()
+        del todos[15:]
+        cursor.refresh()
+        assert cursor.page().number == 1
+        assert cursor.total == 15
+
+
+class FakeManager:
+    """Stands in for a TodoManager whose unsaved changes a test controls."""
+
+    def __init__(self, todos):
+        self.filename = "todos.json"
+        self.held = todos
+        self.unsaved = False
+        self.reads = 0
+
+    def pending(self):
+        """Return True while the test says there are unsaved changes."""
+        return self.unsaved
+
+    def todos(self, owner=None):
+        """Return the held items of an owner."""
+        self.reads += 1
+        return [todo for todo in self.held if owner is None or todo.owner == owner]
+
+
+class TestManagedCursor:
+    """Tests for paging from the store or the held items."""
+
+    def test_reads_the_store_without_unsaved_changes(self, todo_store):
+        """Test pages come from the store and the held items are not copied."""
+        todo_store(make_todos(25))
+        manager = FakeManager([])
+        cursor = ManagedCursor(manager, "alice", owner_matcher("alice"), lambda todo: True, lambda: 25, 10)
+        cursor.next()
+        assert [todo.title for todo in cursor.page().items][:1] == ["Task 11"]
+        assert cursor.total == 25
+        assert manager.reads == 0
+
+    def test_reads_the_held_items_while_changes_are_unsaved(self, todo_store):
+        """Test the held items are paged at the same position while unsaved."""
+        todo_store(make_todos(25))
+        manager = FakeManager(make_todos(30, title="Held"))
+        cursor = ManagedCursor(manager, "alice", owner_matcher("alice"), lambda todo: True, lambda: 25, 10)
+        cursor.next()
+        manager.unsaved = True
+        assert [todo.title for todo in cursor.page().items][:1] == ["Held 11"]
+        assert cursor.total == 30
+        manager.unsaved = False
+        cursor.next()
+        assert [todo.title for todo in cursor.page().items][:1] == ["Task 21"]
+
+
+class TestPagedViews:
+    """Tests for page navigation in the view screens."""
+
+    def test_page_count(self):
+        """Test the number of pages is rounded up."""
+        assert page_count(0, 20) == 1
+        assert page_count(20, 20) == 1
+        assert page_count(21, 20) == 2
+
+    def test_view_all_shows_one_page_at_a_time(self, todo_store):
+        """Test only the first page is shown until the user moves on."""
+        todo_store(make_todos(25))
+        with patch('builtins.print') as mock_print:
+            with patch('builtins.input', return_value='0'):
+                handle_view_all_todos("alice")
+
+        output = ''.join(str(call) for call in mock_print.call_args_list)
+        assert "Task 20" in output
+        assert "Task 21" not in output
+        assert "(25 total) - Page 1 of 2" in output
+
+    def test_view_all_next_page(self, todo_store):
+        """Test the next page is shown after choosing n."""
+        todo_store(make_todos(25))
+        with patch('builtins.print') as mock_print:
+            with patch('builtins.input', side_effect=['n', '0']):
+                handle_view_all_todos("alice")
+
+        output = ''.join(str(call) for call in mock_print.call_args_list)
+        assert "[21] ○ Task 21" in output
+        assert "Page 2 of 2" in output
+
+    def test_view_all_shows_details_of_the_page(self, todo_store):
+        """Test details are read for the items on the page only."""
+        todos = make_todos(25)
+        for todo in todos:
+            todo.details = f"Notes for {todo.title}"
+        todo_store(todos)
+        with patch('builtins.print') as mock_print:
+            with patch('builtins.input', return_value='0'):
+                handle_view_all_todos("alice")
+
+        output = ''.join(str(call) for call in mock_print.call_args_list)
+        assert "Details: Notes for Task 20" in output
+        assert "Notes for Task 21" not in output
+        assert todo_manager().todos("alice")[20].details is None
@@ -0,0 +1,149 @@
+"""Tests for the filter and update language."""
+
+import pytest
+import json
+from datetime import datetime
+from models import TodoItem, Priority, Status
+from main import save_todos, load_todos, load_todo_summary, save_users
+from indexes import IndexCache
+from query import (
+    And, Comparison, QueryError, parse_filter, parse_update, plan, run_update, resolve_time, tokenize,
+)
+from cli import main as cli_main
+
+NOW = datetime(2024, 6, 1, 12, 0, 0)
+
+
+def make_todo(title, owner="alice", priority=Priority.MID, status=Status.PENDING, created_at="2024-05-01T00:00:00"):
+    """Build a todo item."""
+    todo = TodoItem(title=title, details="", priority=priority, owner=owner, created_at=created_at)
+    todo.status = status
+    todo.updated_at = created_at
+    return todo
+
+
+class TestParsing:
+    """Tests for parsing expressions."""
+
+    def test_tokenize_quoted_strings(self):
+        """Test quoted strings keep spaces and escaped quotes."""
+        assert tokenize('title ~ "a \\"b\\" c"') == [("word", "title"), ("op", "~"), ("string", 'a "b" c')]
+
+    def test_resolve_time(self):
+        """Test relative and absolute timestamps."""
+        assert resolve_time("now-90d", NOW) == "2024-03-03T12:00:00"
+        assert resolve_time("now-2w", NOW) == "2024-05-18T12:00:00"
+        assert resolve_time("today", NOW) == "2024-06-01T00:00:00"
+        assert resolve_time("2024-01-02", NOW) == "2024-01-02T00:00:00"
+        with pytest.raises(QueryError):
+            resolve_time("last week", NOW)
+
+    def test_precedence_and_parentheses(self):
+        """Test 'and' binds tighter than 'or' and parentheses override it."""
+        high = make_todo("High", priority=Priority.HIGH)
+        low = make_todo("Low", priority=Priority.LOW, owner="bob")
+        loose = parse_filter("priority = HIGH or priority = LOW and owner = alice")
+        strict = parse_filter("(priority = HIGH or priority = LOW) and owner = alice")
+        assert [loose.matches(todo) for todo in (high, low)] == [True, False]
+        assert [strict.matches(todo) for todo in (high, low)] == [True, False]
+        assert parse_filter("not owner = alice").matches(low)
+
+    def test_comparisons(self):
+        """Test text, enum and time comparisons on items and raw records."""
+        todo = make_todo("Pay Invoice", status=Status.COMPLETED)
+        assert parse_filter("title ~ invoice").matches(todo)
+        assert parse_filter("status = completed").matches(todo)
+        assert parse_filter("created_at < now-30d", NOW).matches(todo)
+        assert not parse_filter("created_at >= 2024-05-02").matches(todo)
+        assert parse_filter("priority != high").matches(todo.to_dict())
+
+    @pytest.mark.parametrize("text", [
+        "colour = red", "priority < HIGH", "priority = urgent", "status = blocked",
+        "title =", "(title = a", "title = a b", "created_at > soon", "title = a and",
+    ])
+    def test_invalid_filters(self, text):
+        """Test malformed filters raise QueryError."""
+        with pytest.raises(QueryError):
+            parse_filter(text)
+
+    def test_parse_update(self):
+        """Test assignments are parsed and validated."""
+        assert parse_update('priority = low, title = "New title"') == {"priority": "LOW", "title": "New title"}
+        for text in ("owner = bob", "priority low", "priority = LOW status = PENDING", 'title = ""'):
+            with pytest.raises(QueryError):
+                parse_update(text)
+
+
+class TestRunUpdate:
+    """Tests for planning and applying updates."""
+
+    def test_plan_uses_indexes(self, tmp_path):
+        """Test filters pinning an owner use an index instead of a scan."""
+        todos_file = str(tmp_path / "todos.json")
+        todos = [
+            make_todo("A", priority=Priority.HIGH),
+            make_todo("B", priority=Priority.LOW),
+            make_todo("C", status=Status.COMPLETED),
+            make_todo("D", owner="bob"),
+        ]
+        save_todos(todos, todos_file)
+        indexes = IndexCache()
+
+        def loader(filename):
+            return load_todos(filename, with_details=False)
+
+        name, ids = plan(parse_filter("owner = alice and status = pending and priority = LOW"), indexes, todos_file, loader)
+        assert name == "next-up index"
+        assert ids == [todos[1].id]
+        name, ids = plan(parse_filter("owner = alice"), indexes, todos_file, loader)
+        assert name == "owner index"
+        assert sorted(ids) == sorted(todo.id for todo in todos[:3])
+        assert plan(parse_filter("owner = alice or owner = bob"), indexes, todos_file, loader) == ("scan", None)
+
+        wrapped = And([Comparison("owner", "=", "alice"), parse_filter("status = pending and priority = LOW")])
+        assert plan(wrapped, indexes, todos_file, loader) == ("next-up index", [todos[1].id])
+
+    def test_counts_matched_and_modified(self):
+        """Test items already holding the new values are matched but not modified."""
+        todos = [make_todo("A", priority=Priority.LOW), make_todo("B"), make_todo("C", owner="bob")]
+        matched, changes = run_update(todos, parse_filter("owner = alice"), parse_update("priority = LOW"))
+        assert matched == 2
+        assert [after.title for _, after in changes] == ["B"]
+        assert changes[0][0].priority == Priority.MID
+        assert todos[1].updated_at != "2024-05-01T00:00:00"
+
+    def test_dry_run_changes_nothing(self):
+        """Test a dry run only counts."""
+        todos = [make_todo("A")]
+        assert run_update(todos, parse_filter("title = A"), parse_update("status = completed"), dry_run=True) == (1, [])
+        assert todos[0].status == Status.PENDING
+
+
+class TestUpdateCommand:
+    """Tests for the update subcommand."""
+
+    def test_update_old_pending_items(self, todo_store, capsys):
+        """Test a bulk update is scoped to the user and saved once."""
+        save_users([{"username": "alice", "password": "secret"}])
+        todo_store([
+            make_todo("Old", created_at="2020-01-01T00:00:00"),
+            make_todo("New", created_at=datetime.now().isoformat()),
+            make_todo("Old done", status=Status.COMPLETED, created_at="2020-01-01T00:00:00"),
+            make_todo("Bob's old", owner="bob", created_at="2020-01-01T00:00:00"),
+        ])
+        assert cli_main([
+            "--user", "alice", "--password", "secret", "update",
+            "--where", "status = pending and created_at < now-90d", "--set", "priority = LOW",
+        ]) == 0
+        result = json.loads(capsys.readouterr().out)
+        assert (result["matched"], result["modified"], result["plan"]) == (1, 1, "next-up index")
+
+        priorities = {todo.title: todo.priority for todo in load_todos()}
+        assert priorities == {"Old": Priority.LOW, "New": Priority.MID, "Old done": Priority.MID, "Bob's old": Priority.MID}
+        assert load_todo_summary("alice")["LOW"] == 1
+
+    def test_update_reports_invalid_expression(self, todo_store, capsys):
+        """Test a bad expression is an error."""
+        save_users([{"username": "alice", "password": "secret"}])
+        assert cli_main(["--user", "alice", "--password", "secret", "update", "--where", "size > 3", "--set", "priority = LOW"]) == 1
+        assert "Unknown field" in json.loads(capsys.readouterr().err)["error"]
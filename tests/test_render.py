@@ -0,0 +1,80 @@
+"""Tests for buffered list rendering."""
+
+import pytest
+from unittest.mock import patch
+from models import TodoItem, Priority, Status
+from render import ItemTextCache, render_items, write_screen
+from main import handle_view_all_todos
+
+
+def make_todo(title="Task", status=Status.PENDING):
+    """Build a todo item for rendering tests."""
+    return TodoItem(title=title, details="", priority=Priority.HIGH, owner="alice", status=status)
+
+
+class TestItemTextCache:
+    """Tests for memoized item formatting."""
+
+    def test_repeated_format_is_cached(self):
+        """Test formatting the same item version twice hits the cache."""
+        cache = ItemTextCache()
+        todo = make_todo()
+        first = cache.format(todo, "symbol")
+        assert cache.format(todo, "symbol") is first
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_updated_item_is_reformatted(self):
+        """Test a new updated_at produces fresh text."""
+        cache = ItemTextCache()
+        todo = make_todo()
+        cache.format(todo, "symbol")
+        todo.title = "Renamed"
+        todo.updated_at = "2099-01-01T00:00:00"
+        assert cache.format(todo, "symbol") == "○ Renamed"
+
+    def test_styles_are_cached_separately(self):
+        """Test each style has its own cache entry."""
+        cache = ItemTextCache()
+        todo = make_todo()
+        assert cache.format(todo, "symbol") != cache.format(todo, "priority")
+        assert cache.misses == 2
+
+    def test_cache_is_bounded(self):
+        """Test the least recently used entries are evicted."""
+        cache = ItemTextCache(maxsize=2)
+        todos = [make_todo(f"Task {i}") for i in range(3)]
+        for todo in todos:
+            cache.format(todo, "symbol")
+        cache.format(todos[0], "symbol")
+        assert cache.misses == 4
+
+
+class TestRenderItems:
+    """Tests for numbered list entries and screen output."""
+
+    def test_render_items_numbers_from_start(self):
+        """Test entries are numbered from the page start."""
+        entries = render_items([make_todo("A"), make_todo("B", Status.COMPLETED)], start=20,
+                               style="symbol", cache=ItemTextCache())
+        assert entries == ["[21] ○ A", "[22] ✓ B"]
+
+    def test_render_full_style(self):
+        """Test the full style shows the list fields."""
+        entry = render_items([make_todo("A")], cache=ItemTextCache())[0]
+        assert "Priority: HIGH" in entry
+        assert "Status: PENDING" in entry
+
+    def test_write_screen_single_call(self):
+        """Test a screen is written with one print call."""
+        with patch('builtins.print') as mock_print:
+            write_screen(["line 1", "line 2"])
+        mock_print.assert_called_once_with("line 1\nline 2")
+
+    def test_view_all_writes_list_once(self, todo_store):
+        """Test the view-all list is written in a single call."""
+        todo_store([make_todo(f"Task {i}") for i in range(10)])
+        with patch('builtins.print') as mock_print:
+            with patch('builtins.input', return_value='0'):
+                handle_view_all_todos("alice")
+        list_calls = [call for call in mock_print.call_args_list if "Task" in str(call)]
+        assert len(list_calls) == 1
@@ -0,0 +1,174 @@
+"""Tests for full-text search."""
+
+import pytest
+import json
+import os
+from unittest.mock import patch
+from models import TodoItem, Priority
+import main
+from locking import holds_lock
+from main import load_todos, save_todo_changes, search_todos, handle_search_todos, append_todos
+from operations import edit_todo
+import search
+from search import SearchIndex, load_search_index, search_index_path, search_log_path, tokenize
+
+
+def make_todo(title, details="", owner="alice"):
+    """Build a todo item."""
+    return TodoItem(title=title, details=details, priority=Priority.MID, owner=owner)
+
+
+def titles(todos):
+    """Return the sorted titles of items."""
+    return sorted(todo.title for todo in todos)
+
+
+class TestSearchIndex:
+    """Tests for the in-memory inverted index."""
+
+    def build(self):
+        """Build an index over a few items."""
+        todos = [
+            make_todo("Quarterly report", "Send slides to finance"),
+            make_todo("Report bug", "Crash on save"),
+            make_todo("Buy milk"),
+            make_todo("Quarterly report", "Bob's copy", owner="bob"),
+        ]
+        index = SearchIndex()
+        index.rebuild(todos)
+        return index, todos
+
+    def test_tokenize(self):
+        """Test words are lower-cased and deduplicated."""
+        assert tokenize("Report, report & Café!") == ["café", "report"]
+        assert tokenize(None) == []
+
+    def test_and_or_and_prefix(self):
+        """Test terms combine with AND by default, OR between groups and * prefixes."""
+        index, todos = self.build()
+        assert index.search("alice", "report") == {todos[0].id, todos[1].id}
+        assert index.search("alice", "report slides") == {todos[0].id}
+        assert index.search("alice", "milk OR crash") == {todos[1].id, todos[2].id}
+        assert index.search("alice", "quart*") == {todos[0].id}
+        assert index.search("alice", "rep* sa*") == {todos[1].id}
+        assert index.search("alice", "nothing") == set()
+        assert index.search("bob", "report") == {todos[3].id}
+
+    def test_apply_edit_keeps_unloaded_details(self):
+        """Test editing a title keeps the details words of an unloaded item."""
+        index, todos = self.build()
+        todo = todos[0]
+        before = TodoItem(title=todo.title, details=None, priority=todo.priority, owner="alice", id=todo.id)
+        after = TodoItem(title="Annual summary", details=None, priority=todo.priority, owner="alice", id=todo.id)
+        index.apply(before, after)
+        assert index.search("alice", "quarterly") == set()
+        assert index.search("alice", "annual slides") == {todo.id}
+        assert index.search("alice", "quar*") == set()
+
+    def test_remove(self):
+        """Test a removed item no longer matches."""
+        index, todos = self.build()
+        index.apply(todos[2], None)
+        assert index.search("alice", "milk") == set()
+
+
+class TestPersistedSearch:
+    """Tests for the search index file kept next to the store."""
+
+    def test_index_built_on_first_search_and_updated_on_save(self, todo_store):
+        """Test the index file is created lazily and kept current by saves."""
+        todos = [make_todo("Quarterly report", "slides"), make_todo("Buy milk")]
+        todo_store(todos)
+        assert not os.path.exists(search_index_path("todos.json"))
+
+        assert titles(search_todos("alice", "report")) == ["Quarterly report"]
+        assert os.path.exists(search_index_path("todos.json"))
+
+        change = edit_todo(todos[1], title="Buy oat milk", details="From the corner shop")
+        save_todo_changes([change])
+        append_todos([make_todo("Shop for party")])
+        with patch("search.SearchIndex.rebuild") as rebuild:
+            assert titles(search_todos("alice", "shop")) == ["Buy oat milk", "Shop for party"]
+            assert titles(search_todos("alice", "slides OR oat")) == ["Buy oat milk", "Quarterly report"]
+        rebuild.assert_not_called()
+
+    def test_index_file_survives_restart(self, todo_store):
+        """Test a fresh process loads the persisted index."""
+        todo_store([make_todo("Quarterly report")])
+        search_todos("alice", "report")
+        with patch("search._LOADED", {}):
+            assert load_search_index("todos.json") is not None
+
+    def test_save_appends_only_the_changed_items(self, todo_store):
+        """Test a save logs the changed items and leaves the snapshot alone."""
+        todos = [make_todo("Quarterly report", "slides"), make_todo("Buy milk")]
+        todo_store(todos)
+        search_todos("alice", "report")
+        with open(search_index_path("todos.json")) as f:
+            snapshot = f.read()
+
+        save_todo_changes([edit_todo(todos[1], title="Buy oat milk")])
+        with open(search_index_path("todos.json")) as f:
+            assert f.read() == snapshot
+        with open(search_log_path("todos.json")) as f:
+            entries = [json.loads(line) for line in f]
+        assert [list(entry["docs"]) for entry in entries] == [[todos[1].id]]
+        with patch("search._LOADED", {}):
+            index = load_search_index("todos.json")
+        assert index.search("alice", "oat") == {todos[1].id}
+
+    def test_long_log_is_compacted(self, todo_store, monkeypatch):
+        """Test the snapshot is rewritten once the log outgrows it."""
+        monkeypatch.setattr(search, "COMPACT_RATIO", 0)
+        todos = [make_todo("Quarterly report")]
+        todo_store(todos)
+        search_todos("alice", "report")
+        save_todo_changes([edit_todo(todos[0], title="Annual report")])
+        assert os.path.exists(search_log_path("todos.json"))
+
+        save_todo_changes([edit_todo(todos[0], title="Annual review")])
+        assert not os.path.exists(search_log_path("todos.json"))
+        with patch("search._LOADED", {}):
+            assert titles(search_todos("alice", "review")) == ["Annual review"]
+
+    def test_torn_log_is_rebuilt(self, todo_store):
+        """Test a log that cannot be replayed makes the next search rebuild."""
+        todos = [make_todo("Quarterly report")]
+        todo_store(todos)
+        search_todos("alice", "report")
+        save_todo_changes([edit_todo(todos[0], title="Annual report")])
+        with open(search_log_path("todos.json"), "a") as f:
+            f.write('{"since": [1, ')
+        with patch("search._LOADED", {}):
+            assert load_search_index("todos.json") is None
+            assert titles(search_todos("alice", "annual")) == ["Annual report"]
+
+    def test_rebuild_holds_the_store_lock(self, todo_store):
+        """Test no save can land between loading the items and writing the index."""
+        todo_store([make_todo("Quarterly report")])
+        locked = []
+
+        def load(filename, **kwargs):
+            locked.append(holds_lock(filename))
+            return load_todos(filename, **kwargs)
+
+        with patch.object(main, "load_todos", side_effect=load):
+            assert titles(search_todos("alice", "report")) == ["Quarterly report"]
+        assert locked[0] is True
+
+    def test_stale_index_is_rebuilt(self, todo_store):
+        """Test a store changed behind the index's back triggers a rebuild."""
+        todo_store([make_todo("Quarterly report")])
+        search_todos("alice", "report")
+        todo_store([make_todo("Annual report")])
+        assert titles(search_todos("alice", "report")) == ["Annual report"]
+
+    def test_search_screen(self, todo_store):
+        """Test the search screen lists matching items only."""
+        todo_store([make_todo("Quarterly report"), make_todo("Buy milk")])
+        with patch('builtins.print') as mock_print:
+            with patch('builtins.input', side_effect=['report', '']):
+                handle_search_todos("alice")
+        output = ''.join(str(call) for call in mock_print.call_args_list)
+        assert "1 item(s) match 'report'" in output
+        assert "Buy milk" not in output
@@ -0,0 +1,111 @@
+"""Tests for multi-item selections and bulk completion."""
+
+import pytest
+from unittest.mock import patch
+from models import Priority, Status
+import main
+from main import handle_mark_todo_completed, load_todos, load_todo_summary
+from selection import is_multi_selection, parse_selection
+from tests.helpers import make_todos
+
+PRIORITIES = (Priority.HIGH, Priority.MID, Priority.LOW)
+
+
+class TestParseSelection:
+    """Tests for parsing selections."""
+
+    def test_ranges_are_merged(self):
+        """Test overlapping and adjacent ranges are merged."""
+        selection = parse_selection("80-90, 1-50,73,40-60, 61")
+        assert selection.ranges == [(1, 61), (73, 73), (80, 90)]
+        assert selection.last == 90
+        assert 61 in selection and 73 in selection and 85 in selection
+        assert 62 not in selection and 91 not in selection and 0 not in selection
+
+    def test_all_with_priority(self):
+        """Test 'all' selections, optionally limited to a priority."""
+        assert parse_selection("all").last is None
+        selection = parse_selection("ALL high")
+        assert selection.priority == Priority.HIGH
+        assert 10_000 in selection
+        assert selection.accepts({"priority": "HIGH"})
+        assert not selection.accepts({"priority": "LOW"})
+
+    @pytest.mark.parametrize("text", ["0-3", "5-2", "1,,2", "a-b", "all urgent", "all high now", "-3"])
+    def test_invalid_selections(self, text):
+        """Test malformed selections raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_selection(text)
+
+    def test_is_multi_selection(self):
+        """Test single numbers and ids are not multi selections."""
+        assert is_multi_selection("1-3")
+        assert is_multi_selection("2,4")
+        assert is_multi_selection("all LOW")
+        assert not is_multi_selection("12")
+        assert not is_multi_selection("#1a2b")
+        assert not is_multi_selection("#1a2b3c4d-5e6f")
+        assert not is_multi_selection("/buy milk, eggs")
+
+
+class TestBulkCompletion:
+    """Tests for completing several items from the mark screen."""
+
+    def test_range_selection_completes_in_one_write(self, todo_store):
+        """Test a range and a list are completed with a single save."""
+        todo_store(make_todos(30, priorities=PRIORITIES) + make_todos(5, owner="bob", priorities=PRIORITIES))
+        with patch('builtins.print'):
+            with patch('builtins.input', side_effect=['1-5,25-26', 'y', '0']):
+                with patch('main.save_todos', wraps=main.save_todos) as save:
+                    handle_mark_todo_completed("alice")
+
+        assert save.call_count == 1
+        completed = [todo.title for todo in load_todos() if todo.status == Status.COMPLETED]
+        assert completed == ["Task 1", "Task 2", "Task 3", "Task 4", "Task 5", "Task 25", "Task 26"]
+        assert load_todo_summary("alice")["completed"] == 7
+
+    def test_all_priority_selection(self, todo_store):
+        """Test 'all HIGH' completes only the user's pending HIGH items."""
+        todo_store(make_todos(9, priorities=PRIORITIES) + make_todos(3, owner="bob", priorities=PRIORITIES))
+        with patch('builtins.print'):
+            with patch('builtins.input', side_effect=['all HIGH', 'y', '0']):
+                handle_mark_todo_completed("alice")
+
+        completed = [(todo.owner, todo.title) for todo in load_todos() if todo.status == Status.COMPLETED]
+        assert completed == [("alice", "Task 1"), ("alice", "Task 4"), ("alice", "Task 7")]
+
+    def test_declining_confirmation_changes_nothing(self, todo_store):
+        """Test answering no leaves every item pending."""
+        todo_store(make_todos(3, priorities=PRIORITIES))
+        with patch('builtins.print') as mock_print:
+            with patch('builtins.input', side_effect=['1-3', 'n', '0']):
+                handle_mark_todo_completed("alice")
+
+        assert all(todo.status == Status.PENDING for todo in load_todos())
+        assert any("Nothing was changed" in str(call) for call in mock_print.call_args_list)
+
+    def test_positions_past_the_end_are_ignored(self, todo_store):
+        """Test a range reaching past the list completes what exists."""
+        todo_store(make_todos(2, priorities=PRIORITIES))
+        with patch('builtins.print'):
+            with patch('builtins.input', side_effect=['2-40', '0']):
+                handle_mark_todo_completed("alice")
+        assert [todo.status for todo in load_todos()] == [Status.PENDING, Status.COMPLETED]
+
+    def test_invalid_selection_message(self, todo_store):
+        """Test a malformed selection is reported and nothing changes."""
+        todo_store(make_todos(2, priorities=PRIORITIES))
+        with patch('builtins.print') as mock_print:
+            with patch('builtins.input', side_effect=['3-1', '0']):
+                handle_mark_todo_completed("alice")
+        assert any("Invalid selection" in str(call) for call in mock_print.call_args_list)
+        assert all(todo.status == Status.PENDING for todo in load_todos())
+
+    def test_full_id_is_not_taken_for_a_range(self, todo_store):
+        """Test a #id holding dashes completes that item."""
+        todo_store(make_todos(2, priorities=PRIORITIES))
+        todo_id = load_todos()[1].id
+        with patch('builtins.print'):
+            with patch('builtins.input', side_effect=[f'#{todo_id}', '0']):
+                handle_mark_todo_completed("alice")
+        assert [todo.status for todo in load_todos()] == [Status.PENDING, Status.COMPLETED]
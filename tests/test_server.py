@@ -0,0 +1,133 @@
+"""Tests for the Unix socket server and its thin client."""
+
+import json
+import threading
+import pytest
+from unittest.mock import patch
+from models import TodoItem, Priority, Status
+from main import save_users, load_todos, save_todos
+from server import TodoServer, TodoService
+from client import TodoClient, main as client_main
+
+
+@pytest.fixture
+def server(todo_store):
+    """Serve the temporary store on a socket for the duration of a test.
+
+    Returns:
+        Path of the socket.
+    """
+    save_users([{"username": "alice", "password": "secret"}, {"username": "bob", "password": "pw"}])
+    todo_store([TodoItem(title="Existing", details="old", priority=Priority.LOW, owner="alice")])
+    server = TodoServer("todo.sock", TodoService())
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield "todo.sock"
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+class TestProtocol:
+    """Tests for requests sent over a connection."""
+
+    def test_requires_login(self, server):
+        """Test operations are refused before a successful login."""
+        with TodoClient(server) as client:
+            assert client.call("list") == {"error": "Log in first."}
+            assert "error" in client.call("login", user="alice", password="wrong")
+            assert "error" in client.call("list")
+
+    def test_pipelined_requests(self, server):
+        """Test several requests written at once get replies in order."""
+        with TodoClient(server) as client:
+            replies = client.send([
+                {"op": "login", "user": "alice", "password": "secret"},
+                {"op": "create", "title": "Buy milk", "priority": "high"},
+                {"op": "list", "status": "pending"},
+            ])
+        assert replies[0] == {"result": {"user": "alice"}}
+        assert replies[1]["result"]["priority"] == "HIGH"
+        assert [item["title"] for item in replies[2]["result"]] == ["Existing", "Buy milk"]
+        assert [todo.title for todo in load_todos()] == ["Existing", "Buy milk"]
+
+    def test_edit_and_complete(self, server):
+        """Test changes are saved and only reach the user's own items."""
+        todo_id = load_todos()[0].id
+        with TodoClient(server) as client:
+            client.call("login", user="bob", password="pw")
+            assert "No to-do item matches" in client.call("complete", id=todo_id[:6])["error"]
+            client.call("login", user="alice", password="secret")
+            assert client.call("edit", id=todo_id[:6], title="Renamed")["result"]["title"] == "Renamed"
+            assert client.call("complete", id=todo_id)["result"]["changed"] is True
+            assert client.call("complete", id=todo_id)["result"]["changed"] is False
+        todo = load_todos()[0]
+        assert (todo.title, todo.details, todo.status) == ("Renamed", "old", Status.COMPLETED)
+
+    def test_bad_requests(self, server):
+        """Test malformed requests get error replies without closing the connection."""
+        with TodoClient(server) as client:
+            client._socket.sendall(b"not json\n")
+            assert "error" in json.loads(client._reader.readline())
+            client.call("login", user="alice", password="secret")
+            assert client.call("frobnicate") == {"error": "Unknown operation 'frobnicate'."}
+            assert client.call("create", title="x", colour="red") == {"error": "Invalid parameters for 'create'."}
+            assert client.call("create", title=" ") == {"error": "Title cannot be empty."}
+            assert client.call("list")["result"][0]["title"] == "Existing"
+
+    def test_null_and_non_string_fields(self, server):
+        """Test null fields count as missing and other non-strings are refused."""
+        todo_id = load_todos()[0].id
+        with TodoClient(server) as client:
+            client.call("login", user="alice", password="secret")
+            assert client.call("create", title=None, details=None) == {"error": "Title cannot be empty."}
+            created = client.call("create", title="Buy milk", details=None)["result"]
+            assert created["details"] == ""
+            assert client.call("list", status=5) == {"error": "'status' must be a string."}
+            assert client.call("edit", id=todo_id, title=5) == {"error": "'title' must be a string."}
+            assert client.call("edit", id=todo_id, title=None, priority="high")["result"]["title"] == "Existing"
+        assert [todo.title for todo in load_todos()] == ["Existing", "Buy milk"]
+
+    def test_internal_type_error_is_not_a_bad_request(self, server):
+        """Test only parameters the operation does not take are refused."""
+        service = TodoService()
+        session = {"user": "alice"}
+        assert service.handle(session, {"op": "show"}) == {"error": "Invalid parameters for 'show'."}
+        def broken(service, username):
+            raise TypeError("bug")
+
+        with patch.dict("server.OPERATIONS", list=broken):
+            with pytest.raises(TypeError, match="bug"):
+                service.handle(session, {"op": "list"})
+
+    def test_reloads_after_outside_change(self, server):
+        """Test the server notices the store being rewritten by another program."""
+        with TodoClient(server) as client:
+            client.call("login", user="alice", password="secret")
+            client.call("list")
+            todos = load_todos()
+            todos[0].title = "Changed elsewhere"
+            save_todos(todos)
+            assert client.call("list")["result"][0]["title"] == "Changed elsewhere"
+
+
+class TestClient:
+    """Tests for the thin command-line client."""
+
+    def test_add_and_list(self, server, capsys):
+        """Test commands print JSON lines like the command-line interface."""
+        assert client_main(["--user", "alice", "--password", "secret", "add", "Call mum"]) == 0
+        assert json.loads(capsys.readouterr().out)["title"] == "Call mum"
+        assert client_main(["--user", "alice", "--password", "secret", "list"]) == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert [json.loads(line)["title"] for line in lines] == ["Existing", "Call mum"]
+
+    def test_errors_go_to_stderr(self, server, capsys):
+        """Test a failed login is reported on stderr with exit code 1."""
+        assert client_main(["--user", "alice", "--password", "nope", "list"]) == 1
+        assert json.loads(capsys.readouterr().err) == {"error": "Invalid username or password."}
+
+    def test_server_not_running(self, tmp_path, capsys):
+        """Test a missing socket is reported as an error."""
+        assert client_main(["--user", "alice", "--socket", str(tmp_path / "none.sock"), "list"]) == 1
+        assert "Cannot reach the server" in json.loads(capsys.readouterr().err)["error"]
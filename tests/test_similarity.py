@@ -0,0 +1,131 @@
+"""Tests for TF-IDF related items and duplicate warnings."""
+
+import json
+import random
+import pytest
+from unittest.mock import patch
+from models import TodoItem, Priority
+from main import handle_create_todo, handle_view_todo_details, load_todos, save_users
+from cli import main as cli_main
+
+np = pytest.importorskip("numpy")
+
+from similarity import SimilarityIndex
+
+
+def make_todo(title, details="", owner="alice"):
+    """Build a todo item."""
+    return TodoItem(title=title, details=details, priority=Priority.MID, owner=owner)
+
+
+class TestSimilarityIndex:
+    """Tests for SimilarityIndex scoring and maintenance."""
+
+    def test_similar_ranks_by_shared_rare_words(self):
+        """Test items sharing distinctive words score highest."""
+        todos = [
+            make_todo("Renew passport", "book appointment at the passport office"),
+            make_todo("Book dentist appointment"),
+            make_todo("Buy milk"),
+            make_todo("Renew passport", owner="bob"),
+        ]
+        index = SimilarityIndex()
+        index.rebuild(todos)
+        matches = index.similar("alice", "renew my passport")
+        assert [todo.id for todo, _ in matches] == [todos[0].id]
+        assert matches[0][1] > 0.3
+        assert matches[0][0].details is None
+        assert index.similar("carol", "renew passport") == []
+
+    def test_identical_text_scores_one(self):
+        """Test an exact duplicate has a cosine similarity of one."""
+        todo = make_todo("Pay the electricity bill", "before Friday")
+        index = SimilarityIndex()
+        index.rebuild([todo, make_todo("Walk the dog")])
+        (match, score), = index.similar("alice", "Pay the electricity bill before Friday", limit=1)
+        assert match.id == todo.id
+        assert score == pytest.approx(1.0)
+
+    def test_related_excludes_the_item(self):
+        """Test related items never include the item itself."""
+        todos = [make_todo("Plan team offsite"), make_todo("Book offsite venue"), make_todo("Buy milk")]
+        index = SimilarityIndex()
+        index.rebuild(todos)
+        assert [todo.id for todo, _ in index.related(todos[0].id)] == [todos[1].id]
+        assert index.related("missing") == []
+
+    def test_changes_match_rebuild(self):
+        """Test incremental changes give the same scores as a rebuild."""
+        rng = random.Random(3)
+        words = ["alpha", "beta", "gamma", "delta", "epsilon", "zeta"]
+        phrase = lambda: " ".join(rng.choice(words) for _ in range(3))
+        todos = [make_todo(phrase(), phrase()) for _ in range(30)]
+        index = SimilarityIndex()
+        index.rebuild(todos)
+        for todo in rng.sample(todos, 20):
+            before = TodoItem(title=todo.title, details=None, priority=todo.priority, owner="alice", id=todo.id)
+            todo.title = phrase()
+            index.apply(before, TodoItem(title=todo.title, details=None, priority=todo.priority,
+                                         owner="alice", id=todo.id))
+        for todo in todos[:12]:
+            index.apply(todo, None)
+
+        fresh = SimilarityIndex()
+        fresh.rebuild(todos[12:])
+        for query in ["alpha beta", "gamma", "zeta zeta delta", "omega"]:
+            expected = {todo.id: score for todo, score in fresh.similar("alice", query, limit=50, threshold=0.01)}
+            actual = {todo.id: score for todo, score in index.similar("alice", query, limit=50, threshold=0.01)}
+            assert actual.keys() == expected.keys()
+            for todo_id, score in expected.items():
+                assert actual[todo_id] == pytest.approx(score)
+
+
+class TestDuplicateWarnings:
+    """Tests for the duplicate check and related items in the menus."""
+
+    def test_create_warns_about_duplicate(self, todo_store):
+        """Test declining the warning leaves the store unchanged."""
+        todo_store([make_todo("Renew car insurance", "call the broker")])
+        with patch('builtins.print') as mock_print:
+            with patch('builtins.input', side_effect=['Renew car insurance', 'call the broker', '2', 'n']):
+                handle_create_todo("alice")
+        output = ''.join(str(call) for call in mock_print.call_args_list)
+        assert "looks like items you already have" in output
+        assert len(load_todos()) == 1
+
+    def test_create_anyway(self, todo_store):
+        """Test confirming the warning creates the item."""
+        todo_store([make_todo("Renew car insurance")])
+        with patch('builtins.print'):
+            with patch('builtins.input', side_effect=['Renew car insurance', '', '2', 'y']):
+                handle_create_todo("alice")
+        assert [t.title for t in load_todos()] == ["Renew car insurance", "Renew car insurance"]
+
+    def test_distinct_item_is_created_without_asking(self, todo_store):
+        """Test no confirmation is asked for an unrelated title."""
+        todo_store([make_todo("Renew car insurance")])
+        with patch('builtins.print'):
+            with patch('builtins.input', side_effect=['Water the plants', '', '2']):
+                handle_create_todo("alice")
+        assert len(load_todos()) == 2
+
+    def test_details_screen_lists_related_items(self, todo_store):
+        """Test the details screen shows similar items of the same user."""
+        todo_store([make_todo("Plan team offsite"), make_todo("Book offsite venue"), make_todo("Buy milk")])
+        with patch('builtins.print') as mock_print:
+            with patch('builtins.input', side_effect=['1', '0', '0']):
+                handle_view_todo_details("alice")
+        output = ''.join(str(call) for call in mock_print.call_args_list)
+        assert "Related items" in output
+        assert "Book offsite venue" in output
+        assert "Buy milk" not in output.split("Related items")[1].split("Return to Item List")[0]
+
+    def test_related_command(self, todo_store, capsys):
+        """Test the related subcommand prints scored JSON lines."""
+        save_users([{"username": "alice", "password": "secret"}])
+        todos = [make_todo("Plan team offsite"), make_todo("Book offsite venue")]
+        todo_store(todos)
+        assert cli_main(["--user", "alice", "--password", "secret", "related", todos[0].id[:8]]) == 0
+        lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [line["id"] for line in lines] == [todos[1].id]
+        assert 0 < lines[0]["score"] < 1
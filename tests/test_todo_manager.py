@@ -0,0 +1,364 @@
+"""Tests for the in-memory TodoManager and its readers-writer lock."""
+
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+import pytest
+import todo_manager as todo_manager_module
+from unittest.mock import patch
+from models import Priority, Status
+from operations import ConflictError, complete_todo, edit_todo
+from main import (
+    append_todos,
+    format_save_status,
+    handle_mark_todo_completed,
+    handle_view_all_todos,
+    load_todo_summary,
+    load_todos,
+    load_todos_for_index,
+    save_todos,
+    save_users,
+    todo_manager,
+)
+from todo_manager import RWLock, TodoManager
+from tests.helpers import make_todos
+
+SRC = os.path.join(os.path.dirname(__file__), "..", "src")
+
+
+def make_manager(write_behind=False, save=save_todos):
+    """Build a manager for todos.json in the current directory."""
+    return TodoManager("todos.json", load_todos_for_index, save, append_todos, write_behind)
+
+
+class TestRWLock:
+    """Tests for shared and exclusive locking."""
+
+    def test_readers_share_the_lock(self):
+        """Test two readers hold the lock at the same time."""
+        lock = RWLock()
+        inside = threading.Barrier(2, timeout=2)
+
+        def read():
+            with lock.reading():
+                inside.wait()
+
+        threads = [threading.Thread(target=read) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not inside.broken
+
+    def test_writer_excludes_readers(self):
+        """Test a reader waits until the writer is done."""
+        lock = RWLock()
+        events = []
+
+        def read():
+            with lock.reading():
+                events.append("read")
+
+        with lock.writing():
+            reader = threading.Thread(target=read)
+            reader.start()
+            time.sleep(0.05)
+            events.append("write done")
+        reader.join()
+        assert events == ["write done", "read"]
+
+
+class TestTodoManager:
+    """Tests for changes made through the manager."""
+
+    def test_create_and_commit_are_written(self, todo_store):
+        """Test changes reach the store and the held items."""
+        todo_store(make_todos(3))
+        manager = make_manager()
+        created = manager.create("alice", "New task", "notes", Priority.HIGH)
+        todo = manager.get(load_todos()[0].id)
+        manager.commit([edit_todo(todo, title="Renamed")])
+        titles = [todo.title for todo in load_todos()]
+        assert titles == ["Renamed", "Task 2", "Task 3", "New task"]
+        assert load_todos()[3].details == "notes"
+        assert manager.get(created.id).priority == Priority.HIGH
+        assert [t.title for t in manager.todos("alice")] == titles
+
+    def test_write_behind_returns_before_writing(self, todo_store):
+        """Test queued changes are seen by readers of the file once written."""
+        todo_store(make_todos(5))
+        release = threading.Event()
+
+        def slow_save(todos, filename, changes):
+            release.wait(2)
+            save_todos(todos, filename, changes)
+
+        manager = make_manager(write_behind=True, save=slow_save)
+        for todo in manager.todos():
+            manager.commit([complete_todo(todo)])
+        assert manager.pending()
+        release.set()
+        manager.flush()
+        assert not manager.pending()
+        assert all(todo.status == Status.COMPLETED for todo in load_todos())
+
+    def test_queued_changes_share_a_write(self, todo_store):
+        """Test changes queued during a write are saved together."""
+        todo_store(make_todos(20))
+        saves = []
+        release = threading.Event()
+
+        def slow_save(todos, filename, changes):
+            saves.append(len(changes))
+            release.wait(2)
+            save_todos(todos, filename, changes)
+
+        manager = make_manager(write_behind=True, save=slow_save)
+        for todo in manager.todos():
+            manager.commit([complete_todo(todo)])
+        release.set()
+        manager.flush()
+        assert sum(saves) == 20
+        assert len(saves) < 20
+
+    def test_readers_of_the_file_wait_for_queued_writes(self, todo_store):
+        """Test the store barrier makes direct reads see queued changes."""
+        todo_store(make_todos(2))
+        manager = todo_manager()
+        manager.write_behind = True
+        try:
+            manager.commit([complete_todo(manager.todos()[1])])
+            assert [todo.status for todo in load_todos()] == [Status.PENDING, Status.COMPLETED]
+        finally:
+            manager.write_behind = False
+
+    def test_reloads_after_outside_change(self, todo_store):
+        """Test items changed by another program are loaded again."""
+        todo_store(make_todos(2))
+        manager = make_manager()
+        assert len(manager.todos()) == 2
+        todo_store(make_todos(3))
+        assert len(manager.todos()) == 3
+
+    def test_reloads_after_save_elsewhere_before_write(self, todo_store, monkeypatch):
+        """Test a save by another session just before a write is picked up."""
+        todo_store(make_todos(2))
+        store_lock = todo_manager_module.store_lock
+
+        @contextmanager
+        def lock_after_other_session(filename, exclusive=False):
+            monkeypatch.setattr(todo_manager_module, "store_lock", store_lock)
+            other = load_todos(filename, with_details=False)[1]
+            save_todos([other], filename, changes=[complete_todo(other)])
+            with store_lock(filename, exclusive):
+                yield
+
+        manager = make_manager()
+        todo = manager.get(manager.todos()[0].id)
+        monkeypatch.setattr(todo_manager_module, "store_lock", lock_after_other_session)
+        manager.commit([edit_todo(todo, title="Renamed")])
+
+        assert [(todo.title, todo.status) for todo in manager.todos()] == [
+            ("Renamed", Status.PENDING), ("Task 2", Status.COMPLETED)
+        ]
+
+    def test_held_items_follow_saved_versions(self, todo_store):
+        """Test editing an item again after its write is not a conflict."""
+        todo_store(make_todos(1))
+        manager = make_manager()
+        todo_id = manager.todos()[0].id
+        for number in range(1, 4):
+            manager.commit([edit_todo(manager.get(todo_id), details=f"Details v{number}")])
+        saved = load_todos()[0]
+        assert (saved.details, saved.version) == ("Details v3", 3)
+        assert manager.get(todo_id).version == 3
+
+    def test_failed_write_is_reported(self, todo_store):
+        """Test a failed write raises on flush and the store is loaded again."""
+        todo_store(make_todos(2))
+
+        def failing_save(todos, filename, changes):
+            raise OSError("disk full")
+
+        manager = make_manager(save=failing_save)
+        with pytest.raises(OSError, match="disk full"):
+            manager.commit([complete_todo(manager.todos()[0])])
+        assert all(todo.status == Status.PENDING for todo in manager.todos())
+
+    def test_failed_write_keeps_changes_queued_meanwhile(self, todo_store):
+        """Test a failed write loses only its own changes."""
+        todo_store(make_todos(2))
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def fail_first_save(todos, filename, changes):
+            calls.append(changes)
+            if len(calls) == 1:
+                started.set()
+                release.wait(2)
+                raise OSError("disk full")
+            save_todos(todos, filename, changes)
+
+        manager = make_manager(write_behind=True, save=fail_first_save)
+        first, second = manager.todos()
+        manager.commit([edit_todo(first, title="Lost")])
+        started.wait(2)
+        manager.commit([complete_todo(second)])
+        release.set()
+        with pytest.raises(OSError, match="disk full"):
+            manager.flush()
+        manager.flush()
+
+        assert [(todo.title, todo.status) for todo in load_todos()] == [
+            ("Task 1", Status.PENDING), ("Task 2", Status.COMPLETED)
+        ]
+        assert [todo.title for todo in manager.todos()] == ["Task 1", "Task 2"]
+
+    def test_conflict_keeps_held_items_and_other_changes(self, todo_store):
+        """Test a conflict is reported and the rest of the batch is saved."""
+        todo_store(make_todos(2))
+        manager = make_manager(write_behind=True)
+        first, second = manager.todos()
+        other = load_todos(with_details=False)[0]
+        save_todos([other], "todos.json", changes=[edit_todo(other, title="Theirs")])
+
+        manager.commit([edit_todo(first, title="Ours"), complete_todo(second)])
+        with pytest.raises(ConflictError, match="title"):
+            manager.flush()
+
+        assert [(todo.title, todo.status) for todo in manager.todos()] == [
+            ("Theirs", Status.PENDING), ("Task 2", Status.COMPLETED)
+        ]
+        assert load_todos()[1].status == Status.COMPLETED
+
+
+class TestDebounce:
+    """Tests for holding changes back before writing them."""
+
+    def test_changes_wait_for_the_delay(self, todo_store):
+        """Test a burst of changes is written once, after the delay."""
+        todo_store(make_todos(5))
+        saves = []
+
+        def counting_save(todos, filename, changes):
+            saves.append(len(changes))
+            save_todos(todos, filename, changes)
+
+        manager = TodoManager("todos.json", load_todos_for_index, counting_save, append_todos,
+                              write_behind=True, debounce=0.2)
+        for todo in manager.todos():
+            manager.commit([complete_todo(todo)])
+        time.sleep(0.05)
+        assert saves == [] and manager.unsaved() == 5
+        deadline = time.monotonic() + 2
+        while manager.pending() and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert saves == [5]
+        assert manager.unsaved() == 0
+
+    def test_flush_cuts_the_delay_short(self, todo_store):
+        """Test waiting for the changes writes them at once."""
+        todo_store(make_todos(2))
+        manager = make_manager(write_behind=True)
+        manager.debounce = 30
+        manager.commit([complete_todo(manager.todos()[0])])
+        started = time.monotonic()
+        assert load_todos()[0].status == Status.COMPLETED
+        assert time.monotonic() - started < 5
+
+    def test_failed_write_is_reported_once(self, todo_store):
+        """Test readers are not failed by a write error; it is reported once."""
+        todo_store(make_todos(2))
+
+        def failing_save(todos, filename, changes):
+            raise OSError("disk full")
+
+        manager = make_manager(write_behind=True, save=failing_save)
+        manager.commit([complete_todo(manager.todos()[0])])
+        manager.settle()
+        assert str(manager.take_error()) == "disk full"
+        assert manager.take_error() is None
+        manager.flush()
+
+
+class TestAutosave:
+    """Tests for the REPL's background saving."""
+
+    def test_menu_shows_save_status(self, todo_store):
+        """Test the status line follows the autosave."""
+        todo_store(make_todos(2))
+        manager = make_manager(write_behind=True)
+        assert format_save_status(make_manager()) is None
+        manager.debounce = 30
+        manager.commit([complete_todo(manager.todos()[0])])
+        assert format_save_status(manager) == "  Saving changes to 1 item..."
+        manager.flush()
+        assert format_save_status(manager) == "  All changes saved"
+
+    def test_summary_counts_unsaved_changes(self, todo_store):
+        """Test the menu summary does not wait for the autosave."""
+        todo_store(make_todos(2))
+        manager = todo_manager()
+        manager.write_behind, manager.debounce = True, 30
+        try:
+            manager.commit([complete_todo(manager.todos()[0])])
+            assert load_todo_summary("alice")["completed"] == 1
+            assert manager.pending()
+        finally:
+            manager.write_behind, manager.debounce = False, 0.0
+            manager.flush()
+
+    def test_screens_do_not_wait_for_the_autosave(self, todo_store):
+        """Test the screens after a change read the held items."""
+        todo_store(make_todos(3))
+        manager = todo_manager()
+        manager.write_behind, manager.debounce = True, 30
+        try:
+            with patch('builtins.print') as mock_print:
+                with patch('builtins.input', side_effect=['#' + manager.todos()[0].id, '0']):
+                    handle_mark_todo_completed("alice")
+                with patch('builtins.input', return_value='0'):
+                    handle_view_all_todos("alice")
+            assert manager.pending()
+            output = ''.join(str(call) for call in mock_print.call_args_list)
+            assert "(3 total)" in output and "✓ Task 1" in output
+        finally:
+            manager.write_behind, manager.debounce = False, 0.0
+            manager.flush()
+
+    def test_conflict_is_reported_with_the_item(self, todo_store):
+        """Test a conflict found by the autosave names the item."""
+        todo_store(make_todos(1))
+        manager = make_manager(write_behind=True)
+        todo = manager.todos()[0]
+        other = load_todos(with_details=False)[0]
+        save_todos([other], "todos.json", changes=[edit_todo(other, title="Theirs")])
+        manager.commit([edit_todo(todo, title="Ours")])
+        manager.settle()
+        assert format_save_status(manager) == (
+            "  ✗ Not saved: 'Task 1' was changed in another session meanwhile (title)."
+        )
+
+    def test_sigterm_saves_pending_changes(self, tmp_path):
+        """Test terminating the application writes what is still held."""
+        save_users([{"username": "alice", "password": "secret"}], str(tmp_path / "users.json"))
+        env = dict(os.environ, TODO_AUTOSAVE_DELAY="60", PYTHONPATH=SRC)
+        process = subprocess.Popen(
+            [sys.executable, "-u", os.path.join(SRC, "main.py")], cwd=tmp_path, env=env,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+        )
+        process.stdin.write("1\nalice\nsecret\n1\nBuy milk\n\n2\n")
+        process.stdin.flush()
+        for line in process.stdout:
+            if "Saving changes to 1 item" in line:
+                break
+        assert not os.path.exists(tmp_path / "todos.json")
+        process.send_signal(signal.SIGTERM)
+        output, _ = process.communicate(timeout=30)
+
+        assert "Saving your changes" in output
+        assert [todo.title for todo in load_todos(str(tmp_path / "todos.json"))] == ["Buy milk"]
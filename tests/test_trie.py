@@ -0,0 +1,99 @@
+"""Tests for title completion with the prefix trie."""
+
+import pytest
+import random
+from unittest.mock import patch
+from models import TodoItem, Priority, Status
+from main import handle_edit_todo, handle_mark_todo_completed, load_todos
+from trie import TitleTrie
+
+
+def make_todo(title, owner="alice"):
+    """Build a todo item."""
+    return TodoItem(title=title, details="", priority=Priority.MID, owner=owner)
+
+
+class TestTitleTrie:
+    """Tests for TitleTrie lookups and maintenance."""
+
+    def test_complete_prefix_in_title_order(self):
+        """Test matches are case-insensitive and in title order."""
+        todos = [make_todo(t) for t in ["Buy milk", "buy bread", "Budget", "Call mum", "Buy"]]
+        todos.append(make_todo("Buy shoes", owner="bob"))
+        trie = TitleTrie()
+        trie.rebuild(todos)
+        assert [t.title for t in trie.complete("alice", "BU")] == ["Budget", "Buy", "buy bread", "Buy milk"]
+        assert [t.title for t in trie.complete("alice", "buy ")] == ["buy bread", "Buy milk"]
+        assert [t.title for t in trie.complete("alice", "buy", limit=2)] == ["Buy", "buy bread"]
+        assert trie.complete("alice", "x") == []
+        assert trie.complete("carol", "b") == []
+
+    def test_complete_with_predicate(self):
+        """Test items can be filtered while collecting matches."""
+        todos = [make_todo("Pay rent"), make_todo("Pay bills")]
+        todos[1].status = Status.COMPLETED
+        trie = TitleTrie()
+        trie.rebuild(todos)
+        assert [t.title for t in trie.complete("alice", "pay", accept=lambda t: t.status == Status.PENDING)] == ["Pay rent"]
+
+    def test_edits_and_deletes_match_rebuild(self):
+        """Test incremental changes give the same answers as a rebuild."""
+        rng = random.Random(7)
+        words = ["a", "ab", "abc", "abd", "b", "ba", "bab", "c"]
+        todos = [make_todo(" ".join(rng.choice(words) for _ in range(2))) for _ in range(40)]
+        trie = TitleTrie()
+        trie.rebuild(todos)
+        for todo in rng.sample(todos, 25):
+            before = TodoItem(title=todo.title, details="", priority=todo.priority, owner="alice", id=todo.id)
+            todo.title = " ".join(rng.choice(words) for _ in range(2))
+            trie.apply(before, todo)
+        for todo in todos[:10]:
+            trie.apply(todo, None)
+
+        fresh = TitleTrie()
+        fresh.rebuild(todos[10:])
+        for prefix in ["", "a", "ab", "ab ", "abc b", "b", "ba", "c", "d"]:
+            expected = sorted((t.title, t.id) for t in fresh.complete("alice", prefix, limit=100))
+            actual = sorted((t.title, t.id) for t in trie.complete("alice", prefix, limit=100))
+            assert actual == expected
+
+
+class TestTitlePrompts:
+    """Tests for /title input in the selection prompts."""
+
+    def test_mark_completed_by_title_prefix(self, todo_store):
+        """Test a unique title prefix selects the item to complete."""
+        todo_store([make_todo("Buy milk"), make_todo("Call mum")])
+        with patch('builtins.print'):
+            with patch('builtins.input', side_effect=['/call', '0']):
+                handle_mark_todo_completed("alice")
+        assert [t.status for t in load_todos()] == [Status.PENDING, Status.COMPLETED]
+
+    def test_ambiguous_prefix_lists_matches(self, todo_store):
+        """Test several matches are listed with their ids."""
+        todo_store([make_todo("Buy milk"), make_todo("Buy bread")])
+        with patch('builtins.print') as mock_print:
+            with patch('builtins.input', side_effect=['/buy', '0']):
+                handle_mark_todo_completed("alice")
+        output = ''.join(str(call) for call in mock_print.call_args_list)
+        assert "matches several items" in output
+        assert "Buy bread" in output
+        assert all(t.status == Status.PENDING for t in load_todos())
+
+    def test_exact_title_wins(self, todo_store):
+        """Test a complete title picks its item even if others share the prefix."""
+        todo_store([make_todo("Buy"), make_todo("Buy bread")])
+        with patch('builtins.print'):
+            with patch('builtins.input', side_effect=['/buy', '1', 'Buy eggs']):
+                handle_edit_todo("alice")
+        assert [t.title for t in load_todos()] == ["Buy eggs", "Buy bread"]
+
+    def test_edit_by_title_after_rename(self, todo_store):
+        """Test the trie follows title edits."""
+        todo_store([make_todo("Draft plan")])
+        with patch('builtins.print'):
+            with patch('builtins.input', side_effect=['/draft', '1', 'Final plan']):
+                handle_edit_todo("alice")
+            with patch('builtins.input', side_effect=['/final', '1', 'Approved plan']):
+                handle_edit_todo("alice")
+        assert [t.title for t in load_todos()] == ["Approved plan"]
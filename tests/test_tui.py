@@ -0,0 +1,211 @@
+"""Tests for the virtualized full-screen list."""
+
+import pytest
+
+curses = pytest.importorskip("curses")
+
+from models import TodoItem, Priority, Status
+from tui import VirtualList, Viewport, TodoListScreen, changed_rows, format_row
+from main import append_todos, save_todos, owner_matcher, load_todos
+from operations import complete_todo
+from tests.helpers import make_todos
+
+
+class FakeScreen:
+    """Minimal stand-in for a curses window that records drawn rows."""
+
+    def __init__(self, height=10, width=60):
+        self.height = height
+        self.width = width
+        self.writes = []
+
+    def getmaxyx(self):
+        return self.height, self.width
+
+    def move(self, row, col):
+        pass
+
+    def clrtoeol(self):
+        pass
+
+    def addstr(self, row, col, text, attr=0):
+        self.writes.append((row, text, attr))
+
+    def refresh(self):
+        pass
+
+    def clear(self):
+        pass
+
+
+class TestViewport:
+    """Tests for scroll position and selection."""
+
+    def test_move_scrolls_to_keep_selection_visible(self):
+        """Test moving below the window scrolls it."""
+        viewport = Viewport(total=100, height=10)
+        viewport.move(12)
+        assert viewport.selected == 12
+        assert viewport.top == 3
+
+    def test_move_is_clamped(self):
+        """Test the selection stays inside the list."""
+        viewport = Viewport(total=5, height=10)
+        viewport.move(-3)
+        assert viewport.selected == 0
+        viewport.move(50)
+        assert viewport.selected == 4
+
+    def test_page_home_end(self):
+        """Test page and jump movements."""
+        viewport = Viewport(total=100, height=10)
+        viewport.page(2)
+        assert viewport.selected == 20
+        viewport.end()
+        assert (viewport.selected, viewport.top) == (99, 90)
+        viewport.home()
+        assert (viewport.selected, viewport.top) == (0, 0)
+
+    def test_empty_list(self):
+        """Test an empty list does not move."""
+        viewport = Viewport(total=0, height=10)
+        viewport.move(1)
+        assert viewport.selected == 0
+
+
+class TestVirtualList:
+    """Tests for block-wise row loading."""
+
+    def test_rows_load_only_needed_blocks(self, tmp_path):
+        """Test reading a window only loads the blocks it covers."""
+        todos_file = str(tmp_path / "todos.json")
+        save_todos(make_todos(50), todos_file)
+
+        rows = VirtualList(todos_file, owner_matcher("alice"), 50, block_size=10)
+        assert [todo.title for todo in rows.rows(12, 3)] == ["Task 13", "Task 14", "Task 15"]
+        assert rows.loads == 1
+        rows.rows(12, 3)
+        assert rows.loads == 1
+
+    def test_row_past_end(self, tmp_path):
+        """Test rows after the last item are None."""
+        todos_file = str(tmp_path / "todos.json")
+        save_todos(make_todos(3), todos_file)
+        rows = VirtualList(todos_file, owner_matcher("alice"), 3, block_size=10)
+        assert rows.row(3) is None
+        assert rows.rows(2, 5)[0].title == "Task 3"
+
+    def test_blocks_are_evicted(self, tmp_path):
+        """Test only a bounded number of blocks is kept."""
+        todos_file = str(tmp_path / "todos.json")
+        save_todos(make_todos(50), todos_file)
+        rows = VirtualList(todos_file, owner_matcher("alice"), 50, block_size=10, max_blocks=2)
+        for index in (0, 10, 20, 0):
+            rows.row(index)
+        assert rows.loads == 4
+
+    def test_store_change_reloads_rows(self, tmp_path):
+        """Test rows are read again after the store changes."""
+        todos_file = str(tmp_path / "todos.json")
+        todos = make_todos(3)
+        save_todos(todos, todos_file)
+        rows = VirtualList(todos_file, owner_matcher("alice"), 3)
+        assert rows.row(0).status == Status.PENDING
+
+        todos[0].status = Status.COMPLETED
+        save_todos(todos, todos_file)
+        assert rows.row(0).status == Status.COMPLETED
+
+    def test_saved_change_is_patched_into_loaded_rows(self, tmp_path):
+        """Test a change by another session replaces the row without reading blocks."""
+        todos_file = str(tmp_path / "todos.json")
+        save_todos(make_todos(30), todos_file)
+        rows = VirtualList(todos_file, owner_matcher("alice"), 30, block_size=10)
+        rows.rows(0, 30)
+
+        todos = load_todos(todos_file, with_details=False)
+        save_todos(todos, todos_file, changes=[complete_todo(todos[12])])
+        assert rows.row(12).status == Status.COMPLETED
+        assert rows.loads == 3
+
+    def test_new_and_removed_matches_change_total(self, tmp_path):
+        """Test the row count follows items entering and leaving the list."""
+        todos_file = str(tmp_path / "todos.json")
+        save_todos(make_todos(25), todos_file)
+        rows = VirtualList(todos_file, owner_matcher("alice", Status.PENDING), 25, block_size=10)
+        rows.rows(0, 25)
+
+        append_todos(make_todos(1), todos_file)
+        assert rows.row(25).title == "Task 1"
+        assert rows.total == 26
+
+        todos = load_todos(todos_file, with_details=False)
+        save_todos(todos, todos_file, changes=[complete_todo(todos[14])])
+        assert [todo.title for todo in rows.rows(13, 3)] == ["Task 14", "Task 16", "Task 17"]
+        assert rows.total == 25
+        assert rows.loads == 5
+
+
+class TestIncrementalRedraw:
+    """Tests for redrawing only changed rows."""
+
+    def test_changed_rows(self):
+        """Test only differing rows are reported."""
+        assert changed_rows({0: "a", 1: "b"}, {0: "a", 1: "c", 2: "d"}) == [1, 2]
+
+    def test_format_row_is_clipped(self):
+        """Test rows never exceed the screen width."""
+        todo = TodoItem(title="x" * 100, details="", priority=Priority.HIGH, owner="alice")
+        assert len(format_row(1, todo, 40)) == 39
+
+    def test_scrolling_redraws_only_changed_rows(self, tmp_path):
+        """Test moving the selection by one row redraws few rows."""
+        todos_file = str(tmp_path / "todos.json")
+        save_todos(make_todos(100), todos_file)
+        stdscr = FakeScreen(height=14)
+        screen = TodoListScreen(stdscr, "alice", VirtualList(todos_file, owner_matcher("alice"), 100), lambda todo: "")
+
+        screen.draw()
+        first_draw = len(stdscr.writes)
+        stdscr.writes.clear()
+        screen.handle_key(curses.KEY_DOWN)
+        screen.draw()
+
+        redrawn = [row for row, _, _ in stdscr.writes]
+        assert first_draw == 14
+        # the two highlighted rows and the footer describing the selection
+        assert redrawn == [2, 3, 13]
+
+    def test_complete_key_calls_callback(self, tmp_path):
+        """Test c completes the selected item and shows the message."""
+        todos_file = str(tmp_path / "todos.json")
+        save_todos(make_todos(3), todos_file)
+        completed = []
+        stdscr = FakeScreen()
+        screen = TodoListScreen(
+            stdscr, "alice", VirtualList(todos_file, owner_matcher("alice"), 3),
+            lambda todo: completed.append(todo.title) or "done",
+        )
+        screen.handle_key(curses.KEY_DOWN)
+        assert screen.handle_key(ord("c")) is True
+        assert completed == ["Task 2"]
+        assert screen.message == "done"
+        assert screen.handle_key(ord("q")) is False
+
+    def test_refresh_shows_changes_of_other_sessions(self, tmp_path):
+        """Test a redraw after the refresh interval shows items saved elsewhere."""
+        todos_file = str(tmp_path / "todos.json")
+        save_todos(make_todos(3), todos_file)
+        stdscr = FakeScreen()
+        screen = TodoListScreen(stdscr, "alice", VirtualList(todos_file, owner_matcher("alice"), 3), lambda todo: "")
+        screen.message = "done"
+        screen.draw()
+
+        append_todos(make_todos(1), todos_file)
+        stdscr.writes.clear()
+        assert screen.handle_key(-1) is True
+        screen.draw()
+
+        assert screen.message == "done"
+        assert screen.viewport.total == 4
+        assert [row for row, _, _ in stdscr.writes] == [0, 5]
@@ -0,0 +1,132 @@
+"""Tests for filtered and sorted view pages."""
+
+import pytest
+from unittest.mock import patch
+from models import TodoItem, Priority, Status
+from main import save_todos, load_todos_for_index, handle_view_all_todos
+from indexes import IndexCache
+from query import parse_filter
+from view_query import QueryCursor, parse_sort
+
+
+def make_todos():
+    """Build items with mixed priorities, statuses and owners."""
+    specs = [
+        ("Write report", Priority.LOW, Status.PENDING, "2024-01-05T00:00:00"),
+        ("Call bank", Priority.HIGH, Status.PENDING, "2024-01-03T00:00:00"),
+        ("archive mail", Priority.MID, Status.COMPLETED, "2024-01-01T00:00:00"),
+        ("Book flights", Priority.HIGH, Status.PENDING, "2024-01-02T00:00:00"),
+        ("Pay rent", Priority.MID, Status.PENDING, "2024-01-04T00:00:00"),
+    ]
+    todos = []
+    for title, priority, status, created_at in specs:
+        todo = TodoItem(title=title, details="", priority=priority, owner="alice", created_at=created_at)
+        todo.status = status
+        todo.updated_at = created_at
+        todos.append(todo)
+    todos.append(TodoItem(title="Bob's", details="", priority=Priority.HIGH, owner="bob"))
+    return todos
+
+
+def titles(cursor):
+    """Return the titles on every page of a cursor."""
+    result = [todo.title for todo in cursor.page().items]
+    while cursor.has_next():
+        cursor.next()
+        result += [todo.title for todo in cursor.page().items]
+    return result
+
+
+class TestParseSort:
+    """Tests for sort choices."""
+
+    def test_parse_sort(self):
+        """Test fields and the descending prefix."""
+        assert parse_sort("") == (None, False)
+        assert parse_sort("Title") == ("title", False)
+        assert parse_sort("-updated") == ("updated", True)
+        with pytest.raises(ValueError):
+            parse_sort("colour")
+
+
+class TestQueryCursor:
+    """Tests for QueryCursor plans and pages."""
+
+    def test_scan_sorts_across_pages(self, tmp_path):
+        """Test the partial sort returns every page in order."""
+        todos_file = str(tmp_path / "todos.json")
+        save_todos(make_todos(), todos_file)
+        cursor = QueryCursor(todos_file, "alice", sort="title", page_size=2)
+        assert cursor.plan == "scan"
+        assert titles(cursor) == ["archive mail", "Book flights", "Call bank", "Pay rent", "Write report"]
+        assert cursor.total == 5
+
+    def test_scan_descending_with_filter(self, tmp_path):
+        """Test a filter and a descending sort together."""
+        todos_file = str(tmp_path / "todos.json")
+        save_todos(make_todos(), todos_file)
+        cursor = QueryCursor(todos_file, "alice", parse_filter("priority != LOW"), "created", True, page_size=2)
+        assert titles(cursor) == ["Pay rent", "Call bank", "Book flights", "archive mail"]
+
+    def test_filter_keeps_list_order(self, tmp_path):
+        """Test a filter without a sort keeps the stored order."""
+        todos_file = str(tmp_path / "todos.json")
+        save_todos(make_todos(), todos_file)
+        cursor = QueryCursor(todos_file, "alice", parse_filter("status = pending"))
+        assert titles(cursor) == ["Write report", "Call bank", "Book flights", "Pay rent"]
+
+    def test_index_plan_matches_scan(self, tmp_path):
+        """Test pending items sorted by priority come from the next-up index."""
+        todos_file = str(tmp_path / "todos.json")
+        save_todos(make_todos(), todos_file)
+        node = parse_filter("status = pending")
+        indexed = QueryCursor(todos_file, "alice", node, "priority", indexes=IndexCache(), loader=load_todos_for_index, page_size=3)
+        scanned = QueryCursor(todos_file, "alice", node, "priority", page_size=3)
+        assert indexed.plan == "next-up index"
+        assert scanned.plan == "scan"
+        assert titles(indexed) == titles(scanned) == ["Book flights", "Call bank", "Pay rent", "Write report"]
+
+    def test_index_plan_with_priority_and_descending(self, tmp_path):
+        """Test the index path narrows by priority and reverses the order."""
+        todos_file = str(tmp_path / "todos.json")
+        save_todos(make_todos(), todos_file)
+        cursor = QueryCursor(
+            todos_file, "alice", parse_filter("status = pending and priority = HIGH"), "priority", True,
+            IndexCache(), load_todos_for_index,
+        )
+        assert titles(cursor) == ["Call bank", "Book flights"]
+
+
+class TestViewAllFilterSort:
+    """Tests for the filter and sort options of the view screen."""
+
+    def test_filter_and_sort_in_view(self, todo_store):
+        """Test filtering and sorting change the listed items."""
+        todo_store(make_todos())
+        with patch('builtins.print') as mock_print:
+            with patch('builtins.input', side_effect=['f', 'status = pending', 's', 'priority', '0']):
+                handle_view_all_todos("alice")
+
+        last_screen = str(mock_print.call_args_list[-1])
+        assert "(4 total)" in last_screen
+        assert "Sort: priority" in last_screen
+        assert last_screen.index("Book flights") < last_screen.index("Call bank") < last_screen.index("Write report")
+        assert "archive mail" not in last_screen
+
+    def test_invalid_filter_is_reported(self, todo_store):
+        """Test a bad filter keeps the current list."""
+        todo_store(make_todos())
+        with patch('builtins.print') as mock_print:
+            with patch('builtins.input', side_effect=['f', 'size > 2', '0']):
+                handle_view_all_todos("alice")
+        assert any("Invalid filter" in str(call) for call in mock_print.call_args_list)
+
+    def test_filter_without_matches_resets(self, todo_store):
+        """Test a filter matching nothing falls back to all items."""
+        todo_store(make_todos())
+        with patch('builtins.print') as mock_print:
+            with patch('builtins.input', side_effect=['f', 'title ~ zzz', '0']):
+                handle_view_all_todos("alice")
+        output = ''.join(str(call) for call in mock_print.call_args_list)
+        assert "No items match the filter" in output
+        assert "(5 total)" in str(mock_print.call_args_list[-1])